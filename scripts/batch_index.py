@@ -3,7 +3,7 @@
 """
 import os
 import sys
-import time
+import argparse
 import traceback
 
 # เพิ่ม parent directory ไปยัง Python path
@@ -12,9 +12,17 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.embedding.model import EmbeddingModel
 from src.document.processor import DocumentProcessor
 from src.database.vector_db import VectorDatabase
-from src.config import DATA_DIR, COLLECTION_NAME, MODEL_NAME, USE_OCR
+from src.database.manifest import IngestionManifest, manifest_path
+from src.pipeline.ingest import IngestionPipeline
+from src.config import (DATA_DIR, COLLECTION_NAME, MODEL_NAME, USE_OCR, INCREMENTAL_UPDATE,
+                        MANIFEST_ENABLED)
 
 def main():
+    parser = argparse.ArgumentParser(description="เพิ่มไฟล์ PDF ทั้งหมดใน DATA_DIR ลงใน Vector Database")
+    parser.add_argument("--rechunk", action="store_true",
+                        help="ประมวลผลทุกไฟล์ใหม่แม้ไม่ได้แก้ไข (ใช้หลังเปลี่ยน CHUNK_BY_TOKENS หรือขนาด chunk)")
+    args = parser.parse_args()
+    
     try:
         # สร้าง embedding model
         print("กำลังโหลดโมเดล embedding...")
@@ -30,7 +38,8 @@ def main():
         )
         
         # สร้างหรือโหลด collection
-        collection = vector_db.create_collection()
+        vector_db.create_collection()
+        incremental = INCREMENTAL_UPDATE and vector_db.supports_incremental
         
         # รวบรวมไฟล์ PDF ทั้งหมดในโฟลเดอร์
         pdf_files = []
@@ -40,32 +49,23 @@ def main():
         
         print(f"พบไฟล์ PDF ทั้งหมด {len(pdf_files)} ไฟล์")
         
-        # ประมวลผลแต่ละไฟล์
-        processed_count = 0
-        for pdf_path in pdf_files:
-            # ตรวจสอบว่าควรประมวลผลไฟล์นี้หรือไม่
-            should_process, file_mod_time = doc_processor.should_process_file(pdf_path, collection)
-            
-            if should_process:
-                # ประมวลผลไฟล์
-                all_chunks, chunk_to_file_map, file_mod_times = doc_processor.process_file(pdf_path)
-                
-                # สร้าง embeddings
-                print("กำลังสร้าง embeddings...")
-                embeddings = []
-                total_chunks = len(all_chunks)
-                
-                for i, chunk in enumerate(all_chunks):
-                    if i % 10 == 0 or i == total_chunks - 1:
-                        print(f"สร้าง embedding {i+1}/{total_chunks}")
-                    embedding = model.get_embedding(chunk)
-                    embeddings.append(embedding)
-                    
-                # เพิ่มข้อมูลลงในฐานข้อมูล
-                vector_db.insert_data(chunk_to_file_map, file_mod_times, all_chunks, embeddings)
-                processed_count += 1
+        # ประมวลผลไฟล์ทั้งหมดแบบ pipeline (แปลงข้อความ → แบ่งส่วน → embeddings → insert)
+        manifest = None
+        if MANIFEST_ENABLED:
+            manifest = IngestionManifest(manifest_path(COLLECTION_NAME), collection_id=vector_db.collection_id)
+        pipeline = IngestionPipeline(doc_processor, model, vector_db, incremental=incremental, manifest=manifest,
+                                     rechunk=args.rechunk)
+        summary = pipeline.run(pdf_files)
+        processed_count = summary["processed"]
         
         print(f"ประมวลผลเสร็จสิ้น, ไฟล์ที่ประมวลผล: {processed_count}/{len(pdf_files)}")
+        
+        # แสดงสถิติแคช embeddings
+        if model.cache is not None:
+            stats = model.cache.stats()
+            print(f"แคช embeddings: hit {stats['hits']}, miss {stats['misses']} "
+                  f"({stats['hit_rate']*100:.1f}%), evict {stats['evictions']}, "
+                  f"รายการ {stats['entries']}/{stats['max_entries']}")
             
     except Exception as e:
         print(f"เกิดข้อผิดพลาด: {e}")
@@ -75,6 +75,12 @@ def main():
         # ปิดการเชื่อมต่อ
         if 'vector_db' in locals():
             vector_db.close()
+        if 'model' in locals():
+            model.close()
+        if 'doc_processor' in locals():
+            doc_processor.close()
+        if locals().get('manifest') is not None:
+            manifest.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
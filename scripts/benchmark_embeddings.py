@@ -0,0 +1,167 @@
+"""
+โปรแกรมเปรียบเทียบความเร็วและความแม่นยำของ backend ของโมเดล embedding เทียบกับ PyTorch fp32
+"""
+import os
+import sys
+import time
+import argparse
+import traceback
+import numpy as np
+
+# เพิ่ม parent directory ไปยัง Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embedding.model import EmbeddingModel
+from src.embedding.backends import BACKENDS
+from src.config import DATA_DIR, MODEL_NAME, EMBEDDING_BATCH_SIZE
+
+def load_texts(texts_path, samples):
+    """
+    รวบรวมข้อความตัวอย่างจากไฟล์ข้อความ (บรรทัดละหนึ่งข้อความ) หรือจาก chunks ของ PDF ใน DATA_DIR
+
+    Args:
+        texts_path (str): พาธของไฟล์ข้อความ (None = ใช้ PDF)
+        samples (int): จำนวนข้อความสูงสุด
+
+    Returns:
+        list: ข้อความตัวอย่าง
+    """
+    if texts_path:
+        with open(texts_path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()][:samples]
+
+    from src.document.processor import DocumentProcessor
+    doc_processor = DocumentProcessor(use_ocr=False)
+    texts = []
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if not filename.lower().endswith('.pdf'):
+            continue
+        for chunk in doc_processor.split_text(doc_processor.extract_text(os.path.join(DATA_DIR, filename))):
+            texts.append(chunk)
+            if len(texts) >= samples:
+                return texts
+    return texts
+
+def encode(model, texts, batch_size, repeat):
+    """
+    สร้าง embeddings และวัดเวลา (ใช้รอบที่เร็วที่สุด)
+
+    Args:
+        model (EmbeddingModel): โมเดล
+        texts (list): ข้อความ
+        batch_size (int): จำนวนข้อความต่อ micro-batch
+        repeat (int): จำนวนรอบที่วัด
+
+    Returns:
+        tuple: (embeddings, เวลาที่ใช้เป็นวินาที)
+    """
+    # รอบแรกสำหรับ warm-up (โหลด kernel และจัดสรรหน่วยความจำ)
+    model.get_embeddings(texts[:batch_size], batch_size=batch_size)
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        embeddings = model.get_embeddings(texts, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return embeddings, best
+
+def normalize(embeddings):
+    """
+    ปรับ embeddings ให้มีความยาวเท่ากับ 1
+
+    Args:
+        embeddings (numpy.ndarray): เมทริกซ์ embeddings
+
+    Returns:
+        numpy.ndarray: เมทริกซ์ที่ปรับแล้ว
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def top_k_overlap(baseline, candidate, k):
+    """
+    สัดส่วนของเพื่อนบ้านใกล้สุด k อันดับแรกที่ตรงกับ baseline (ใช้ข้อความแต่ละข้อความเป็นคำค้น)
+
+    Args:
+        baseline (numpy.ndarray): embeddings ของ fp32 (ปรับความยาวแล้ว)
+        candidate (numpy.ndarray): embeddings ของ backend ที่เปรียบเทียบ (ปรับความยาวแล้ว)
+        k (int): จำนวนอันดับ
+
+    Returns:
+        float: ค่าเฉลี่ยของสัดส่วนที่ตรงกัน
+    """
+    k = min(k, len(baseline) - 1)
+    if k <= 0:
+        return 1.0
+
+    def neighbours(embeddings):
+        scores = embeddings @ embeddings.T
+        np.fill_diagonal(scores, -np.inf)
+        return np.argsort(-scores, axis=1)[:, :k]
+
+    expected = neighbours(baseline)
+    actual = neighbours(candidate)
+    return float(np.mean([len(set(a) & set(e)) / k for a, e in zip(actual, expected)]))
+
+def main():
+    parser = argparse.ArgumentParser(description="เปรียบเทียบ backend ของโมเดล embedding")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="backend ที่ต้องการเปรียบเทียบ คั่นด้วยจุลภาค (torch คือ baseline)")
+    parser.add_argument("--texts", help="ไฟล์ข้อความตัวอย่าง บรรทัดละหนึ่งข้อความ (ค่าเริ่มต้น: chunks ของ PDF ใน DATA_DIR)")
+    parser.add_argument("--samples", type=int, default=512, help="จำนวนข้อความตัวอย่างสูงสุด")
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE, help="จำนวนข้อความต่อ micro-batch")
+    parser.add_argument("--repeat", type=int, default=3, help="จำนวนรอบที่วัดเวลา (ใช้ผลที่เร็วที่สุด)")
+    parser.add_argument("--top-k", type=int, default=5, help="จำนวนอันดับที่ใช้วัดความตรงกันของผลการค้นหา")
+    args = parser.parse_args()
+
+    try:
+        texts = load_texts(args.texts, args.samples)
+        if not texts:
+            print("ไม่พบข้อความตัวอย่าง")
+            return
+        print(f"ข้อความตัวอย่าง {len(texts)} รายการ")
+
+        # baseline คือ PyTorch fp32 เสมอ
+        print("กำลังวัด baseline (torch fp32)...")
+        baseline_model = EmbeddingModel(model_name=MODEL_NAME, use_cache=False, backend="torch")
+        baseline, baseline_seconds = encode(baseline_model, texts, args.batch_size, args.repeat)
+        baseline = normalize(baseline)
+        del baseline_model
+
+        results = [{"backend": "torch", "seconds": baseline_seconds, "mean_cos": 1.0, "min_cos": 1.0, "overlap": 1.0}]
+        for backend in args.backends.split(","):
+            backend = backend.strip()
+            if backend == "torch":
+                continue
+            print(f"กำลังวัด {backend}...")
+            try:
+                model = EmbeddingModel(model_name=MODEL_NAME, use_cache=False, backend=backend)
+                embeddings, seconds = encode(model, texts, args.batch_size, args.repeat)
+                del model
+            except Exception as e:
+                print(f"ข้าม {backend}: {e}")
+                continue
+            embeddings = normalize(embeddings)
+            cosines = np.sum(embeddings * baseline, axis=1)
+            results.append({
+                "backend": backend,
+                "seconds": seconds,
+                "mean_cos": float(cosines.mean()),
+                "min_cos": float(cosines.min()),
+                "overlap": top_k_overlap(baseline, embeddings, args.top_k),
+            })
+
+        print(f"\n{'backend':<12}{'วินาที':>10}{'ข้อความ/s':>12}{'เร็วขึ้น':>10}{'cos เฉลี่ย':>12}"
+              f"{'cos ต่ำสุด':>12}{f'top-{args.top_k} ตรงกัน':>16}")
+        for r in results:
+            print(f"{r['backend']:<12}{r['seconds']:>10.2f}{len(texts) / r['seconds']:>12.1f}"
+                  f"{baseline_seconds / r['seconds']:>9.2f}x{r['mean_cos']:>12.4f}{r['min_cos']:>12.4f}"
+                  f"{r['overlap'] * 100:>15.1f}%")
+
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาด: {e}")
+        # แสดงรายละเอียดข้อผิดพลาด
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+โปรแกรมเปรียบเทียบความเร็วและหน่วยความจำของตัวแยกข้อความจาก PDF (Tika และ pypdf)
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import traceback
+
+# เพิ่ม parent directory ไปยัง Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.document.extractors import EXTRACTORS, get_extractor
+from src.utils.helpers import format_size, get_peak_memory
+from src.config import DATA_DIR
+
+def count_pages(file_path):
+    """
+    นับจำนวนหน้าของไฟล์ PDF
+
+    Args:
+        file_path (str): พาธของไฟล์ PDF
+
+    Returns:
+        int: จำนวนหน้า
+    """
+    try:
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+    except ImportError:
+        from pdf2image import pdfinfo_from_path
+        return pdfinfo_from_path(file_path)["Pages"]
+
+def benchmark(extractor, pdf_files, pages):
+    """
+    วัดเวลาของตัวแยกข้อความหนึ่งตัว (ไม่เปิด tracemalloc ระหว่างจับเวลา)
+
+    Args:
+        extractor (TextExtractor): ตัวแยกข้อความ
+        pdf_files (list): พาธของไฟล์ PDF
+        pages (dict): พาธ -> จำนวนหน้า
+
+    Returns:
+        dict: ผลการวัด
+    """
+    result = {"name": extractor.name, "files": 0, "pages": 0, "chars": 0, "seconds": 0.0,
+              "peak_python": 0, "errors": 0}
+    for pdf_path in pdf_files:
+        start = time.perf_counter()
+        try:
+            text = extractor.extract(pdf_path)
+        except Exception as e:
+            print(f"{extractor.name}: เกิดข้อผิดพลาดกับ {os.path.basename(pdf_path)}: {e}")
+            result["errors"] += 1
+            continue
+        result["seconds"] += time.perf_counter() - start
+
+        result["files"] += 1
+        result["pages"] += pages[pdf_path]
+        result["chars"] += len(text)
+    return result
+
+def measure_peak_memory(extractor, pdf_files):
+    """
+    วัดหน่วยความจำสูงสุดของ Python ระหว่างแยกข้อความไฟล์เดียว
+
+    แยกจากการจับเวลาเพราะ tracemalloc ทำให้โค้ด Python (pypdf) ช้าลงมาก
+    แต่แทบไม่มีผลกับ Tika ที่ทำงานใน process อื่น
+
+    Args:
+        extractor (TextExtractor): ตัวแยกข้อความ
+        pdf_files (list): พาธของไฟล์ PDF
+
+    Returns:
+        int: หน่วยความจำสูงสุด (ไบต์)
+    """
+    peak = 0
+    for pdf_path in pdf_files:
+        tracemalloc.start()
+        try:
+            extractor.extract(pdf_path)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        except Exception:
+            # ข้อผิดพลาดถูกรายงานแล้วในรอบจับเวลา
+            pass
+        finally:
+            tracemalloc.stop()
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description="เปรียบเทียบตัวแยกข้อความจาก PDF")
+    parser.add_argument("files", nargs="*", help="ไฟล์ PDF (ค่าเริ่มต้น: ทุกไฟล์ใน DATA_DIR)")
+    parser.add_argument("--extractors", default=",".join(EXTRACTORS),
+                        help="ตัวแยกข้อความที่ต้องการเปรียบเทียบ คั่นด้วยจุลภาค")
+    parser.add_argument("--repeat", type=int, default=1, help="จำนวนรอบที่วัด (ใช้ผลที่เร็วที่สุด)")
+    args = parser.parse_args()
+
+    try:
+        pdf_files = args.files or [
+            os.path.join(DATA_DIR, filename)
+            for filename in sorted(os.listdir(DATA_DIR))
+            if filename.lower().endswith('.pdf')
+        ]
+        if not pdf_files:
+            print("ไม่พบไฟล์ PDF")
+            return
+        pages = {pdf_path: count_pages(pdf_path) for pdf_path in pdf_files}
+        print(f"ไฟล์ PDF {len(pdf_files)} ไฟล์, รวม {sum(pages.values())} หน้า")
+
+        results = []
+        for name in args.extractors.split(","):
+            try:
+                extractor = get_extractor(name.strip())
+            except Exception as e:
+                print(f"ข้าม {name}: {e}")
+                continue
+            runs = [benchmark(extractor, pdf_files, pages) for _ in range(max(1, args.repeat))]
+            result = min(runs, key=lambda r: r["seconds"])
+            result["peak_python"] = measure_peak_memory(extractor, pdf_files)
+            results.append(result)
+
+        print(f"\n{'ตัวแยก':<8}{'ไฟล์':>6}{'หน้า':>8}{'วินาที':>10}{'หน้า/s':>10}{'ตัวอักษร':>12}"
+              f"{'Python peak':>14}{'ผิดพลาด':>9}")
+        for r in results:
+            pages_per_sec = r["pages"] / r["seconds"] if r["seconds"] > 0 else 0
+            print(f"{r['name']:<8}{r['files']:>6}{r['pages']:>8}{r['seconds']:>10.2f}{pages_per_sec:>10.1f}"
+                  f"{r['chars']:>12}{format_size(r['peak_python']):>14}{r['errors']:>9}")
+
+        peak_rss = get_peak_memory()
+        if peak_rss is not None:
+            print(f"\nหน่วยความจำสูงสุดของ process (peak RSS): {format_size(peak_rss)}")
+        print("หมายเหตุ: หน่วยความจำของ Tika server (JVM) อยู่ใน process แยกและไม่ถูกนับรวมในตารางนี้")
+
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาด: {e}")
+        # แสดงรายละเอียดข้อผิดพลาด
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+โปรแกรมวัดเวลาเริ่มต้น (import) ของแต่ละสคริปต์ และตรวจว่าสคริปต์ใดโหลด dependency ขนาดใหญ่ตั้งแต่เริ่ม
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import traceback
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# dependency ที่ใช้เวลา import นาน
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "langchain", "easyocr", "tika", "pymilvus"]
+
+# โค้ดที่รันใน process ใหม่: โหลดสคริปต์โดยไม่เรียก main() (ทุกสคริปต์เรียก main เฉพาะเมื่อ __name__ == "__main__")
+PROBE = """
+import json, runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="startup_benchmark")
+elapsed = time.perf_counter() - start
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"seconds": elapsed, "heavy": heavy}))
+"""
+
+def measure(script_path):
+    """
+    วัดเวลาที่ใช้ import สคริปต์ใน process ใหม่
+
+    Args:
+        script_path (str): พาธของสคริปต์
+
+    Returns:
+        dict: เวลาทั้งหมดของ process, เวลา import ของสคริปต์ และ dependency ขนาดใหญ่ที่ถูกโหลด
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, script_path, json.dumps(HEAVY_MODULES)],
+        capture_output=True,
+        text=True
+    )
+    total = time.perf_counter() - start
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {"total": total, "error": error[-1] if error else f"exit code {completed.returncode}"}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["total"] = total
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="วัดเวลาเริ่มต้นของสคริปต์")
+    parser.add_argument("scripts", nargs="*", help="ชื่อสคริปต์ (ค่าเริ่มต้น: ทุกสคริปต์ในโฟลเดอร์ scripts)")
+    parser.add_argument("--repeat", type=int, default=3, help="จำนวนรอบที่วัด (ใช้ผลที่เร็วที่สุด)")
+    args = parser.parse_args()
+
+    try:
+        names = args.scripts or sorted(
+            name for name in os.listdir(SCRIPTS_DIR)
+            if name.endswith(".py") and name != os.path.basename(__file__)
+        )
+
+        print(f"{'สคริปต์':<26}{'process (s)':>12}{'import (s)':>12}  dependency ขนาดใหญ่")
+        for name in names:
+            script_path = os.path.join(SCRIPTS_DIR, name)
+            runs = [measure(script_path) for _ in range(max(1, args.repeat))]
+            best = min(runs, key=lambda r: r["total"])
+            if "error" in best:
+                print(f"{name:<26}{best['total']:>12.2f}{'-':>12}  เกิดข้อผิดพลาด: {best['error']}")
+                continue
+            heavy = ", ".join(best["heavy"]) or "-"
+            print(f"{name:<26}{best['total']:>12.2f}{best['seconds']:>12.2f}  {heavy}")
+
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาด: {e}")
+        # แสดงรายละเอียดข้อผิดพลาด
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
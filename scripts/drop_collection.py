@@ -9,6 +9,7 @@ import traceback
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pymilvus import connections, utility
+from src.database.manifest import manifest_path
 from src.config import COLLECTION_NAME, MILVUS_HOST, MILVUS_PORT
 
 def main():
@@ -28,6 +29,11 @@ def main():
                 print(f"ลบ collection {COLLECTION_NAME} เรียบร้อยแล้ว")
             else:
                 print(f"ไม่พบ collection: {COLLECTION_NAME}")
+            
+            # ลบรายการไฟล์ในเครื่องด้วย ไม่เช่นนั้นครั้งถัดไปจะข้ามทุกไฟล์ทั้งที่ collection ว่างเปล่า
+            if os.path.exists(manifest_path(COLLECTION_NAME)):
+                os.remove(manifest_path(COLLECTION_NAME))
+                print(f"ลบรายการไฟล์ในเครื่อง: {manifest_path(COLLECTION_NAME)}")
         else:
             print("ยกเลิกการลบ collection")
             
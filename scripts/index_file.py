@@ -3,7 +3,6 @@
 """
 import os
 import sys
-import time
 import traceback
 
 # เพิ่ม parent directory ไปยัง Python path
@@ -12,7 +11,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.embedding.model import EmbeddingModel
 from src.document.processor import DocumentProcessor
 from src.database.vector_db import VectorDatabase
-from src.config import PDF_PATH, COLLECTION_NAME, MODEL_NAME, USE_OCR
+from src.database.manifest import IngestionManifest, manifest_path
+from src.utils.helpers import compute_file_hash
+from src.config import (PDF_PATH, COLLECTION_NAME, MODEL_NAME, USE_OCR, INCREMENTAL_UPDATE,
+                        MANIFEST_ENABLED)
 
 def main():
     try:
@@ -31,30 +33,56 @@ def main():
         
         # สร้างหรือโหลด collection
         collection = vector_db.create_collection()
+        incremental = INCREMENTAL_UPDATE and vector_db.supports_incremental
+        
+        # ตรวจสอบกับรายการไฟล์ในเครื่องก่อน ถ้าไม่เปลี่ยนก็ไม่ต้อง query Milvus
+        manifest = None
+        status = None
+        if MANIFEST_ENABLED and os.path.exists(PDF_PATH):
+            manifest = IngestionManifest(manifest_path(COLLECTION_NAME), collection_id=vector_db.collection_id)
+            status, file_info = manifest.check(PDF_PATH)
         
         # ตรวจสอบว่าควรประมวลผลไฟล์นี้หรือไม่
-        should_process, file_mod_time = doc_processor.should_process_file(PDF_PATH, collection)
+        if status == IngestionManifest.UNCHANGED:
+            print(f"ไฟล์ {os.path.basename(PDF_PATH)} ไม่มีการเปลี่ยนแปลง (ตามรายการไฟล์ในเครื่อง) ข้ามไป")
+            should_process, file_mod_time = False, None
+        else:
+            should_process, file_mod_time = doc_processor.should_process_file(PDF_PATH, collection, incremental=incremental)
         
         if should_process:
             # ประมวลผลไฟล์
-            all_chunks, chunk_to_file_map, file_mod_times = doc_processor.process_file(PDF_PATH)
+            all_chunks, chunk_to_file_map, file_mod_times, chunk_metadata = doc_processor.process_file(PDF_PATH)
+            token_counts = [meta["tokens"] for meta in chunk_metadata]
             
-            # สร้าง embeddings
-            print("กำลังสร้าง embeddings...")
-            embeddings = []
-            for i, chunk in enumerate(all_chunks):
-                if i % 10 == 0:
-                    print(f"สร้าง embedding {i}/{len(all_chunks)}")
-                embedding = model.get_embedding(chunk)
-                embeddings.append(embedding)
+            if incremental:
+                # ลบ/เพิ่มเฉพาะ chunk ที่เปลี่ยนแปลง
+                vector_db.update_file_chunks(
+                    os.path.basename(PDF_PATH),
+                    file_mod_time,
+                    all_chunks,
+                    lambda texts: model.get_embeddings(texts, show_progress=True),
+                    chunk_metadata=chunk_metadata
+                )
+            else:
+                # สร้าง embeddings
+                print("กำลังสร้าง embeddings...")
+                embeddings = model.get_embeddings(all_chunks, show_progress=True, token_counts=token_counts)
                 
-            # เพิ่มข้อมูลลงในฐานข้อมูล
-            vector_db.insert_data(chunk_to_file_map, file_mod_times, all_chunks, embeddings)
+                # เพิ่มข้อมูลลงในฐานข้อมูล
+                vector_db.insert_data(chunk_to_file_map, file_mod_times, all_chunks, embeddings,
+                                      chunk_metadata=chunk_metadata)
+            
+            # ส่งข้อมูลที่พักไว้และ flush ก่อนทดสอบค้นหา
+            vector_db.commit()
+            # ไม่บันทึกไฟล์ที่ไม่มี chunk เพื่อให้ลองประมวลผลใหม่ในครั้งถัดไป
+            if manifest is not None and all_chunks:
+                manifest.record(PDF_PATH, file_info["size"], file_mod_time,
+                                file_info["content_hash"] or compute_file_hash(PDF_PATH), len(all_chunks))
             
             # ทดสอบค้นหา
             query_text = "ฐานข้อมูลเวกเตอร์คืออะไร"  # ตัวอย่างคำถามภาษาไทย
             print(f"กำลังค้นหา: '{query_text}'")
-            query_embedding = model.get_embedding(query_text)
+            query_embedding = model.get_query_embedding(query_text)
             
             results = vector_db.search(query_embedding)
             vector_db.display_results(results)
@@ -66,7 +94,7 @@ def main():
             if should_search == 'y':
                 query_text = input("กรอกคำค้น: ")
                 print(f"กำลังค้นหา: '{query_text}'")
-                query_embedding = model.get_embedding(query_text)
+                query_embedding = model.get_query_embedding(query_text)
                 
                 results = vector_db.search(query_embedding)
                 vector_db.display_results(results)
@@ -79,6 +107,12 @@ def main():
         # ปิดการเชื่อมต่อ
         if 'vector_db' in locals():
             vector_db.close()
+        if 'model' in locals():
+            model.close()
+        if 'doc_processor' in locals():
+            doc_processor.close()
+        if locals().get('manifest') is not None:
+            manifest.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -8,11 +8,44 @@ import traceback
 # เพิ่ม parent directory ไปยัง Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.embedding.model import EmbeddingModel
-from src.database.vector_db import VectorDatabase
-from src.config import COLLECTION_NAME, MODEL_NAME, SEARCH_LIMIT
+from src.service.client import SearchClient, display_results
+from src.config import COLLECTION_NAME, MODEL_NAME, SEARCH_LIMIT, SEARCH_SERVER_HOST, SEARCH_SERVER_PORT
+
+def search_with_service(client):
+    """
+    วนลูปค้นหาผ่าน search service ที่เปิดอยู่ (ไม่ต้องโหลดโมเดลเอง)
+
+    Args:
+        client (SearchClient): client ของ search service
+    """
+    print("\n=== ระบบค้นหาเอกสาร (ผ่าน search service) ===")
+    print("พิมพ์คำค้นเพื่อค้นหาในฐานข้อมูลเวกเตอร์")
+    print("พิมพ์ 'exit' เพื่อออกจากโปรแกรม")
+
+    while True:
+        query_text = input("\nกรอกคำค้น (หรือพิมพ์ 'exit' เพื่อออก): ")
+
+        if query_text.lower() == 'exit':
+            break
+
+        print(f"กำลังค้นหา: '{query_text}'")
+        display_results(client.search(query_text, limit=SEARCH_LIMIT))
 
 def main():
+    # ใช้ search service ถ้าเปิดอยู่ (เริ่มทำงานได้ทันทีโดยไม่ต้องโหลดโมเดล)
+    client = SearchClient(f"http://{SEARCH_SERVER_HOST}:{SEARCH_SERVER_PORT}")
+    if client.is_available():
+        try:
+            search_with_service(client)
+        except Exception as e:
+            print(f"เกิดข้อผิดพลาด: {e}")
+            traceback.print_exc()
+        return
+
+    # นำเข้าเฉพาะเมื่อต้องค้นหาเอง เพราะการโหลด torch และ pymilvus ใช้เวลานาน
+    from src.embedding.model import EmbeddingModel
+    from src.database.vector_db import VectorDatabase
+
     try:
         # สร้าง embedding model
         print("กำลังโหลดโมเดล embedding...")
@@ -36,10 +69,12 @@ def main():
             query_text = input("\nกรอกคำค้น (หรือพิมพ์ 'exit' เพื่อออก): ")
             
             if query_text.lower() == 'exit':
+                stats = model.query_cache.stats()
+                print(f"แคชคำค้น: hit {stats['hits']}, miss {stats['misses']} ({stats['hit_rate']*100:.1f}%)")
                 break
                 
             print(f"กำลังค้นหา: '{query_text}'")
-            query_embedding = model.get_embedding(query_text)
+            query_embedding = model.get_query_embedding(query_text)
             
             results = vector_db.search(query_embedding, limit=SEARCH_LIMIT)
             vector_db.display_results(results)
@@ -0,0 +1,59 @@
+"""
+โปรแกรมสำหรับเปิด search service ที่โหลดโมเดลและ collection ค้างไว้
+"""
+import os
+import sys
+import argparse
+import traceback
+
+# เพิ่ม parent directory ไปยัง Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embedding.model import EmbeddingModel
+from src.database.vector_db import VectorDatabase
+from src.service.search_service import SearchService, run_server
+from src.config import (
+    COLLECTION_NAME, MODEL_NAME, SEARCH_LIMIT,
+    SEARCH_SERVER_HOST, SEARCH_SERVER_PORT, SEARCH_SERVER_POOL_SIZE
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="เปิด search service")
+    parser.add_argument("--host", default=SEARCH_SERVER_HOST, help="โฮสต์ที่ต้องการ bind")
+    parser.add_argument("--port", type=int, default=SEARCH_SERVER_PORT, help="พอร์ตที่ต้องการ bind")
+    parser.add_argument("--pool-size", type=int, default=SEARCH_SERVER_POOL_SIZE,
+                        help="จำนวนการเชื่อมต่อ Milvus ใน pool")
+    args = parser.parse_args()
+
+    vector_dbs = []
+    try:
+        # โหลดโมเดลครั้งเดียวตลอดอายุของ service
+        print("กำลังโหลดโมเดล embedding...")
+        model = EmbeddingModel(model_name=MODEL_NAME)
+        # โหลดโมเดลทันที (ปกติจะโหลดเมื่อใช้งานครั้งแรก) เพื่อไม่ให้คำขอแรกช้า
+        model.model
+
+        # เปิดการเชื่อมต่อ Milvus ตามขนาด pool (แต่ละตัวใช้ alias ของตัวเอง)
+        for i in range(args.pool_size):
+            vector_db = VectorDatabase(
+                collection_name=COLLECTION_NAME,
+                dimension=model.dimension,
+                alias=f"search-service-{i}"
+            )
+            vector_db.create_collection()
+            vector_dbs.append(vector_db)
+
+        service = SearchService(model, vector_dbs, default_limit=SEARCH_LIMIT)
+        run_server(service, host=args.host, port=args.port)
+
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาด: {e}")
+        # แสดงรายละเอียดข้อผิดพลาด
+        traceback.print_exc()
+    finally:
+        # ปิดการเชื่อมต่อ
+        for vector_db in vector_dbs:
+            vector_db.close()
+
+if __name__ == "__main__":
+    main()
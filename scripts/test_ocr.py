@@ -13,7 +13,7 @@ from src.document.ocr_processor import OCRProcessor
 from tika import parser as tika_parser
 from src.config import OCR_LANG, OCR_CONFIG, OCR_DPI
 
-def test_easyocr(file_path, lang=None, config=None, dpi=None):
+def test_easyocr(file_path, lang=None, config=None, dpi=None, adaptive=None):
     """ทดสอบการทำงานของ EasyOCR"""
     print("\n=== ทดสอบ EasyOCR ===")
     
@@ -30,7 +30,7 @@ def test_easyocr(file_path, lang=None, config=None, dpi=None):
         ocr = OCRProcessor(lang=lang, config=config)
         
         # ทำ OCR
-        text = ocr.process_pdf(file_path, dpi=dpi)
+        text = ocr.process_pdf(file_path, dpi=dpi, adaptive=adaptive)
         
         # แสดงผลลัพธ์
         print("\n=== ผลลัพธ์จาก EasyOCR ===")
@@ -59,6 +59,9 @@ def test_easyocr(file_path, lang=None, config=None, dpi=None):
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        if 'ocr' in locals():
+            ocr.close()
 
 def test_tika_parser(file_path):
     """ทดสอบการทำงานของ Tika Parser"""
@@ -114,6 +117,8 @@ def main():
     parser.add_argument("--tika-only", action="store_true", help="ทดสอบเฉพาะ Tika")
     parser.add_argument("--lang", help=f"ภาษาที่ใช้ใน OCR (ค่าเริ่มต้น: {OCR_LANG})")
     parser.add_argument("--dpi", type=int, help=f"ความละเอียด DPI (ค่าเริ่มต้น: {OCR_DPI})")
+    parser.add_argument("--adaptive", action="store_true", default=None,
+                        help="ทำ OCR ที่ความละเอียดต่ำก่อน แล้วทำซ้ำที่ DPI เต็มเฉพาะหน้าที่จำเป็น")
     
     args = parser.parse_args()
     
@@ -131,12 +136,12 @@ def main():
     
     # ทดสอบตามที่กำหนด
     if args.ocr_only:
-        test_easyocr(args.file_path, args.lang, None, args.dpi)
+        test_easyocr(args.file_path, args.lang, None, args.dpi, args.adaptive)
     elif args.tika_only:
         test_tika_parser(args.file_path)
     else:
         # ทดสอบทั้ง OCR และ Tika
-        test_easyocr(args.file_path, args.lang, None, args.dpi)
+        test_easyocr(args.file_path, args.lang, None, args.dpi, args.adaptive)
         test_tika_parser(args.file_path)
     
     print("\nการทดสอบเสร็จสิ้น")
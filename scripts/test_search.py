@@ -36,18 +36,14 @@ def main():
             "เทคโนโลยีฐานข้อมูล"
         ]
         
-        # ทดสอบค้นหาด้วยคำภาษาไทยทั้งหมด
-        for i, query in enumerate(thai_queries):
+        # สร้าง embeddings ของคำค้น (ใช้แคชคำค้นในหน่วยความจำ ไม่เขียนลงแคชของ chunk บนดิสก์) และค้นหาในคำขอเดียว
+        query_embeddings = [model.get_query_embedding(query) for query in thai_queries]
+        all_results = vector_db.search_many(query_embeddings, limit=SEARCH_LIMIT)
+        
+        # แสดงผลลัพธ์ของแต่ละคำค้น
+        for i, (query, hits) in enumerate(zip(thai_queries, all_results)):
             print(f"\n=== ค้นหาคำที่ {i+1}: '{query}' ===")
-            
-            # สร้าง embedding สำหรับคำค้นหา
-            query_embedding = model.get_embedding(query)
-            
-            # ค้นหาในฐานข้อมูล
-            results = vector_db.search(query_embedding, limit=SEARCH_LIMIT)
-            
-            # แสดงผลลัพธ์
-            vector_db.display_results(results)
+            vector_db.display_results([hits])
         
     except Exception as e:
         print(f"เกิดข้อผิดพลาด: {e}")
@@ -0,0 +1,75 @@
+"""
+โปรแกรมปรับจูนพารามิเตอร์ค้นหาของ vector index ให้ได้ recall ตามเป้าหมายด้วยเวลาตอบสนองต่ำที่สุด
+"""
+import os
+import sys
+import argparse
+import traceback
+import numpy as np
+
+# เพิ่ม parent directory ไปยัง Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.vector_db import VectorDatabase
+from src.database.index_tuning import sample_query_vectors, tune_search_params
+from src.database.index_profiles import tuning_path
+from src.config import (COLLECTION_NAME, MODEL_NAME, EMBEDDING_DIMENSION, SEARCH_LIMIT,
+                        INDEX_TUNING_TARGET_RECALL)
+
+def main():
+    parser = argparse.ArgumentParser(description="ปรับจูนพารามิเตอร์ค้นหาของ vector index")
+    parser.add_argument("--samples", type=int, default=200, help="จำนวนคำค้นที่สุ่มจาก collection")
+    parser.add_argument("--queries", help="ไฟล์คำค้นจริง บรรทัดละหนึ่งคำค้น (ใช้แทนการสุ่มจาก collection)")
+    parser.add_argument("--limit", type=int, default=SEARCH_LIMIT, help="จำนวนผลลัพธ์ต่อคำค้น (k ของ recall@k)")
+    parser.add_argument("--target-recall", type=float, default=INDEX_TUNING_TARGET_RECALL, help="recall ขั้นต่ำที่ต้องการ")
+    parser.add_argument("--values", help="ค่าที่ต้องการทดลอง คั่นด้วยจุลภาค (ค่าเริ่มต้น: ตาม profile)")
+    parser.add_argument("--dry-run", action="store_true", help="แสดงผลอย่างเดียว ไม่บันทึกค่าที่เลือก")
+    args = parser.parse_args()
+
+    try:
+        model = None
+        if args.queries or EMBEDDING_DIMENSION is None:
+            from src.embedding.model import EmbeddingModel
+            model = EmbeddingModel(model_name=MODEL_NAME)
+
+        vector_db = VectorDatabase(
+            collection_name=COLLECTION_NAME,
+            dimension=model.dimension if model is not None else EMBEDDING_DIMENSION,
+            use_result_cache=False
+        )
+        vector_db.create_collection()
+
+        query_ids = None
+        if args.queries:
+            with open(args.queries, encoding="utf-8") as f:
+                texts = [line.strip() for line in f if line.strip()]
+            queries = [model.get_query_embedding(text) for text in texts]
+        else:
+            query_ids, queries = sample_query_vectors(vector_db, args.samples)
+        print(f"คำค้น {len(queries)} คำ, k = {args.limit}, recall เป้าหมาย {args.target_recall}")
+
+        values = [int(value) for value in args.values.split(",")] if args.values else None
+        report = tune_search_params(vector_db, np.asarray(queries, dtype=np.float32), args.target_recall,
+                                    args.limit, values=values, persist=not args.dry_run, query_ids=query_ids)
+
+        print(f"\n{report['search_param']:>12}{'recall':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}{'QPS':>10}")
+        for r in report["results"]:
+            marker = "  ←" if r["value"] == report["best"] else ""
+            print(f"{r['value']:>12}{r['recall']:>10.4f}{r['p50_ms']:>12.2f}{r['p99_ms']:>12.2f}{r['qps']:>10.1f}{marker}")
+
+        if args.dry_run:
+            print(f"\nค่าที่ดีที่สุด: {report['search_param']} = {report['best']} (ไม่ได้บันทึก)")
+        else:
+            print(f"\nบันทึก {report['search_param']} = {report['best']} ไว้ที่ {tuning_path(COLLECTION_NAME)}")
+
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาด: {e}")
+        # แสดงรายละเอียดข้อผิดพลาด
+        traceback.print_exc()
+    finally:
+        # ปิดการเชื่อมต่อ
+        if 'vector_db' in locals():
+            vector_db.close()
+
+if __name__ == "__main__":
+    main()
@@ -12,18 +12,84 @@ PDF_PATH = os.path.join(DATA_DIR, "Vector Database.pdf")
 COLLECTION_NAME = "pdf_collection_thai_labse"
 MILVUS_HOST = "localhost"  # หรือ "milvus-standalone" ถ้ารันในคอนเทนเนอร์ Docker เดียวกัน
 MILVUS_PORT = "19530"
+WRITE_BUFFER_ENABLED = True  # รวมข้อมูลหลายไฟล์ก่อน insert และ flush ครั้งเดียวตอน commit/close
+WRITE_BUFFER_MAX_ROWS = 8192  # จำนวนแถวสูงสุดที่พักไว้ก่อนส่ง insert
+WRITE_BUFFER_MAX_BYTES = 32 * 1024 * 1024  # ขนาดโดยประมาณสูงสุดของข้อมูลที่พักไว้ (ต่ำกว่าขนาดข้อความสูงสุดของ gRPC)
+WRITE_BUFFER_MAX_SECONDS = 60  # เวลาสูงสุดที่ข้อมูลถูกพักไว้ก่อนส่ง insert (วินาที)
+SCALAR_INDEX_TYPE = "INVERTED"  # index ของ file_name สำหรับ query/delete รายไฟล์ ("INVERTED" หรือ "Trie")
+PARTITION_KEY_ENABLED = False  # ใช้ file_name เป็น partition key ให้ Milvus ค้นหา/ลบรายไฟล์เฉพาะ partition ที่เกี่ยวข้อง (มีผลกับ collection ที่สร้างใหม่เท่านั้น)
+PARTITION_KEY_NUM_PARTITIONS = 64  # จำนวน partition ที่ใช้กระจายไฟล์ตาม hash ของ file_name
+INDEX_PROFILE = "hnsw"  # ชนิดของ vector index สำหรับ collection ใหม่: "hnsw", "ivf_flat", "ivf_sq8", "ivf_pq" หรือ "diskann" (ดู src/database/index_profiles.py)
+INDEX_TUNING_DIR = os.path.join(BASE_DIR, ".cache", "index_tuning")  # ผลการปรับจูนพารามิเตอร์ค้นหา (แยกไฟล์ตามชื่อ collection)
+INDEX_TUNING_TARGET_RECALL = 0.95  # recall ขั้นต่ำที่ต้องการเมื่อปรับจูน (เทียบกับการค้นหาแบบ exact)
+MANIFEST_QUERY_BATCH_SIZE = 10000  # จำนวนแถวต่อหน้าเมื่ออ่านรายชื่อไฟล์ทั้ง collection
+MANIFEST_ENABLED = True  # บันทึกรายการไฟล์ที่เพิ่มแล้วไว้ในเครื่อง (SQLite) เพื่อข้ามไฟล์ที่ไม่เปลี่ยนโดยไม่ต้อง query Milvus
+MANIFEST_DIR = os.path.join(BASE_DIR, ".cache", "manifest")  # โฟลเดอร์ของรายการไฟล์ (แยกไฟล์ตามชื่อ collection)
 
 # Embedding model configuration
 MODEL_NAME = "sentence-transformers/LaBSE"
+EMBEDDING_DIMENSION = 768  # ขนาด vector ของ MODEL_NAME ใช้เปิด collection ได้โดยไม่ต้องโหลดโมเดล (None = อ่านจากโมเดล)
+EMBEDDING_BACKEND = "torch"  # "torch" (fp32), "torch-int8" (dynamic quantization), "onnx" หรือ "onnx-int8" (ONNX Runtime, ต้องติดตั้ง optimum[onnxruntime])
+EMBEDDING_ONNX_DIR = os.path.join(BASE_DIR, ".cache", "onnx")  # โมเดล ONNX ที่แปลงแล้ว (แปลงครั้งเดียวตอนใช้งานครั้งแรก)
+EMBEDDING_ONNX_QUANT_CONFIG = "avx2"  # ชุดคำสั่งของ CPU สำหรับ onnx-int8: "avx2", "avx512", "avx512_vnni" หรือ "arm64"
+EMBEDDING_BATCH_SIZE = 32  # จำนวนข้อความต่อ micro-batch ในการสร้าง embeddings
+EMBEDDING_WORKERS = 1  # จำนวน process สำหรับสร้าง embeddings แบบขนาน (1 = ไม่ใช้ process pool, เครื่องหลาย socket ให้ตั้งเท่าจำนวน socket/NUMA node หรือมากกว่า)
+EMBEDDING_WORKER_THREADS = None  # จำนวน thread ของ torch ต่อ process (None = จำนวนคอร์หารด้วย EMBEDDING_WORKERS)
+EMBEDDING_CACHE_ENABLED = True  # เก็บ embeddings ของแต่ละ chunk ไว้บนดิสก์เพื่อไม่ต้องคำนวณซ้ำ
+EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "embeddings")
+EMBEDDING_CACHE_MAX_ENTRIES = 100000  # จำนวน embeddings สูงสุดในแคช (LaBSE: ~3 KB ต่อรายการ)
+EMBEDDING_CACHE_SAVE_EVERY = 4096  # บันทึก index ของแคชเมื่อมีรายการใหม่ครบจำนวนนี้ (ที่เหลือบันทึกตอน commit/close)
+QUERY_CACHE_MAX_ENTRIES = 1024  # จำนวนคำค้นสูงสุดที่เก็บ embedding ไว้ในหน่วยความจำ
+QUERY_CACHE_MAX_BYTES = 16 * 1024 * 1024  # ขนาดรวมสูงสุดของแคชคำค้น (None = ไม่จำกัด)
+QUERY_CACHE_TTL = 3600  # อายุของ embedding คำค้นในแคช (วินาที, None = ไม่หมดอายุ)
 
 # Document processing configuration
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+CHUNK_BY_TOKENS = True  # แบ่งข้อความตามจำนวน token ของ tokenizer ของโมเดลแทนจำนวนตัวอักษร (CHUNK_SIZE/CHUNK_OVERLAP)
+# ไฟล์ที่เพิ่มไว้แล้วจะไม่ถูกแบ่งใหม่เองเมื่อเปลี่ยนค่าด้านบน ให้รัน scripts/batch_index.py --rechunk หนึ่งครั้ง
+CHUNK_MAX_TOKENS = 254  # จำนวน token สูงสุดต่อ chunk (LaBSE รับได้ 256 tokens รวม [CLS] และ [SEP])
+CHUNK_OVERLAP_TOKENS = 50  # จำนวน token ที่ซ้อนกันระหว่าง chunk
+STREAM_SPLIT_CHARS = 16000  # จำนวนตัวอักษรที่สะสมจากหลายหน้าก่อนแบ่ง chunk ในโหมด streaming
+INCREMENTAL_UPDATE = True  # อัปเดตเฉพาะ chunk ที่เปลี่ยนแปลงแทนการลบแล้วเพิ่มใหม่ทั้งไฟล์
 USE_OCR = False       # ใช้ OCR สำหรับการแปลง PDF เป็นข้อความ
+PDF_EXTRACTOR = "tika"  # ตัวแยกข้อความเมื่อไม่ใช้ OCR: "tika" (Tika server) หรือ "pypdf" (ใน process, ไม่ต้องใช้ Java)
 OCR_DPI = 800        # ความละเอียดของรูปภาพสำหรับ OCR (เพิ่มเป็น 800 เพื่อความแม่นยำในการรู้จำภาษาไทย)
 OCR_LANG = "tha+eng"  # ภาษาที่ใช้ในการ OCR (tha: ภาษาไทย, eng: ภาษาอังกฤษ, tha+eng: ทั้งสองภาษา)
                       # เมื่อใช้ EasyOCR จะแปลงเป็น "th" และ "en" โดยอัตโนมัติ
 OCR_CONFIG = ""       # ไม่จำเป็นต้องใช้ใน EasyOCR แต่เก็บไว้เพื่อความเข้ากันได้
 OCR_GPU=True
+OCR_ADAPTIVE = False  # ทำ OCR ที่ OCR_LOW_DPI ก่อน แล้วทำซ้ำที่ OCR_DPI เฉพาะหน้าที่ผลลัพธ์ไม่ผ่านเกณฑ์
+OCR_LOW_DPI = 300     # ความละเอียดรอบแรกในโหมด adaptive
+OCR_MIN_CONFIDENCE = 0.6  # ค่าความมั่นใจเฉลี่ยขั้นต่ำของ EasyOCR ก่อนต้องทำซ้ำที่ความละเอียดสูง
+OCR_MIN_THAI_RATIO = 0.2  # สัดส่วนตัวอักษรไทยขั้นต่ำ (ตั้งเป็น 0 ถ้าเอกสารส่วนใหญ่เป็นภาษาอังกฤษ)
+OCR_RENDER_WINDOW = 1 # จำนวนหน้าที่แปลงเป็นรูปภาพพร้อมกันต่อครั้ง (ที่ 800 DPI หน้า A4 หนึ่งหน้าใช้หน่วยความจำหลายร้อย MB)
+OCR_WORKERS = 1       # จำนวน process สำหรับ OCR แบบขนานทีละหน้า (1 = ไม่ใช้ process pool, เหมาะกับเครื่องที่ไม่มี GPU ให้ตั้งเท่าจำนวนคอร์)
+
+# Ingestion pipeline configuration (batch_index.py)
+PIPELINE_EXTRACT_WORKERS = 4    # จำนวน worker สำหรับแปลง PDF เป็นข้อความ (Tika/OCR)
+PIPELINE_CHUNK_WORKERS = 1      # จำนวน worker สำหรับแบ่งข้อความเป็นส่วนย่อย
+PIPELINE_EMBED_WORKERS = 1      # จำนวน worker สำหรับสร้าง embeddings
+PIPELINE_INSERT_WORKERS = 1     # จำนวน worker สำหรับเพิ่มข้อมูลลง Milvus
+PIPELINE_QUEUE_SIZE = 8         # จำนวนไฟล์สูงสุดที่รอในคิวระหว่างแต่ละขั้นตอน
+PIPELINE_EMBED_BATCH_CHUNKS = 512    # จำนวน chunks สูงสุดที่รวมจากหลายไฟล์ต่อการสร้าง embeddings หนึ่งครั้ง
+PIPELINE_INSERT_BATCH_CHUNKS = 4096  # จำนวน chunks สูงสุดที่รวมจากหลายไฟล์ต่อการ insert หนึ่งครั้ง
+PIPELINE_STREAMING = True       # แปลงข้อความและแบ่ง chunk ทีละหน้า แล้วส่งต่อไปสร้าง embeddings ก่อนอ่านไฟล์จบ
+PIPELINE_STREAM_PART_CHUNKS = 64     # จำนวน chunks ต่อส่วนที่ส่งต่อในโหมด streaming
+
 # Search configuration
-SEARCH_LIMIT = 5
\ No newline at end of file
+SEARCH_LIMIT = 5
+SEARCH_MAX_BATCH = 256  # จำนวน query สูงสุดต่อการค้นหาหนึ่งครั้งใน search_many
+SEARCH_CACHE_ENABLED = True  # แคชผลลัพธ์การค้นหาใน process (ล้างอัตโนมัติเมื่อ insert/delete ผ่าน VectorDatabase เดียวกัน)
+SEARCH_CACHE_MAX_ENTRIES = 4096  # จำนวนผลลัพธ์สูงสุดในแคช
+SEARCH_CACHE_MAX_BYTES = 64 * 1024 * 1024  # ขนาดรวมสูงสุดของแคชผลลัพธ์
+SEARCH_CACHE_TTL = 300  # อายุของผลลัพธ์ในแคช (วินาที) การแก้ไขจาก process อื่นจะเห็นในการค้นหาช้าสุดเท่านี้
+
+# Async client configuration
+ASYNC_MAX_CONCURRENCY = 16  # จำนวนคำขอสูงสุดที่ AsyncVectorDatabase ส่งไปยัง Milvus พร้อมกัน
+ASYNC_EMBEDDING_WORKERS = 1  # จำนวน thread สำหรับสร้าง embeddings ใน AsyncEmbeddingExecutor
+
+# Search service configuration
+SEARCH_SERVER_HOST = "127.0.0.1"  # โฮสต์ของ search service
+SEARCH_SERVER_PORT = 8765  # พอร์ตของ search service
+SEARCH_SERVER_POOL_SIZE = 4  # จำนวนการเชื่อมต่อ Milvus ใน pool ของ search service
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+โมดูลสำหรับการจัดการฐานข้อมูลเวกเตอร์แบบ asyncio
+"""
+import asyncio
+from pymilvus import AsyncMilvusClient, MilvusClient
+from src.utils.helpers import compute_text_hash
+from src.database.filters import build_filter
+from src.database.index_profiles import profile_for_index_type, load_search_params, make_search_params
+from src.config import SEARCH_MAX_BATCH, ASYNC_MAX_CONCURRENCY
+
+class AsyncVectorDatabase:
+    """
+    คลาสสำหรับค้นหาและเพิ่มข้อมูลใน Milvus แบบ asyncio
+
+    ใช้ AsyncMilvusClient ตัวเดียวตลอดอายุของ instance และจำกัดจำนวนคำขอที่ส่งไปยัง
+    Milvus พร้อมกันด้วย semaphore ใช้กับ collection ที่สร้างไว้แล้วด้วย VectorDatabase
+    """
+    def __init__(self, collection_name, dimension, host="localhost", port="19530", max_concurrency=None):
+        """
+        สร้าง instance ของ AsyncVectorDatabase (ต้องเรียก connect ก่อนใช้งาน)
+
+        Args:
+            collection_name (str): ชื่อของ collection ใน Milvus
+            dimension (int): ขนาดของ vector embedding
+            host (str): โฮสต์ของ Milvus server
+            port (str): พอร์ตของ Milvus server
+            max_concurrency (int): จำนวนคำขอสูงสุดที่ส่งไปยัง Milvus พร้อมกัน
+        """
+        self.collection_name = collection_name
+        self.dimension = dimension
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency or ASYNC_MAX_CONCURRENCY
+        self.client = None
+        self.output_fields = ["file_name", "text_chunk", "file_mod_time"]
+        self.supports_incremental = False
+        self.supports_metadata = False
+        self.index_profile = None
+        self.search_value = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def connect(self):
+        """
+        เชื่อมต่อกับ Milvus และโหลด collection
+        """
+        print("กำลังเชื่อมต่อกับ Milvus (async)...")
+        uri = f"http://{self.host}:{self.port}"
+        self.client = AsyncMilvusClient(uri=uri)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # AsyncMilvusClient ไม่มี describe_collection จึงอ่าน schema ด้วย client ปกติใน thread แยกครั้งเดียว
+        loop = asyncio.get_running_loop()
+        description, index_type = await loop.run_in_executor(None, self._describe_collection, uri)
+        field_names = {field["name"] for field in description.get("fields", [])}
+        self.supports_incremental = {"chunk_hash", "chunk_index"} <= field_names
+        self.supports_metadata = {"page_number", "char_start", "char_end", "extraction_method"} <= field_names
+        if self.supports_metadata:
+            self.output_fields = self.output_fields + ["page_number"]
+        self.index_profile, self.search_value = load_search_params(
+            self.collection_name, profile_for_index_type(index_type)
+        )
+
+        await self.client.load_collection(self.collection_name)
+        print("เชื่อมต่อกับ Milvus เรียบร้อยแล้ว")
+
+    def _describe_collection(self, uri):
+        """
+        อ่านรายละเอียดของ collection และชนิดของ vector index (ทำงานแบบ blocking)
+
+        Args:
+            uri (str): ที่อยู่ของ Milvus server
+
+        Returns:
+            tuple: (รายละเอียดของ collection, ชนิดของ index ของ embedding หรือ None)
+        """
+        client = MilvusClient(uri=uri)
+        try:
+            description = client.describe_collection(self.collection_name)
+            index_type = None
+            for index_name in client.list_indexes(self.collection_name, field_name="embedding"):
+                index_type = client.describe_index(self.collection_name, index_name).get("index_type")
+            return description, index_type
+        finally:
+            client.close()
+
+    async def search(self, query_embedding, limit=5, file_name=None, pages=None, expr=None):
+        """
+        ค้นหาข้อมูลที่คล้ายกับ query embedding
+
+        Args:
+            query_embedding: embedding vector ของคำค้น
+            limit (int): จำนวนผลลัพธ์ที่ต้องการ
+            file_name (str): ค้นหาเฉพาะในไฟล์นี้
+            pages (list): ค้นหาเฉพาะหน้าเหล่านี้
+            expr (str): เงื่อนไขการกรองเพิ่มเติมของ Milvus
+
+        Returns:
+            list: ผลลัพธ์ของ query (list ของ dict ที่มี id, distance และ entity)
+        """
+        results = await self.search_many([query_embedding], limit=limit, file_name=file_name, pages=pages,
+                                         expr=expr)
+        return results[0]
+
+    async def search_many(self, query_embeddings, limit=5, max_batch=None, file_name=None, pages=None,
+                          expr=None):
+        """
+        ค้นหาข้อมูลสำหรับหลาย query (แบ่งเป็นชุดละไม่เกิน max_batch และส่งพร้อมกัน)
+
+        Args:
+            query_embeddings: embedding vectors ของคำค้น
+            limit (int): จำนวนผลลัพธ์ที่ต้องการต่อ query
+            max_batch (int): จำนวน query สูงสุดต่อการเรียก Milvus หนึ่งครั้ง
+            file_name (str): ค้นหาเฉพาะในไฟล์นี้
+            pages (list): ค้นหาเฉพาะหน้าเหล่านี้
+            expr (str): เงื่อนไขการกรองเพิ่มเติมของ Milvus (รวมกับ file_name และ pages ด้วย and)
+
+        Returns:
+            list: ผลลัพธ์ของแต่ละ query เรียงตามลำดับของ query_embeddings
+        """
+        self._check_connected()
+        if max_batch is None:
+            max_batch = SEARCH_MAX_BATCH
+        expr = build_filter(file_name, pages, expr, supports_metadata=self.supports_metadata)
+
+        batches = [
+            [list(map(float, embedding)) for embedding in query_embeddings[start:start + max_batch]]
+            for start in range(0, len(query_embeddings), max_batch)
+        ]
+        batch_results = await asyncio.gather(*(self._search_batch(batch, limit, expr) for batch in batches))
+        return [hits for results in batch_results for hits in results]
+
+    async def _search_batch(self, data, limit, expr=None):
+        """
+        ส่งคำขอค้นหาหนึ่งชุดไปยัง Milvus (จำกัดจำนวนคำขอพร้อมกันด้วย semaphore)
+
+        Args:
+            data (list): embedding vectors ของคำค้น
+            limit (int): จำนวนผลลัพธ์ที่ต้องการต่อ query
+            expr (str): เงื่อนไขการกรอง
+
+        Returns:
+            list: ผลลัพธ์ของแต่ละ query
+        """
+        async with self._semaphore:
+            return await self.client.search(
+                collection_name=self.collection_name,
+                data=data,
+                filter=expr or "",
+                anns_field="embedding",
+                search_params=self._search_params(limit),
+                limit=limit,
+                output_fields=self.output_fields
+            )
+
+    async def insert(self, chunk_to_file_map, file_mod_times, all_chunks, embeddings,
+                     chunk_hashes=None, chunk_indices=None, chunk_metadata=None):
+        """
+        เพิ่มข้อมูลเข้า collection
+
+        Args:
+            chunk_to_file_map (list): ชื่อไฟล์ของแต่ละส่วน
+            file_mod_times (list): เวลาที่แก้ไขของแต่ละไฟล์
+            all_chunks (list): ข้อความย่อยทั้งหมด
+            embeddings (list): embedding vectors
+            chunk_hashes (list): hash ของแต่ละส่วน (คำนวณให้ถ้าไม่ระบุ)
+            chunk_indices (list): ลำดับของแต่ละส่วนในไฟล์ (ใช้ 0..n-1 ถ้าไม่ระบุ)
+            chunk_metadata (list): dict ที่มี page, char_start, char_end และ method ของแต่ละส่วน
+
+        Returns:
+            dict: ผลลัพธ์การ insert จาก Milvus
+        """
+        self._check_connected()
+
+        rows = []
+        for i, chunk in enumerate(all_chunks):
+            row = {
+                "file_name": chunk_to_file_map[i],
+                "file_mod_time": file_mod_times[i],
+                "text_chunk": chunk,
+                "embedding": list(map(float, embeddings[i])),
+            }
+            if self.supports_incremental:
+                row["chunk_hash"] = chunk_hashes[i] if chunk_hashes is not None else compute_text_hash(chunk)
+                row["chunk_index"] = chunk_indices[i] if chunk_indices is not None else i
+            if self.supports_metadata:
+                meta = (chunk_metadata[i] if chunk_metadata is not None else None) or {}
+                row["page_number"] = meta.get("page", 0)
+                row["char_start"] = meta.get("char_start", -1)
+                row["char_end"] = meta.get("char_end", -1)
+                row["extraction_method"] = meta.get("method", "")
+            rows.append(row)
+
+        async with self._semaphore:
+            return await self.client.insert(collection_name=self.collection_name, data=rows)
+
+    async def query(self, expr, output_fields=None, limit=None):
+        """
+        ดึงข้อมูลตามเงื่อนไข
+
+        Args:
+            expr (str): เงื่อนไขการกรอง เช่น 'file_name == "a.pdf"'
+            output_fields (list): ฟิลด์ที่ต้องการ
+            limit (int): จำนวนแถวสูงสุด
+
+        Returns:
+            list: แถวที่ตรงเงื่อนไข
+        """
+        self._check_connected()
+        kwargs = {"limit": limit} if limit is not None else {}
+        async with self._semaphore:
+            return await self.client.query(
+                collection_name=self.collection_name,
+                filter=expr,
+                output_fields=output_fields or self.output_fields,
+                **kwargs
+            )
+
+    def _search_params(self, limit=None):
+        """
+        พารามิเตอร์สำหรับการค้นหา (เหมือนกับ VectorDatabase)
+
+        Args:
+            limit (int): จำนวนผลลัพธ์ที่ต้องการ
+
+        Returns:
+            dict: search params ของ Milvus
+        """
+        return make_search_params(self.index_profile, self.search_value, limit)
+
+    def _check_connected(self):
+        """
+        ตรวจสอบว่าเชื่อมต่อกับ Milvus แล้ว
+        """
+        if self.client is None:
+            raise ValueError("ยังไม่ได้เชื่อมต่อกับ Milvus (เรียก connect ก่อน)")
+
+    async def close(self):
+        """
+        ปิดการเชื่อมต่อกับ Milvus
+        """
+        if self.client is not None:
+            print("กำลังปิดการเชื่อมต่อ (async)...")
+            await self.client.close()
+            self.client = None
@@ -0,0 +1,30 @@
+"""
+โมดูลสำหรับสร้างเงื่อนไขการกรองของ Milvus (ใช้ร่วมกันระหว่าง VectorDatabase และ AsyncVectorDatabase)
+"""
+import json
+
+def build_filter(file_name=None, pages=None, expr=None, supports_metadata=True):
+    """
+    สร้างเงื่อนไขการกรองของ Milvus จากชื่อไฟล์ หมายเลขหน้า และเงื่อนไขเพิ่มเติม
+
+    เงื่อนไขบน file_name ใช้ index ของ file_name (และ partition key ถ้าเปิดใช้)
+
+    Args:
+        file_name (str): ชื่อไฟล์
+        pages (list): หมายเลขหน้า
+        expr (str): เงื่อนไขเพิ่มเติม
+        supports_metadata (bool): collection มีฟิลด์ page_number หรือไม่
+
+    Returns:
+        str: เงื่อนไขการกรอง หรือ None ถ้าไม่กรอง
+    """
+    conditions = []
+    if file_name is not None:
+        conditions.append(f"file_name == {json.dumps(file_name, ensure_ascii=False)}")
+    if pages:
+        if not supports_metadata:
+            raise ValueError("collection นี้ไม่มีฟิลด์ page_number จึงกรองตามหน้าไม่ได้")
+        conditions.append(f"page_number in {[int(page) for page in pages]}")
+    if expr:
+        conditions.append(f"({expr})")
+    return " and ".join(conditions) if conditions else None
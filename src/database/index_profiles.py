@@ -0,0 +1,171 @@
+"""
+โมดูลสำหรับกำหนดชนิดของ vector index (profile) และพารามิเตอร์การค้นหาที่ปรับจูนแล้ว
+"""
+import os
+import time
+from src.utils.helpers import save_json, load_json
+from src.config import INDEX_PROFILE, INDEX_TUNING_DIR
+
+# profile ของ vector index
+# - index_type/params: ใช้ตอนสร้าง index
+# - search_param: ชื่อพารามิเตอร์ตอนค้นหาที่แลกความแม่นยำกับความเร็ว
+# - search_default: ค่าเริ่มต้นก่อนปรับจูน
+# - sweep: ค่าที่ทดลองตอนปรับจูน (จากเร็วไปแม่น)
+INDEX_PROFILES = {
+    "hnsw": {
+        "index_type": "HNSW",
+        "params": {"M": 16, "efConstruction": 200},
+        "search_param": "ef",
+        "search_default": 100,
+        "sweep": [16, 32, 64, 100, 128, 256, 512],
+    },
+    "ivf_flat": {
+        "index_type": "IVF_FLAT",
+        "params": {"nlist": 1024},
+        "search_param": "nprobe",
+        "search_default": 16,
+        "sweep": [1, 4, 8, 16, 32, 64, 128],
+    },
+    "ivf_sq8": {
+        "index_type": "IVF_SQ8",
+        "params": {"nlist": 1024},
+        "search_param": "nprobe",
+        "search_default": 16,
+        "sweep": [1, 4, 8, 16, 32, 64, 128],
+    },
+    "ivf_pq": {
+        "index_type": "IVF_PQ",
+        # m = None ใช้ dimension / 8 (dimension ต้องหารด้วย m ลงตัว)
+        "params": {"nlist": 1024, "m": None, "nbits": 8},
+        "search_param": "nprobe",
+        "search_default": 32,
+        "sweep": [4, 8, 16, 32, 64, 128, 256],
+    },
+    "diskann": {
+        "index_type": "DISKANN",
+        "params": {},
+        "search_param": "search_list",
+        "search_default": 100,
+        "sweep": [20, 50, 100, 150, 200, 300, 400],
+    },
+}
+
+def get_profile(name=None):
+    """
+    อ่าน profile ของ vector index ตามชื่อ
+
+    Args:
+        name (str): ชื่อ profile (ค่าเริ่มต้น: INDEX_PROFILE)
+
+    Returns:
+        dict: profile
+    """
+    name = name or INDEX_PROFILE
+    if name not in INDEX_PROFILES:
+        raise ValueError(f"ไม่รู้จัก index profile: {name} (เลือกได้: {', '.join(INDEX_PROFILES)})")
+    return INDEX_PROFILES[name]
+
+def profile_for_index_type(index_type):
+    """
+    หาชื่อ profile จากชนิดของ index ที่มีอยู่แล้วใน collection
+
+    Args:
+        index_type (str): ชนิดของ index เช่น "HNSW"
+
+    Returns:
+        str: ชื่อ profile หรือ None ถ้าไม่รู้จัก
+    """
+    for name, profile in INDEX_PROFILES.items():
+        if profile["index_type"] == index_type:
+            return name
+    return None
+
+def build_index_params(name, dimension):
+    """
+    สร้าง index params ของ Milvus สำหรับ vector field
+
+    Args:
+        name (str): ชื่อ profile
+        dimension (int): ขนาดของ vector embedding
+
+    Returns:
+        dict: index params
+    """
+    profile = get_profile(name)
+    params = dict(profile["params"])
+    if profile["index_type"] == "IVF_PQ" and params.get("m") is None:
+        params["m"] = dimension // 8 if dimension % 8 == 0 else 1
+    return {
+        "metric_type": "COSINE",
+        "index_type": profile["index_type"],
+        "params": params
+    }
+
+def make_search_params(name, value=None, limit=None):
+    """
+    สร้าง search params ของ Milvus
+
+    Args:
+        name (str): ชื่อ profile
+        value (int): ค่าของพารามิเตอร์ค้นหา (ค่าเริ่มต้น: search_default ของ profile)
+        limit (int): จำนวนผลลัพธ์ (HNSW และ DISKANN ต้องใช้ค่าไม่น้อยกว่า limit)
+
+    Returns:
+        dict: search params
+    """
+    profile = get_profile(name)
+    value = value if value is not None else profile["search_default"]
+    if limit is not None and profile["search_param"] in ("ef", "search_list"):
+        value = max(value, limit)
+    return {
+        "metric_type": "COSINE",
+        "params": {profile["search_param"]: value}
+    }
+
+def tuning_path(collection_name):
+    """
+    พาธของไฟล์ผลการปรับจูนของ collection
+
+    Args:
+        collection_name (str): ชื่อ collection
+
+    Returns:
+        str: พาธของไฟล์ JSON
+    """
+    return os.path.join(INDEX_TUNING_DIR, f"{collection_name}.json")
+
+def load_search_params(collection_name, name=None):
+    """
+    อ่าน search params ที่ปรับจูนไว้ของ collection (ใช้ค่าเริ่มต้นของ profile ถ้ายังไม่เคยปรับจูน)
+
+    Args:
+        collection_name (str): ชื่อ collection
+        name (str): ชื่อ profile ของ index ใน collection (None = ใช้ profile ในผลการปรับจูน หรือ INDEX_PROFILE)
+
+    Returns:
+        tuple: (ชื่อ profile, ค่าของพารามิเตอร์ค้นหา)
+    """
+    tuned = load_json(tuning_path(collection_name))
+    if tuned is not None and (name is None or tuned.get("profile") == name):
+        return tuned["profile"], tuned["value"]
+    name = name or INDEX_PROFILE
+    return name, get_profile(name)["search_default"]
+
+def save_search_params(collection_name, name, value, report=None):
+    """
+    บันทึกค่าพารามิเตอร์ค้นหาที่ดีที่สุดของ collection
+
+    Args:
+        collection_name (str): ชื่อ collection
+        name (str): ชื่อ profile
+        value (int): ค่าของพารามิเตอร์ค้นหา
+        report (dict): ผลการวัดที่ใช้เลือกค่านี้
+    """
+    os.makedirs(INDEX_TUNING_DIR, exist_ok=True)
+    save_json({
+        "profile": name,
+        "search_param": get_profile(name)["search_param"],
+        "value": value,
+        "tuned_at": time.time(),
+        "report": report or {},
+    }, tuning_path(collection_name))
@@ -0,0 +1,217 @@
+"""
+โมดูลสำหรับปรับจูนพารามิเตอร์ค้นหาของ vector index (ef, nprobe หรือ search_list)
+โดยวัด recall เทียบกับการค้นหาแบบ exact และเวลาตอบสนองของแต่ละค่า
+"""
+import time
+import numpy as np
+from src.database.index_profiles import get_profile, make_search_params, save_search_params
+
+def _normalize(vectors):
+    """
+    ปรับ vectors ให้มีความยาวเท่ากับ 1 (สำหรับ cosine similarity)
+
+    Args:
+        vectors (numpy.ndarray): เมทริกซ์ของ vectors
+
+    Returns:
+        numpy.ndarray: เมทริกซ์ที่ปรับแล้ว
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def sample_query_vectors(vector_db, sample, seed=0, batch_size=10000):
+    """
+    สุ่ม embeddings ที่เก็บอยู่ใน collection มาใช้เป็นคำค้น
+
+    อ่านเฉพาะ id ของทุกแถวทีละหน้าและสุ่มแบบ reservoir sampling เพื่อให้ได้ตัวอย่างจากทั้ง collection
+    (ไม่ใช่เฉพาะแถวแรก ๆ ตามลำดับการจัดเก็บ) แล้วจึงอ่าน embedding ของแถวที่ถูกเลือก
+
+    Args:
+        vector_db (VectorDatabase): ฐานข้อมูลเวกเตอร์ (ต้องเรียก create_collection แล้ว)
+        sample (int): จำนวนคำค้น
+        seed (int): seed ของการสุ่ม
+        batch_size (int): จำนวนแถวต่อหน้า
+
+    Returns:
+        tuple: (numpy.ndarray ของ id ของแต่ละคำค้น, เมทริกซ์ float32 ของคำค้น)
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = np.empty(sample, dtype=np.int64)
+    seen = 0
+
+    iterator = vector_db.collection.query_iterator(batch_size=batch_size, output_fields=["id"])
+    try:
+        while True:
+            rows = iterator.next()
+            if not rows:
+                break
+            ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+
+            # เติม reservoir ให้เต็มก่อน แล้วแทนที่แต่ละช่องด้วยความน่าจะเป็น sample / (ลำดับของแถว + 1)
+            fill = min(len(ids), max(0, sample - seen))
+            reservoir[seen:seen + fill] = ids[:fill]
+            positions = np.arange(seen + fill, seen + len(ids))
+            if len(positions):
+                slots = rng.integers(0, positions + 1)
+                for slot, row_id in zip(slots, ids[fill:]):
+                    if slot < sample:
+                        reservoir[slot] = row_id
+            seen += len(ids)
+    finally:
+        iterator.close()
+
+    if seen == 0:
+        raise ValueError("collection ไม่มีข้อมูลสำหรับใช้เป็นคำค้น")
+    query_ids = reservoir[:min(sample, seen)]
+
+    rows = vector_db.collection.query(
+        expr=f"id in {query_ids.tolist()}",
+        output_fields=["id", "embedding"]
+    )
+    embeddings = {row["id"]: row["embedding"] for row in rows}
+    query_ids = np.asarray([row_id for row_id in query_ids.tolist() if row_id in embeddings], dtype=np.int64)
+    return query_ids, np.asarray([embeddings[row_id] for row_id in query_ids.tolist()], dtype=np.float32)
+
+def exact_search(vector_db, queries, limit, query_ids=None, batch_size=10000):
+    """
+    ค้นหาแบบ exact (cosine) โดยอ่านทุก embedding ใน collection ทีละหน้าและเก็บเฉพาะ top-k
+
+    Args:
+        vector_db (VectorDatabase): ฐานข้อมูลเวกเตอร์
+        queries (numpy.ndarray): คำค้น
+        limit (int): จำนวนผลลัพธ์ต่อคำค้น
+        query_ids (numpy.ndarray): id ของแถวที่ใช้เป็นคำค้น (ไม่นับแถวนั้นเป็นผลลัพธ์ของตัวเอง, None = คำค้นจริง)
+        batch_size (int): จำนวนแถวต่อหน้า
+
+    Returns:
+        list: set ของ id ที่ถูกต้องของแต่ละคำค้น
+    """
+    queries = _normalize(np.asarray(queries, dtype=np.float32))
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.empty((len(queries), 0), dtype=np.int64)
+
+    iterator = vector_db.collection.query_iterator(batch_size=batch_size, output_fields=["id", "embedding"])
+    try:
+        while True:
+            rows = iterator.next()
+            if not rows:
+                break
+            ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+            vectors = _normalize(np.asarray([row["embedding"] for row in rows], dtype=np.float32))
+
+            page_scores = queries @ vectors.T
+            if query_ids is not None:
+                # แถวที่ใช้เป็นคำค้นพบตัวเองเสมอ จึงไม่นับเป็นผลลัพธ์
+                page_scores[np.asarray(query_ids)[:, None] == ids[None, :]] = -np.inf
+
+            # รวมคะแนนของหน้านี้กับ top-k เดิม แล้วเก็บไว้เฉพาะ top-k
+            scores = np.concatenate([best_scores, page_scores], axis=1)
+            candidates = np.concatenate([best_ids, np.broadcast_to(ids, (len(queries), len(ids)))], axis=1)
+            k = min(limit, scores.shape[1])
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_ids = np.take_along_axis(candidates, top, axis=1)
+    finally:
+        iterator.close()
+
+    return [set(ids.tolist()) for ids in best_ids]
+
+def measure(vector_db, queries, truth, profile, value, limit, query_ids=None):
+    """
+    วัด recall และเวลาตอบสนองของค่าพารามิเตอร์ค้นหาหนึ่งค่า (ค้นหาทีละคำค้นเหมือนการใช้งานจริง)
+
+    Args:
+        vector_db (VectorDatabase): ฐานข้อมูลเวกเตอร์
+        queries (numpy.ndarray): คำค้น
+        truth (list): id ที่ถูกต้องของแต่ละคำค้น
+        profile (str): ชื่อ profile ของ index
+        value (int): ค่าของพารามิเตอร์ค้นหา
+        limit (int): จำนวนผลลัพธ์ต่อคำค้น
+        query_ids (numpy.ndarray): id ของแถวที่ใช้เป็นคำค้น (None = คำค้นจริง)
+
+    Returns:
+        dict: ค่าพารามิเตอร์, recall, p50/p99 (ms) และจำนวนคำค้นต่อวินาที
+    """
+    # คำค้นที่สุ่มจาก collection ต้องค้นเพิ่มหนึ่งผลลัพธ์เพื่อตัดแถวของตัวเองออก
+    search_limit = limit + 1 if query_ids is not None else limit
+    search_params = make_search_params(profile, value, search_limit)
+    latencies = []
+    recalls = []
+    for i, (query, expected) in enumerate(zip(queries, truth)):
+        start = time.perf_counter()
+        hits = vector_db.collection.search(
+            data=[query.tolist()],
+            anns_field="embedding",
+            param=search_params,
+            limit=search_limit
+        )[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = [hit.id for hit in hits]
+        if query_ids is not None:
+            found = [hit_id for hit_id in found if hit_id != query_ids[i]]
+        found = set(found[:limit])
+        recalls.append(len(found & expected) / max(1, len(expected)))
+
+    latencies = np.asarray(latencies)
+    return {
+        "value": value,
+        "recall": float(np.mean(recalls)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "qps": float(len(latencies) / (latencies.sum() / 1000)),
+    }
+
+def tune_search_params(vector_db, queries, target_recall, limit, values=None, persist=True, query_ids=None):
+    """
+    ทดลองค่าพารามิเตอร์ค้นหาหลายค่าและเลือกค่าที่น้อยที่สุดที่ได้ recall ถึงเป้าหมาย
+
+    ค่าที่น้อยกว่าคืองานต่อคำค้นที่น้อยกว่า จึงเลือกจากค่าแทน p99 ที่วัดได้ซึ่งแกว่งตามภาระของเครื่อง
+    ถ้าไม่มีค่าใดได้ recall ถึงเป้าหมาย จะเลือกค่าที่ recall สูงที่สุด
+
+    Args:
+        vector_db (VectorDatabase): ฐานข้อมูลเวกเตอร์ (ต้องเรียก create_collection แล้ว)
+        queries (numpy.ndarray): คำค้น
+        target_recall (float): recall ขั้นต่ำที่ต้องการ
+        limit (int): จำนวนผลลัพธ์ต่อคำค้น
+        values (list): ค่าที่ต้องการทดลอง (ค่าเริ่มต้น: sweep ของ profile)
+        persist (bool): บันทึกค่าที่เลือกและใช้กับ vector_db ทันทีหรือไม่
+        query_ids (numpy.ndarray): id ของแถวที่ใช้เป็นคำค้นเมื่อสุ่มจาก collection (None = คำค้นจริง)
+
+    Returns:
+        dict: profile, ชื่อพารามิเตอร์, ค่าที่เลือก, recall เป้าหมาย และผลการวัดทุกค่า
+    """
+    profile = vector_db.index_profile
+    values = values or get_profile(profile)["sweep"]
+
+    print(f"กำลังค้นหาแบบ exact สำหรับ {len(queries)} คำค้น...")
+    start = time.perf_counter()
+    truth = exact_search(vector_db, queries, limit, query_ids=query_ids)
+    print(f"ค้นหาแบบ exact เสร็จใน {time.perf_counter() - start:.1f} วินาที")
+
+    results = []
+    for value in values:
+        result = measure(vector_db, queries, truth, profile, value, limit, query_ids=query_ids)
+        print(f"{get_profile(profile)['search_param']}={value}: recall {result['recall']:.4f}, "
+              f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+        results.append(result)
+
+    passing = [r for r in results if r["recall"] >= target_recall]
+    if passing:
+        best = min(passing, key=lambda r: r["value"])
+    else:
+        print(f"⚠️ ไม่มีค่าใดได้ recall ถึง {target_recall} เลือกค่าที่ recall สูงที่สุด")
+        best = max(results, key=lambda r: (r["recall"], -r["value"]))
+
+    report = {
+        "profile": profile,
+        "search_param": get_profile(profile)["search_param"],
+        "best": best["value"],
+        "target_recall": target_recall,
+        "limit": limit,
+        "queries": len(queries),
+        "results": results,
+    }
+    if persist:
+        save_search_params(vector_db.collection_name, profile, best["value"], report)
+        vector_db.set_search_value(best["value"])
+    return report
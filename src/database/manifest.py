@@ -0,0 +1,190 @@
+"""
+โมดูลสำหรับบันทึกรายการไฟล์ที่เพิ่มลงฐานข้อมูลแล้วไว้ในเครื่อง (SQLite)
+"""
+import os
+import time
+import sqlite3
+import threading
+from src.utils.helpers import compute_file_hash
+from src.config import MANIFEST_DIR
+
+def manifest_path(collection_name):
+    """
+    พาธของไฟล์รายการไฟล์ของ collection
+
+    Args:
+        collection_name (str): ชื่อ collection
+
+    Returns:
+        str: พาธของไฟล์ SQLite
+    """
+    return os.path.join(MANIFEST_DIR, f"{collection_name}.sqlite")
+
+class IngestionManifest:
+    """
+    คลาสสำหรับเก็บขนาด เวลาที่แก้ไข hash ของเนื้อหา และจำนวน chunks ของแต่ละไฟล์ที่เพิ่มแล้ว
+
+    ใช้ตรวจสอบว่าไฟล์เปลี่ยนแปลงหรือไม่โดยไม่ต้อง query Milvus ถ้าขนาดและเวลาที่แก้ไขตรงกัน
+    ถือว่าไม่เปลี่ยน ถ้าขนาดตรงแต่เวลาไม่ตรง (เช่น touch หรือคัดลอกไฟล์) จะเทียบ hash ของเนื้อหา
+
+    รายการผูกกับ id ของ collection ถ้า collection ถูกลบแล้วสร้างใหม่ (id เปลี่ยน) รายการเดิมจะถูกล้าง
+    """
+    # สถานะของไฟล์จาก check
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, db_path, collection_id=None):
+        """
+        สร้าง instance ของ IngestionManifest
+
+        Args:
+            db_path (str): พาธของไฟล์ SQLite
+            collection_id (str): id ของ collection ใน Milvus (None = ไม่ตรวจสอบ)
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " content_hash TEXT,"
+            " chunk_count INTEGER,"
+            " indexed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+        if collection_id is not None:
+            self._check_collection(str(collection_id))
+
+        self.stat_hits = 0
+        self.hash_checks = 0
+
+    def _check_collection(self, collection_id):
+        """
+        ล้างรายการถ้าถูกบันทึกไว้กับ collection อื่น (เช่น collection ถูกลบแล้วสร้างใหม่ด้วยชื่อเดิม)
+
+        Args:
+            collection_id (str): id ของ collection ปัจจุบัน
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE name = 'collection_id'").fetchone()
+            if row is not None and row[0] != collection_id:
+                print("⚠️ collection ถูกสร้างใหม่หลังจากบันทึกรายการไฟล์ไว้ จะล้างรายการไฟล์ในเครื่อง")
+                self.conn.execute("DELETE FROM files")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('collection_id', ?)", (collection_id,)
+            )
+            self.conn.commit()
+
+    def check(self, file_path):
+        """
+        ตรวจสอบสถานะของไฟล์เทียบกับที่บันทึกไว้
+
+        Args:
+            file_path (str): พาธของไฟล์
+
+        Returns:
+            tuple: (สถานะ, ข้อมูลไฟล์ปัจจุบัน dict ที่มี size, mtime และ content_hash ถ้าคำนวณแล้ว)
+        """
+        path = os.path.abspath(file_path)
+        stats = os.stat(path)
+        info = {"size": stats.st_size, "mtime": stats.st_mtime, "content_hash": None}
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, mtime, content_hash FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None:
+            return self.NEW, info
+
+        size, mtime, content_hash = row
+        if size == info["size"] and mtime == info["mtime"]:
+            self.stat_hits += 1
+            return self.UNCHANGED, info
+        if size != info["size"] or content_hash is None:
+            return self.CHANGED, info
+
+        # ขนาดเท่าเดิมแต่เวลาเปลี่ยน ตรวจสอบจากเนื้อหา
+        self.hash_checks += 1
+        info["content_hash"] = compute_file_hash(path)
+        if info["content_hash"] != content_hash:
+            return self.CHANGED, info
+
+        # เนื้อหาไม่เปลี่ยน บันทึกเวลาใหม่เพื่อให้ครั้งถัดไปผ่านการตรวจด้วยขนาดและเวลาได้เลย
+        with self.lock:
+            self.conn.execute("UPDATE files SET mtime = ? WHERE path = ?", (info["mtime"], path))
+            self.conn.commit()
+        return self.UNCHANGED, info
+
+    def record_many(self, records):
+        """
+        บันทึกไฟล์ที่เพิ่มลงฐานข้อมูลแล้ว (ควรเรียกหลังจาก commit ข้อมูลใน Milvus แล้ว)
+
+        Args:
+            records (list): dict ที่มี path, size, mtime, content_hash และ chunk_count
+        """
+        now = time.time()
+        rows = [
+            (os.path.abspath(r["path"]), r["size"], r["mtime"], r.get("content_hash"), r.get("chunk_count"), now)
+            for r in records
+        ]
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime, content_hash, chunk_count, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+
+    def record(self, file_path, size, mtime, content_hash=None, chunk_count=None):
+        """
+        บันทึกไฟล์หนึ่งไฟล์ที่เพิ่มลงฐานข้อมูลแล้ว
+
+        Args:
+            file_path (str): พาธของไฟล์
+            size (int): ขนาดไฟล์ (bytes)
+            mtime (float): เวลาที่แก้ไขล่าสุด
+            content_hash (str): hash ของเนื้อหาไฟล์
+            chunk_count (int): จำนวน chunks ที่เพิ่ม
+        """
+        self.record_many([{
+            "path": file_path,
+            "size": size,
+            "mtime": mtime,
+            "content_hash": content_hash,
+            "chunk_count": chunk_count,
+        }])
+
+    def remove(self, file_path):
+        """
+        ลบไฟล์ออกจากรายการ
+
+        Args:
+            file_path (str): พาธของไฟล์
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (os.path.abspath(file_path),))
+            self.conn.commit()
+
+    def stats(self):
+        """
+        สถิติของรายการไฟล์
+
+        Returns:
+            dict: จำนวนไฟล์ที่บันทึกไว้, จำนวนที่ผ่านการตรวจด้วยขนาดและเวลา และจำนวนครั้งที่ต้องเทียบ hash
+        """
+        with self.lock:
+            files = self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return {"files": files, "stat_hits": self.stat_hits, "hash_checks": self.hash_checks}
+
+    def close(self):
+        """
+        ปิดไฟล์ SQLite
+        """
+        with self.lock:
+            self.conn.close()
@@ -2,13 +2,29 @@
 โมดูลสำหรับการจัดการฐานข้อมูลเวกเตอร์
 """
 import datetime
+import hashlib
+import json
+import threading
+import time
+import numpy as np
 from pymilvus import connections, FieldSchema, CollectionSchema, DataType, Collection, utility
+from src.utils.helpers import compute_text_hash
+from src.utils.lru_cache import LRUCache
+from src.database.filters import build_filter
+from src.database.index_profiles import (build_index_params, profile_for_index_type, load_search_params,
+                                         make_search_params)
+from src.config import (INDEX_PROFILE, SEARCH_MAX_BATCH, SEARCH_CACHE_ENABLED, SEARCH_CACHE_MAX_ENTRIES,
+                        SEARCH_CACHE_MAX_BYTES, SEARCH_CACHE_TTL, WRITE_BUFFER_ENABLED,
+                        WRITE_BUFFER_MAX_ROWS, WRITE_BUFFER_MAX_BYTES, WRITE_BUFFER_MAX_SECONDS,
+                        MANIFEST_QUERY_BATCH_SIZE, SCALAR_INDEX_TYPE, PARTITION_KEY_ENABLED,
+                        PARTITION_KEY_NUM_PARTITIONS)
 
 class VectorDatabase:
     """
     คลาสสำหรับการจัดการฐานข้อมูลเวกเตอร์ (Milvus)
     """
-    def __init__(self, collection_name, dimension, host="localhost", port="19530"):
+    def __init__(self, collection_name, dimension, host="localhost", port="19530", use_result_cache=None,
+                 alias="default", buffered=None):
         """
         สร้าง instance ของ VectorDatabase
         
@@ -17,16 +33,50 @@ class VectorDatabase:
             dimension (int): ขนาดของ vector embedding
             host (str): โฮสต์ของ Milvus server
             port (str): พอร์ตของ Milvus server
+            use_result_cache (bool): แคชผลลัพธ์การค้นหาหรือไม่
+            alias (str): ชื่อการเชื่อมต่อของ pymilvus (ใช้ชื่อต่างกันเพื่อเปิดหลายการเชื่อมต่อ)
+            buffered (bool): พักข้อมูลไว้แล้ว insert เป็นชุดใหญ่และ flush ครั้งเดียวตอน commit/close
         """
         self.collection_name = collection_name
         self.dimension = dimension
         self.host = host
         self.port = port
+        self.alias = alias
         self.collection = None
+        self.supports_incremental = False
+        self.supports_metadata = False
+        self.index_profile = None
+        self.search_value = None
+        self.collection_id = None
+        
+        # ข้อมูลที่รอ insert (แยกตามคอลัมน์) และสถิติการเขียน
+        self.buffered = buffered if buffered is not None else WRITE_BUFFER_ENABLED
+        self._write_lock = threading.RLock()
+        self._pending = None
+        self._pending_rows = 0
+        self._pending_bytes = 0
+        self._pending_since = None
+        self._pending_files = set()
+        self._dirty = False
+        self.write_stats = {"inserts": 0, "rows": 0, "max_rows_per_insert": 0, "flushes": 0}
+        
+        # แคชผลลัพธ์การค้นหา ใช้ได้จนกว่า collection จะถูกแก้ไขผ่าน instance นี้ (version เพิ่มขึ้น)
+        # แคชอยู่ใน process นี้เท่านั้น การแก้ไขจาก process อื่น (เช่น batch_index.py ขณะ search_server ทำงาน)
+        # จะไม่ล้างแคช ผลลัพธ์เก่าจึงอาจถูกใช้ต่อได้นานสุด SEARCH_CACHE_TTL วินาที
+        use_result_cache = use_result_cache if use_result_cache is not None else SEARCH_CACHE_ENABLED
+        self.version = 0
+        self._search_after_write = False
+        self.result_cache = None
+        if use_result_cache:
+            self.result_cache = LRUCache(
+                max_entries=SEARCH_CACHE_MAX_ENTRIES,
+                max_bytes=SEARCH_CACHE_MAX_BYTES,
+                ttl=SEARCH_CACHE_TTL
+            )
         
         # เชื่อมต่อกับ Milvus
         print("กำลังเชื่อมต่อกับ Milvus...")
-        connections.connect("default", host=host, port=port)
+        connections.connect(alias, host=host, port=port)
         print("เชื่อมต่อกับ Milvus เรียบร้อยแล้ว")
     
     def create_collection(self):
@@ -34,45 +84,123 @@ class VectorDatabase:
         สร้าง collection ใน Milvus (ถ้ายังไม่มี)
         """
         # ตรวจสอบว่า collection มีอยู่แล้วหรือไม่
-        if utility.has_collection(self.collection_name):
+        if utility.has_collection(self.collection_name, using=self.alias):
             print(f"ใช้ collection ที่มีอยู่แล้ว: {self.collection_name}")
-            self.collection = Collection(name=self.collection_name)
+            self.collection = Collection(name=self.collection_name, using=self.alias)
         else:
             print(f"สร้าง collection ใหม่: {self.collection_name}")
             fields = [
                 FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-                FieldSchema(name="file_name", dtype=DataType.VARCHAR, max_length=256),
+                FieldSchema(name="file_name", dtype=DataType.VARCHAR, max_length=256,
+                            is_partition_key=PARTITION_KEY_ENABLED),
                 FieldSchema(name="file_mod_time", dtype=DataType.DOUBLE),  # เวลาที่แก้ไขล่าสุด
                 FieldSchema(name="text_chunk", dtype=DataType.VARCHAR, max_length=65535),
-                FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=self.dimension)
+                FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=self.dimension),
+                FieldSchema(name="chunk_hash", dtype=DataType.VARCHAR, max_length=64),  # hash ของข้อความใน chunk
+                FieldSchema(name="chunk_index", dtype=DataType.INT64),  # ลำดับของ chunk ในไฟล์
+                FieldSchema(name="page_number", dtype=DataType.INT64),  # หน้าที่ chunk เริ่มต้น (0 = ไม่ทราบ)
+                FieldSchema(name="char_start", dtype=DataType.INT64),  # ตำแหน่งตัวอักษรเริ่มต้นในไฟล์ (-1 = ไม่ทราบ)
+                FieldSchema(name="char_end", dtype=DataType.INT64),  # ตำแหน่งตัวอักษรสิ้นสุดในไฟล์ (-1 = ไม่ทราบ)
+                FieldSchema(name="extraction_method", dtype=DataType.VARCHAR, max_length=32)  # เช่น "tika" หรือ "ocr@800"
             ]
-            schema = CollectionSchema(fields=fields, description="PDF Documents with Embeddings")
-            self.collection = Collection(name=self.collection_name, schema=schema)
+            schema_options = {}
+            if PARTITION_KEY_ENABLED:
+                # กระจายไฟล์ไปยัง partition ตาม hash ของ file_name
+                schema_options["num_partitions"] = PARTITION_KEY_NUM_PARTITIONS
+            schema = CollectionSchema(fields=fields, description="PDF Documents with Embeddings", **schema_options)
+            self.collection = Collection(name=self.collection_name, schema=schema, using=self.alias)
             
-            # สร้าง index
-            print("กำลังสร้าง index...")
-            index_params = {
-                "metric_type": "COSINE",  # หรือใช้ "L2" ขึ้นอยู่กับความต้องการ
-                "index_type": "HNSW",
-                "params": {"M": 16, "efConstruction": 200}
-            }
+            # สร้าง index ตาม profile ที่ตั้งค่าไว้
+            print(f"กำลังสร้าง index (profile: {INDEX_PROFILE})...")
+            index_params = build_index_params(INDEX_PROFILE, self.dimension)
             self.collection.create_index(field_name="embedding", index_params=index_params)
         
+        # collection ที่สร้างจาก schema เดิมไม่มี chunk_hash/chunk_index จึงอัปเดตแบบรายส่วนไม่ได้
+        field_names = {field.name for field in self.collection.schema.fields}
+        self._ensure_scalar_indexes(field_names)
+        self._load_search_params()
+        partition_key = self.collection.schema.partition_key_field
+        if partition_key is not None:
+            print(f"collection นี้ใช้ {partition_key.name} เป็น partition key")
+        self.supports_incremental = {"chunk_hash", "chunk_index"} <= field_names
+        if not self.supports_incremental:
+            print("⚠️ collection นี้ไม่มีฟิลด์ chunk_hash/chunk_index จะอัปเดตไฟล์แบบลบแล้วเพิ่มใหม่ทั้งไฟล์")
+        self.supports_metadata = {"page_number", "char_start", "char_end", "extraction_method"} <= field_names
+        # id ของ collection เปลี่ยนเมื่อถูกลบแล้วสร้างใหม่ด้วยชื่อเดิม (ใช้ตรวจรายการไฟล์ในเครื่อง)
+        description = self.collection.describe()
+        self.collection_id = str(description.get("collection_id") or description.get("created_timestamp") or "") or None
+        
         # เปิดใช้งาน collection
         print("กำลังโหลด collection...")
         self.collection.load()
         
         return self.collection
     
-    def insert_data(self, chunk_to_file_map, file_mod_times, all_chunks, embeddings):
+    def _load_search_params(self):
+        """
+        เลือกพารามิเตอร์ค้นหาตามชนิดของ vector index ที่มีอยู่จริงใน collection
+        (ใช้ค่าที่ปรับจูนไว้ถ้ามี ไม่เช่นนั้นใช้ค่าเริ่มต้นของ profile)
+        """
+        index_type = None
+        for index in self.collection.indexes:
+            if index.field_name == "embedding":
+                index_type = index.params.get("index_type")
+        profile = profile_for_index_type(index_type)
+        if profile is None:
+            print(f"⚠️ ไม่รู้จัก index ชนิด {index_type} ใช้พารามิเตอร์ค้นหาของ profile {INDEX_PROFILE}")
+            profile = INDEX_PROFILE
+        self.index_profile, self.search_value = load_search_params(self.collection_name, profile)
+        print(f"vector index: {index_type} ({make_search_params(self.index_profile, self.search_value)['params']})")
+    
+    def set_search_value(self, value):
+        """
+        เปลี่ยนค่าพารามิเตอร์ค้นหา (ef, nprobe หรือ search_list ตาม profile) และล้างแคชผลลัพธ์
+        
+        Args:
+            value (int): ค่าของพารามิเตอร์ค้นหา
+        """
+        self.search_value = value
+        self._bump_version()
+    
+    def _ensure_scalar_indexes(self, field_names):
+        """
+        สร้าง index ของ scalar field ที่ใช้กรองตามไฟล์และหน้า (รวมถึง collection ที่สร้างไว้ก่อนแล้ว)
+        
+        Args:
+            field_names (set): ชื่อฟิลด์ทั้งหมดของ collection
+        """
+        wanted = {"file_name": SCALAR_INDEX_TYPE}
+        if "page_number" in field_names:
+            wanted["page_number"] = "INVERTED"
+        
+        indexed = {index.field_name for index in self.collection.indexes}
+        for field_name, index_type in wanted.items():
+            if field_name in indexed:
+                continue
+            print(f"กำลังสร้าง index {index_type} ของ {field_name}...")
+            self.collection.create_index(
+                field_name=field_name,
+                index_params={"index_type": index_type},
+                index_name=f"{field_name}_index"
+            )
+    
+    def insert_data(self, chunk_to_file_map, file_mod_times, all_chunks, embeddings,
+                    chunk_hashes=None, chunk_indices=None, chunk_metadata=None):
         """
         เพิ่มข้อมูลเข้า collection
         
+        ในโหมด buffered ข้อมูลจะถูกพักไว้จนกว่าจะถึงจำนวนแถว ขนาด หรือเวลาที่กำหนด
+        แล้วจึง insert เป็นชุดเดียว และจะ flush เมื่อเรียก commit หรือ close เท่านั้น
+        
         Args:
             chunk_to_file_map (list): ชื่อไฟล์ของแต่ละส่วน
             file_mod_times (list): เวลาที่แก้ไขของแต่ละไฟล์
             all_chunks (list): ข้อความย่อยทั้งหมด
             embeddings (list): embedding vectors
+            chunk_hashes (list): hash ของแต่ละส่วน (คำนวณให้ถ้าไม่ระบุ)
+            chunk_indices (list): ลำดับของแต่ละส่วนในไฟล์ (ใช้ 0..n-1 ถ้าไม่ระบุ)
+            chunk_metadata (list): dict ที่มี page, char_start, char_end และ method ของแต่ละส่วน
+                (None หรือรายการที่เป็น None = ไม่ทราบ)
         """
         if not self.collection:
             raise ValueError("ยังไม่ได้สร้าง collection")
@@ -84,42 +212,479 @@ class VectorDatabase:
             all_chunks,         # text_chunk
             embeddings          # embedding
         ]
+        if self.supports_incremental:
+            if chunk_hashes is None:
+                chunk_hashes = [compute_text_hash(chunk) for chunk in all_chunks]
+            if chunk_indices is None:
+                chunk_indices = list(range(len(all_chunks)))
+            entities.append(chunk_hashes)   # chunk_hash
+            entities.append(chunk_indices)  # chunk_index
+        if self.supports_metadata:
+            entities.extend(self._metadata_columns(chunk_metadata, len(all_chunks)))
+        
+        if not self.buffered:
+            # เพิ่มข้อมูล
+            with self._write_lock:
+                self._insert_entities(entities)
+                self._flush()  # ยืนยันว่าข้อมูลถูกบันทึก
+            print("เพิ่มข้อมูลเรียบร้อยแล้ว")
+            return
+        
+        with self._write_lock:
+            if self._pending is None:
+                self._pending = [[] for _ in entities]
+                self._pending_since = time.monotonic()
+            previous_rows = self._pending_rows
+            previous_bytes = self._pending_bytes
+            for column, values in zip(self._pending, entities):
+                column.extend(values)
+            self._pending_rows += len(all_chunks)
+            self._pending_bytes += self._estimate_rows_size(all_chunks, chunk_to_file_map)
+            self._pending_files.update(chunk_to_file_map)
+            
+            if (self._pending_rows >= WRITE_BUFFER_MAX_ROWS
+                    or self._pending_bytes >= WRITE_BUFFER_MAX_BYTES
+                    or time.monotonic() - self._pending_since >= WRITE_BUFFER_MAX_SECONDS):
+                try:
+                    self._insert_pending()
+                except Exception:
+                    # นำเฉพาะข้อมูลของการเรียกครั้งนี้ออก (ผู้เรียกจะถือว่าไฟล์นี้เพิ่มไม่สำเร็จ)
+                    # ข้อมูลของไฟล์อื่นที่พักไว้ก่อนหน้ายังอยู่และจะถูกส่งอีกครั้งตอน commit
+                    for column in self._pending:
+                        del column[previous_rows:]
+                    self._pending_rows = previous_rows
+                    self._pending_bytes = previous_bytes
+                    self._pending_files = set(self._pending[0])
+                    raise
+    
+    def _metadata_columns(self, chunk_metadata, count):
+        """
+        แปลงข้อมูลประกอบของแต่ละส่วนเป็นคอลัมน์ page_number, char_start, char_end และ extraction_method
+        
+        Args:
+            chunk_metadata (list): dict ของแต่ละส่วน (หรือ None)
+            count (int): จำนวนส่วน
+            
+        Returns:
+            list: ข้อมูลแยกตามคอลัมน์
+        """
+        if chunk_metadata is None:
+            chunk_metadata = [None] * count
+        columns = [[], [], [], []]
+        for meta in chunk_metadata:
+            meta = meta or {}
+            columns[0].append(meta.get("page", 0))
+            columns[1].append(meta.get("char_start", -1))
+            columns[2].append(meta.get("char_end", -1))
+            columns[3].append(meta.get("method", ""))
+        return columns
+    
+    def commit(self):
+        """
+        ส่งข้อมูลที่พักไว้ทั้งหมดและ flush หนึ่งครั้ง (ไม่ทำอะไรถ้าไม่มีการเปลี่ยนแปลง)
+        """
+        if not self.collection:
+            return
+        with self._write_lock:
+            self._insert_pending()
+            if self._dirty:
+                self._flush(force=True)
+    
+    def get_write_stats(self):
+        """
+        สถิติการเขียนข้อมูล
+        
+        Returns:
+            dict: จำนวนครั้งที่ insert, จำนวนแถว, แถวต่อการ insert, จำนวนครั้งที่ flush และแถวที่ยังรออยู่
+        """
+        with self._write_lock:
+            stats = dict(self.write_stats)
+            stats["rows_per_insert"] = (stats["rows"] / stats["inserts"]) if stats["inserts"] else 0.0
+            stats["pending_rows"] = self._pending_rows
+            return stats
+    
+    def _insert_pending(self):
+        """
+        insert ข้อมูลที่พักไว้ทั้งหมดเป็นชุดเดียว (ต้องถือ _write_lock อยู่แล้ว)
         
-        # เพิ่มข้อมูล
-        print(f"กำลังเพิ่มข้อมูล {len(all_chunks)} chunks...")
+        ข้อมูลที่พักไว้จะถูกล้างหลังจาก insert สำเร็จเท่านั้น ถ้า insert ไม่สำเร็จจะยังอยู่ให้ส่งใหม่ได้
+        """
+        if not self._pending_rows:
+            return
+        self._insert_entities(self._pending)
+        self._pending = None
+        self._pending_rows = 0
+        self._pending_bytes = 0
+        self._pending_since = None
+        self._pending_files = set()
+    
+    def _insert_entities(self, entities):
+        """
+        ส่งข้อมูลหนึ่งชุดไปยัง Milvus และบันทึกสถิติ (ต้องถือ _write_lock อยู่แล้ว)
+        
+        Args:
+            entities (list): ข้อมูลแยกตามคอลัมน์
+        """
+        rows = len(entities[0])
+        print(f"กำลังเพิ่มข้อมูล {rows} chunks...")
         self.collection.insert(entities)
-        self.collection.flush()  # ยืนยันว่าข้อมูลถูกบันทึก
-        print("เพิ่มข้อมูลเรียบร้อยแล้ว")
+        self.write_stats["inserts"] += 1
+        self.write_stats["rows"] += rows
+        self.write_stats["max_rows_per_insert"] = max(self.write_stats["max_rows_per_insert"], rows)
+        self._dirty = True
+        self._bump_version()
     
-    def search(self, query_embedding, limit=5):
+    def _flush(self, force=False):
+        """
+        flush collection ทันที ยกเว้นในโหมด buffered ซึ่งจะรอจนถึง commit
+        
+        Args:
+            force (bool): flush ทันทีแม้อยู่ในโหมด buffered
+        """
+        if self.buffered and not force:
+            self._dirty = True
+            return
+        self.collection.flush()
+        self.write_stats["flushes"] += 1
+        self._dirty = False
+    
+    def _estimate_rows_size(self, chunks, file_names):
+        """
+        ประมาณขนาดของข้อมูลที่จะ insert (bytes)
+        
+        Args:
+            chunks (list): ข้อความย่อย
+            file_names (list): ชื่อไฟล์ของแต่ละส่วน
+            
+        Returns:
+            int: ขนาดโดยประมาณ
+        """
+        # ข้อความภาษาไทยใช้ 3 bytes ต่อตัวอักษรใน UTF-8, vector ใช้ 4 bytes ต่อมิติ
+        text_bytes = sum(3 * len(chunk) for chunk in chunks) + sum(3 * len(name) for name in file_names)
+        return text_bytes + len(chunks) * (4 * self.dimension + 96)
+    
+    def update_file_chunks(self, file_name, file_mod_time, chunks, embed_fn, chunk_metadata=None):
+        """
+        อัปเดตข้อมูลของไฟล์แบบรายส่วน โดยลบและเพิ่มเฉพาะ chunk ที่เปลี่ยนแปลง
+        
+        chunk เดิมที่ข้อความ ลำดับ (chunk_index) และตำแหน่ง (หน้าและตำแหน่งตัวอักษร) ตรงกับ chunk ใหม่
+        จะถูกเก็บไว้ตามเดิม chunk ที่ข้อความเดิมแต่ย้ายตำแหน่งจะถูกเขียนใหม่ด้วย embedding เดิม
+        ส่วน chunk ที่ไม่มีในรายการใหม่จะถูกลบ
+        
+        Args:
+            file_name (str): ชื่อไฟล์
+            file_mod_time (float): เวลาที่แก้ไขล่าสุดของไฟล์
+            chunks (list): ข้อความย่อยทั้งหมดของไฟล์ (ฉบับใหม่)
+            embed_fn (callable): ฟังก์ชันรับรายการข้อความและคืนค่า embeddings
+            chunk_metadata (list): ข้อมูลประกอบของแต่ละส่วน (หน้าและตำแหน่ง)
+            
+        Returns:
+            dict: จำนวน chunk ที่เก็บไว้, ย้ายตำแหน่ง, เพิ่ม และลบ
+        """
+        if not self.collection:
+            raise ValueError("ยังไม่ได้สร้าง collection")
+        if not self.supports_incremental:
+            raise ValueError("collection นี้ไม่รองรับการอัปเดตแบบรายส่วน")
+        
+        # ข้อมูลของไฟล์นี้ที่ยังพักไว้ต้องถูกส่งก่อน จึงจะ query เห็น
+        with self._write_lock:
+            if file_name in self._pending_files:
+                self._insert_pending()
+        
+        output_fields = ["id", "chunk_hash", "chunk_index"]
+        if self.supports_metadata:
+            output_fields += ["page_number", "char_start"]
+        existing = self.collection.query(expr=build_filter(file_name), output_fields=output_fields)
+        
+        # ตำแหน่งของ chunk ใหม่ (ค่าเริ่มต้นตรงกับที่ insert_data ใช้เมื่อไม่มีข้อมูลประกอบ)
+        def location(i):
+            if not self.supports_metadata:
+                return (i,)
+            meta = chunk_metadata[i] if chunk_metadata else None
+            meta = meta or {}
+            return (i, meta.get("page", 0), meta.get("char_start", -1))
+        
+        def row_location(row):
+            if not self.supports_metadata:
+                return (row.get("chunk_index"),)
+            return (row.get("chunk_index"), row.get("page_number"), row.get("char_start"))
+        
+        # จัดกลุ่ม chunk เดิมตาม hash (ข้อความซ้ำกันได้หลาย chunk)
+        existing_by_hash = {}
+        for row in sorted(existing, key=lambda r: r.get("chunk_index", 0)):
+            existing_by_hash.setdefault(row.get("chunk_hash"), []).append(row)
+        
+        # รอบแรก: เก็บ chunk ที่ข้อความและตำแหน่งตรงกันทุกอย่าง
+        chunk_hashes = [compute_text_hash(chunk) for chunk in chunks]
+        kept_ids = []
+        unmatched = []
+        for i, chunk_hash in enumerate(chunk_hashes):
+            rows = existing_by_hash.get(chunk_hash, [])
+            match = next((row for row in rows if row_location(row) == location(i)), None)
+            if match is not None:
+                rows.remove(match)
+                kept_ids.append(match["id"])
+            else:
+                unmatched.append(i)
+        
+        # รอบสอง: ข้อความเดิมที่ย้ายตำแหน่ง (หน้า, ตำแหน่งตัวอักษร หรือลำดับเปลี่ยน) ต้องเขียนใหม่
+        # แต่ใช้ embedding เดิมจาก Milvus ได้ ส่วนข้อความที่ไม่เคยมีต้องสร้าง embedding ใหม่
+        moved = {}
+        insert_positions = []
+        for i in unmatched:
+            rows = existing_by_hash.get(chunk_hashes[i])
+            if rows:
+                moved[i] = rows.pop(0)["id"]
+            else:
+                insert_positions.append(i)
+        delete_ids = [row["id"] for rows in existing_by_hash.values() for row in rows]
+        
+        # ไม่มี chunk ไหนเปลี่ยน (เช่น touch ไฟล์) ให้เขียน chunk แรกใหม่หนึ่ง chunk
+        # เพื่อให้ file_mod_time ล่าสุดถูกบันทึก และไม่ต้องตรวจไฟล์นี้ซ้ำในครั้งถัดไป
+        if not insert_positions and not moved and kept_ids:
+            moved[0] = kept_ids.pop(0)
+        
+        print(f"อัปเดต {file_name}: เก็บไว้ {len(kept_ids)}, ย้ายตำแหน่ง {len(moved)}, "
+              f"เพิ่ม {len(insert_positions)}, ลบ {len(delete_ids)} chunks")
+        
+        # อ่าน embedding ของ chunk ที่ย้ายก่อนลบแถวเดิม
+        reused = {}
+        if moved:
+            rows = self.collection.query(expr=f"id in {list(moved.values())}", output_fields=["id", "embedding"])
+            vectors = {row["id"]: row["embedding"] for row in rows}
+            reused = {i: vectors[row_id] for i, row_id in moved.items()}
+        
+        remove_ids = delete_ids + list(moved.values())
+        if remove_ids:
+            self.collection.delete(expr=f"id in {remove_ids}")
+            self._dirty = True
+            self._bump_version()
+        
+        positions = sorted(insert_positions + list(reused))
+        if positions:
+            row_of = {i: row for row, i in enumerate(positions)}
+            embeddings = np.empty((len(positions), self.dimension), dtype=np.float32)
+            if insert_positions:
+                new_embeddings = embed_fn([chunks[i] for i in insert_positions])
+                for i, embedding in zip(insert_positions, new_embeddings):
+                    embeddings[row_of[i]] = embedding
+            for i, embedding in reused.items():
+                embeddings[row_of[i]] = embedding
+            self.insert_data(
+                [file_name] * len(positions),
+                [file_mod_time] * len(positions),
+                [chunks[i] for i in positions],
+                embeddings,
+                chunk_hashes=[chunk_hashes[i] for i in positions],
+                chunk_indices=positions,
+                chunk_metadata=[chunk_metadata[i] for i in positions] if chunk_metadata else None
+            )
+        elif remove_ids:
+            self._flush()
+        
+        return {
+            "kept": len(kept_ids),
+            "moved": len(moved),
+            "inserted": len(insert_positions),
+            "deleted": len(delete_ids)
+        }
+    
+    def get_file_mod_times(self, batch_size=None):
+        """
+        อ่านเวลาที่แก้ไขของทุกไฟล์ใน collection ด้วย query แบบแบ่งหน้าครั้งเดียว
+        
+        Args:
+            batch_size (int): จำนวนแถวต่อหน้า
+            
+        Returns:
+            dict: ชื่อไฟล์ -> เวลาที่แก้ไขล่าสุดที่บันทึกไว้
+        """
+        if not self.collection:
+            raise ValueError("ยังไม่ได้สร้าง collection")
+        
+        file_mod_times = {}
+        iterator = self.collection.query_iterator(
+            batch_size=batch_size or MANIFEST_QUERY_BATCH_SIZE,
+            output_fields=["file_name", "file_mod_time"]
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                for row in rows:
+                    # การอัปเดตแบบรายส่วนทำให้แต่ละ chunk อาจมีเวลาต่างกัน จึงใช้ค่าล่าสุด
+                    file_name = row["file_name"]
+                    mod_time = row.get("file_mod_time", 0)
+                    if mod_time > file_mod_times.get(file_name, float("-inf")):
+                        file_mod_times[file_name] = mod_time
+        finally:
+            iterator.close()
+        
+        return file_mod_times
+    
+    def delete_files(self, file_names, batch_size=1000):
+        """
+        ลบข้อมูลของหลายไฟล์ (แบ่งเป็นชุดละไม่เกิน batch_size ชื่อต่อการลบหนึ่งครั้ง)
+        
+        Args:
+            file_names (list): ชื่อไฟล์ที่ต้องการลบ
+            batch_size (int): จำนวนชื่อไฟล์ต่อการลบหนึ่งครั้ง
+        """
+        if not self.collection:
+            raise ValueError("ยังไม่ได้สร้าง collection")
+        if not file_names:
+            return
+        
+        with self._write_lock:
+            for start in range(0, len(file_names), batch_size):
+                names = file_names[start:start + batch_size]
+                self.collection.delete(expr=f"file_name in {json.dumps(names, ensure_ascii=False)}")
+            self._dirty = True
+            self._bump_version()
+            self._flush()
+    
+    def search(self, query_embedding, limit=5, file_name=None, pages=None, output_fields=None, expr=None):
         """
         ค้นหาข้อมูลที่คล้ายกับ query embedding
         
         Args:
             query_embedding: embedding vector ของคำค้น
             limit (int): จำนวนผลลัพธ์ที่ต้องการ
+            file_name (str): ค้นหาเฉพาะในไฟล์นี้
+            pages (list): ค้นหาเฉพาะหน้าเหล่านี้
+            output_fields (list): ฟิลด์ที่ต้องการในผลลัพธ์
+            expr (str): เงื่อนไขการกรองเพิ่มเติมของ Milvus เช่น 'file_mod_time > 1700000000'
             
         Returns:
             list: ผลลัพธ์การค้นหา
         """
+        return self.search_many([query_embedding], limit=limit, file_name=file_name, pages=pages,
+                                output_fields=output_fields, expr=expr)
+    
+    def search_many(self, query_embeddings, limit=5, max_batch=None, file_name=None, pages=None,
+                    output_fields=None, expr=None):
+        """
+        ค้นหาข้อมูลสำหรับหลาย query ในคำขอเดียวกัน (แบ่งเป็นชุดละไม่เกิน max_batch)
+        
+        query ที่มีผลลัพธ์อยู่ในแคชแล้วจะไม่ถูกส่งไปยัง Milvus
+        
+        Args:
+            query_embeddings: embedding vectors ของคำค้น (list หรือ numpy.ndarray 2 มิติ)
+            limit (int): จำนวนผลลัพธ์ที่ต้องการต่อ query
+            max_batch (int): จำนวน query สูงสุดต่อการเรียก Milvus หนึ่งครั้ง
+            file_name (str): ค้นหาเฉพาะในไฟล์นี้
+            pages (list): ค้นหาเฉพาะหน้าเหล่านี้
+            output_fields (list): ฟิลด์ที่ต้องการในผลลัพธ์ (ค่าเริ่มต้น: ชื่อไฟล์ ข้อความ เวลาที่แก้ไข และหน้า)
+            expr (str): เงื่อนไขการกรองเพิ่มเติมของ Milvus (รวมกับ file_name และ pages ด้วย and)
+            
+        Returns:
+            list: ผลลัพธ์ของแต่ละ query เรียงตามลำดับของ query_embeddings
+        """
         if not self.collection:
             raise ValueError("ยังไม่ได้สร้าง collection")
+        if max_batch is None:
+            max_batch = SEARCH_MAX_BATCH
+        expr = build_filter(file_name, pages, expr, supports_metadata=self.supports_metadata)
+        if output_fields is None:
+            output_fields = ["file_name", "text_chunk", "file_mod_time"]
+            if self.supports_metadata:
+                output_fields.append("page_number")
         
-        search_params = {
-            "metric_type": "COSINE",
-            "params": {"ef": 100}
-        }
+        results = [None] * len(query_embeddings)
+        keys = [None] * len(query_embeddings)
+        pending = []
+        for i, query_embedding in enumerate(query_embeddings):
+            if self.result_cache is not None:
+                keys[i] = self._result_cache_key(query_embedding, limit, expr, output_fields)
+                results[i] = self.result_cache.get(keys[i])
+            if results[i] is None:
+                pending.append(i)
         
-        results = self.collection.search(
-            data=[query_embedding],
-            anns_field="embedding",
-            param=search_params,
-            limit=limit,
-            output_fields=["file_name", "text_chunk", "file_mod_time"]
-        )
+        # การค้นหาครั้งแรกหลังการเขียนใช้ Strong consistency เพื่อให้เห็นข้อมูลที่เพิ่งเขียนแน่นอน
+        # (ค่าเริ่มต้น Bounded อาจยังไม่เห็น และผลลัพธ์นั้นจะค้างอยู่ในแคชภายใต้ version ใหม่)
+        version = self.version
+        strong = self._search_after_write
+        search_kwargs = {"consistency_level": "Strong"} if strong else {}
+        search_params = self._search_params(limit)
+        for start in range(0, len(pending), max_batch):
+            batch = pending[start:start + max_batch]
+            batch_results = self.collection.search(
+                data=[query_embeddings[i] for i in batch],
+                anns_field="embedding",
+                param=search_params,
+                limit=limit,
+                expr=expr,
+                output_fields=output_fields,
+                **search_kwargs
+            )
+            for i, hits in zip(batch, batch_results):
+                results[i] = hits
+                if self.result_cache is not None:
+                    self.result_cache.put(keys[i], hits, self._estimate_hits_size(hits))
+        if pending and strong and self.version == version:
+            self._search_after_write = False
         
         return results
     
+    def _bump_version(self):
+        """
+        เพิ่ม version ของ collection หลังมีการแก้ไข และล้างแคชผลลัพธ์การค้นหา
+        """
+        self.version += 1
+        self._search_after_write = True
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def _result_cache_key(self, query_embedding, limit, expr=None, output_fields=None):
+        """
+        สร้าง key ของแคชผลลัพธ์จาก fingerprint ของ query embedding, limit, เงื่อนไขการกรอง และ version
+        
+        embedding ถูก quantize เป็น int16 (ละเอียด 1/4096) ก่อนคำนวณ hash
+        เพื่อให้ embedding ที่ต่างกันเพียงเล็กน้อยจากการคำนวณทศนิยมได้ key เดียวกัน
+        
+        Args:
+            query_embedding: embedding vector ของคำค้น
+            limit (int): จำนวนผลลัพธ์ที่ต้องการ
+            expr (str): เงื่อนไขการกรอง
+            output_fields (list): ฟิลด์ที่ต้องการในผลลัพธ์
+            
+        Returns:
+            tuple: key ของแคช
+        """
+        scaled = np.rint(np.asarray(query_embedding, dtype=np.float32) * 4096)
+        quantized = np.clip(scaled, -32768, 32767).astype(np.int16)
+        fingerprint = hashlib.blake2b(quantized.tobytes(), digest_size=16).hexdigest()
+        return (fingerprint, limit, expr, tuple(output_fields or ()), self.version)
+    
+    def _estimate_hits_size(self, hits):
+        """
+        ประมาณขนาดของผลลัพธ์การค้นหาหนึ่ง query (bytes)
+        
+        Args:
+            hits: ผลลัพธ์การค้นหาของ query เดียว
+            
+        Returns:
+            int: ขนาดโดยประมาณ
+        """
+        size = 0
+        for hit in hits:
+            # ข้อความภาษาไทยใช้ 3 bytes ต่อตัวอักษรใน UTF-8
+            size += 3 * len(hit.entity.get('text_chunk') or "") + 3 * len(hit.entity.get('file_name') or "") + 64
+        return size
+    
+    def _search_params(self, limit=None):
+        """
+        พารามิเตอร์สำหรับการค้นหา (ตาม profile ของ index และค่าที่ปรับจูนไว้)
+        
+        Args:
+            limit (int): จำนวนผลลัพธ์ที่ต้องการ
+            
+        Returns:
+            dict: search params ของ Milvus
+        """
+        return make_search_params(self.index_profile or INDEX_PROFILE, self.search_value, limit)
+    
     def display_results(self, results):
         """
         แสดงผลลัพธ์การค้นหา
@@ -133,6 +698,8 @@ class VectorDatabase:
                 mod_time_str = datetime.datetime.fromtimestamp(hit.entity.get('file_mod_time')).strftime('%Y-%m-%d %H:%M:%S')
                 print(f"Score: {hit.score}")
                 print(f"File: {hit.entity.get('file_name')}")
+                if hit.entity.get('page_number'):
+                    print(f"Page: {hit.entity.get('page_number')}")
                 print(f"Modified: {mod_time_str}")
                 print(f"Text Chunk: {hit.entity.get('text_chunk')}")
                 print("----------------------------")
@@ -142,5 +709,10 @@ class VectorDatabase:
         ปิดการเชื่อมต่อกับ Milvus
         """
         print("กำลังปิดการเชื่อมต่อ...")
-        connections.disconnect("default")
+        self.commit()
+        if self.write_stats["inserts"]:
+            stats = self.get_write_stats()
+            print(f"สถิติการเขียน: insert {stats['inserts']} ครั้ง, {stats['rows']} แถว "
+                  f"(เฉลี่ย {stats['rows_per_insert']:.1f} แถว/ครั้ง), flush {stats['flushes']} ครั้ง")
+        connections.disconnect(self.alias)
         print("เสร็จสิ้น!")
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+โมดูลสำหรับแยกข้อความจากไฟล์ PDF (เลือก backend ได้จากการตั้งค่า)
+"""
+import re
+import html
+
+# แบ่งผลลัพธ์ XHTML ของ Tika เป็นหน้า และลบ tag ออก
+# (แบ่งที่จุดเริ่มของแต่ละหน้า เพราะในหน้าอาจมี <div> ซ้อนอยู่ เช่น <div class="annotation">)
+_TIKA_PAGE_START_RE = re.compile(r'<div class="page">')
+_TIKA_BLOCK_END_RE = re.compile(r'</p>|<br\s*/?>', re.I)
+_TIKA_TAG_RE = re.compile(r'<[^>]+>')
+
+class TextExtractor:
+    """
+    คลาสพื้นฐานของตัวแยกข้อความจาก PDF
+
+    backend ใหม่ต้อง implement extract_pages ส่วน extract จะรวมข้อความทุกหน้าให้
+    """
+    name = "base"
+
+    def extract_pages(self, file_path):
+        """
+        แยกข้อความจาก PDF ทีละหน้า
+
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+
+        Returns:
+            iterator: ข้อความของแต่ละหน้า
+        """
+        raise NotImplementedError
+
+    def extract(self, file_path):
+        """
+        แยกข้อความทั้งหมดจาก PDF
+
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+
+        Returns:
+            str: ข้อความทั้งหมดในไฟล์
+        """
+        return "\n\n".join(self.extract_pages(file_path))
+
+class TikaExtractor(TextExtractor):
+    """
+    ตัวแยกข้อความด้วย Apache Tika (ส่งไฟล์ไปยัง Tika server ผ่าน HTTP)
+    """
+    name = "tika"
+
+    def __init__(self):
+        """
+        สร้าง instance ของ TikaExtractor
+        """
+        from tika import parser as tika_parser
+        self.parser = tika_parser
+
+    def extract_pages(self, file_path):
+        """
+        แยกข้อความจาก PDF ทีละหน้า (จากผลลัพธ์ XHTML ของ Tika ที่แบ่งหน้าด้วย <div class="page">)
+
+        Tika ส่งผลลัพธ์ทั้งไฟล์กลับมาในครั้งเดียว จึงไม่ลดหน่วยความจำ แต่ทำให้รู้หมายเลขหน้าของข้อความ
+
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+
+        Returns:
+            iterator: ข้อความของแต่ละหน้า
+        """
+        parsed_pdf = self.parser.from_file(file_path, xmlContent=True)
+        content = parsed_pdf['content'] or ""
+        # ส่วนก่อนหน้าแรกเป็น <head> และ metadata ส่วน tag ปิดที่ติดมากับแต่ละหน้าจะถูกลบพร้อม tag อื่น
+        pages = _TIKA_PAGE_START_RE.split(content)[1:]
+        if not pages:
+            # ไม่มีข้อมูลการแบ่งหน้า ใช้ข้อความทั้งไฟล์เป็นหน้าเดียว
+            pages = [content]
+        for page in pages:
+            text = _TIKA_BLOCK_END_RE.sub("\n", page)
+            yield html.unescape(_TIKA_TAG_RE.sub("", text)).strip()
+
+    def extract(self, file_path):
+        """
+        แยกข้อความทั้งหมดจาก PDF
+
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+
+        Returns:
+            str: ข้อความทั้งหมดในไฟล์
+        """
+        parsed_pdf = self.parser.from_file(file_path)
+        return parsed_pdf['content'] or ""
+
+class PyPDFExtractor(TextExtractor):
+    """
+    ตัวแยกข้อความด้วย pypdf ทำงานใน process เดียวกันโดยไม่ต้องใช้ Java
+
+    เหมาะกับ PDF ที่มีชั้นข้อความอยู่แล้ว (ไม่ใช่ภาพสแกน)
+    """
+    name = "pypdf"
+
+    def __init__(self):
+        """
+        สร้าง instance ของ PyPDFExtractor
+        """
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise ImportError("ต้องติดตั้ง pypdf ก่อนใช้ PDF_EXTRACTOR = \"pypdf\": pip install pypdf")
+        self.reader_class = PdfReader
+
+    def extract_pages(self, file_path):
+        """
+        แยกข้อความจาก PDF ทีละหน้า
+
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+
+        Returns:
+            iterator: ข้อความของแต่ละหน้า
+        """
+        reader = self.reader_class(file_path)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+# ชื่อ backend -> คลาส
+EXTRACTORS = {
+    TikaExtractor.name: TikaExtractor,
+    PyPDFExtractor.name: PyPDFExtractor,
+}
+
+def get_extractor(name):
+    """
+    สร้างตัวแยกข้อความตามชื่อ backend
+
+    Args:
+        name (str): ชื่อ backend ("tika" หรือ "pypdf")
+
+    Returns:
+        TextExtractor: ตัวแยกข้อความ
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"ไม่รู้จักตัวแยกข้อความ: {name} (เลือกได้: {', '.join(EXTRACTORS)})")
+    return EXTRACTORS[name]()
@@ -0,0 +1,201 @@
+"""
+โมดูลสำหรับปรับปรุงคุณภาพรูปภาพก่อนทำ OCR ด้วย NumPy
+
+ทุกฟังก์ชันทำงานบน buffer ขาวดำชนิด uint8 (2 มิติ) และเขียนผลลัพธ์ทับ buffer เดิม
+ฟิลเตอร์ 3x3 ประมวลผลทีละช่วงแถว (strip) เพื่อให้หน่วยความจำชั่วคราวไม่ขึ้นกับขนาดหน้า
+"""
+import numpy as np
+
+# จำนวนแถวต่อหนึ่ง strip ของฟิลเตอร์ 3x3
+STRIP_ROWS = 256
+
+def to_gray_buffer(image):
+    """
+    แปลงรูปภาพ PIL เป็น buffer ขาวดำชนิด uint8 ที่แก้ไขได้
+
+    Args:
+        image (PIL.Image): รูปภาพต้นฉบับ
+
+    Returns:
+        numpy.ndarray: buffer ขนาด (สูง, กว้าง)
+    """
+    gray = image if image.mode == 'L' else image.convert('L')
+    buf = np.array(gray, dtype=np.uint8)
+    if gray is not image:
+        gray.close()
+    return buf
+
+def contrast_lut(buf, factor):
+    """
+    สร้างตาราง lookup สำหรับปรับ contrast แบบเดียวกับ PIL.ImageEnhance.Contrast
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ (ใช้คำนวณค่าเฉลี่ยความสว่าง)
+        factor (float): ระดับ contrast
+
+    Returns:
+        numpy.ndarray: ตาราง lookup ขนาด 256 ชนิด float64
+    """
+    hist = np.bincount(buf.ravel(), minlength=256)
+    mean = int((hist * np.arange(256)).sum() / max(hist.sum(), 1) + 0.5)
+    levels = np.arange(256, dtype=np.float64)
+    return mean + factor * (levels - mean)
+
+def brightness_lut(factor, lut=None):
+    """
+    สร้าง (หรือต่อท้าย) ตาราง lookup สำหรับปรับความสว่างแบบ PIL.ImageEnhance.Brightness
+
+    Args:
+        factor (float): ระดับความสว่าง
+        lut (numpy.ndarray): ตาราง lookup เดิมที่ต้องการรวมเข้าด้วยกัน (None = เริ่มใหม่)
+
+    Returns:
+        numpy.ndarray: ตาราง lookup ขนาด 256 ชนิด float64
+    """
+    if lut is None:
+        lut = np.arange(256, dtype=np.float64)
+    return lut * factor
+
+def apply_lut(buf, lut):
+    """
+    แปลงค่าทุกพิกเซลด้วยตาราง lookup (เขียนทับ buffer เดิม)
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ
+        lut (numpy.ndarray): ตาราง lookup ขนาด 256
+    """
+    # PIL ตัดเศษทศนิยมทิ้ง (ไม่ปัดเศษ) จึงใช้ floor เพื่อให้ได้ผลเหมือนกัน
+    table = np.clip(np.floor(lut), 0, 255).astype(np.uint8)
+    # mode='clip' ทำให้ np.take เขียนลง out โดยตรงโดยไม่สร้าง buffer ชั่วคราว
+    np.take(table, buf, out=buf, mode='clip')
+
+def _apply_3x3(buf, strip_fn, strip_rows=STRIP_ROWS, copy_border=False):
+    """
+    ใช้ฟิลเตอร์ 3x3 ทีละ strip โดยขอบภาพใช้ค่าพิกเซลที่ขอบซ้ำ
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ (ถูกเขียนทับ)
+        strip_fn (callable): ฟังก์ชันรับ strip ที่เติมขอบแล้ว (สูง+2, กว้าง+2) คืนผลลัพธ์ (สูง, กว้าง)
+        strip_rows (int): จำนวนแถวต่อ strip
+        copy_border (bool): คงค่าเดิมของแถวและคอลัมน์ที่ขอบภาพไว้โดยไม่กรอง (แบบ kernel filter ของ PIL)
+    """
+    height, width = buf.shape
+    if height == 0 or width == 0:
+        return
+
+    if copy_border:
+        border = (buf[0].copy(), buf[-1].copy(), buf[:, 0].copy(), buf[:, -1].copy())
+
+    padded = np.empty((min(strip_rows, height) + 2, width + 2), dtype=np.uint8)
+    # แถวต้นฉบับที่อยู่เหนือ strip ปัจจุบัน (strip ก่อนหน้าเขียนทับไปแล้ว จึงต้องเก็บสำเนาไว้)
+    prev_row = buf[0].copy()
+    for r0 in range(0, height, strip_rows):
+        r1 = min(r0 + strip_rows, height)
+        rows = r1 - r0
+        strip = padded[:rows + 2]
+
+        strip[0, 1:-1] = prev_row
+        strip[1:-1, 1:-1] = buf[r0:r1]
+        strip[-1, 1:-1] = buf[r1] if r1 < height else buf[r1 - 1]
+        strip[:, 0] = strip[:, 1]
+        strip[:, -1] = strip[:, -2]
+
+        prev_row = buf[r1 - 1].copy()
+        buf[r0:r1] = strip_fn(strip)
+
+    if copy_border:
+        buf[0], buf[-1], buf[:, 0], buf[:, -1] = border
+
+def _neighborhood_sum(strip):
+    """
+    ผลรวมของพิกเซลในหน้าต่าง 3x3 ของแต่ละตำแหน่ง
+
+    Args:
+        strip (numpy.ndarray): strip ที่เติมขอบแล้ว
+
+    Returns:
+        numpy.ndarray: ผลรวมชนิด int16 ขนาด (สูง-2, กว้าง-2)
+    """
+    h, w = strip.shape[0] - 2, strip.shape[1] - 2
+    total = np.zeros((h, w), dtype=np.int16)
+    for dy in range(3):
+        for dx in range(3):
+            total += strip[dy:dy + h, dx:dx + w]
+    return total
+
+def _center_weighted(center_weight, divisor):
+    """
+    สร้างฟังก์ชันฟิลเตอร์ที่มีรูปแบบ (center_weight * กลาง - ผลรวม 3x3) / divisor
+
+    Args:
+        center_weight (int): น้ำหนักของพิกเซลกลาง
+        divisor (int): ตัวหาร
+
+    Returns:
+        callable: ฟังก์ชันสำหรับ _apply_3x3
+    """
+    def strip_fn(strip):
+        center = strip[1:-1, 1:-1].astype(np.int16)
+        center *= center_weight
+        center -= _neighborhood_sum(strip)
+        center += divisor // 2
+        center //= divisor
+        np.clip(center, 0, 255, out=center)
+        return center
+    return strip_fn
+
+def edge_enhance(buf):
+    """
+    เน้นขอบตัวอักษร (เทียบเท่า PIL ImageFilter.EDGE_ENHANCE) เขียนทับ buffer เดิม
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ
+    """
+    # kernel [-1 x8, 10 ตรงกลาง] / 2 = (11 * กลาง - ผลรวม 3x3) / 2
+    # PIL คัดลอกพิกเซลที่ขอบภาพโดยไม่กรอง
+    _apply_3x3(buf, _center_weighted(11, 2), copy_border=True)
+
+def sharpen(buf):
+    """
+    เพิ่มความคมชัดของขอบ (เทียบเท่า PIL ImageFilter.SHARPEN) เขียนทับ buffer เดิม
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ
+    """
+    # kernel [-2 x8, 32 ตรงกลาง] / 16 = (17 * กลาง - ผลรวม 3x3) / 8
+    # PIL คัดลอกพิกเซลที่ขอบภาพโดยไม่กรอง
+    _apply_3x3(buf, _center_weighted(17, 8), copy_border=True)
+
+# ลำดับการเปรียบเทียบ-สลับ (sorting network) สำหรับหาค่ามัธยฐานของ 9 ค่า
+_MEDIAN9_NETWORK = [
+    (1, 2), (4, 5), (7, 8), (0, 1), (3, 4), (6, 7), (1, 2), (4, 5), (7, 8),
+    (0, 3), (5, 8), (4, 7), (3, 6), (1, 4), (2, 5), (4, 7), (4, 2), (6, 4), (4, 2),
+]
+
+def _median_strip(strip):
+    """
+    ค่ามัธยฐานของหน้าต่าง 3x3 ของแต่ละตำแหน่งใน strip
+
+    Args:
+        strip (numpy.ndarray): strip ที่เติมขอบแล้ว
+
+    Returns:
+        numpy.ndarray: ค่ามัธยฐานชนิด uint8 ขนาด (สูง-2, กว้าง-2)
+    """
+    h, w = strip.shape[0] - 2, strip.shape[1] - 2
+    values = [strip[dy:dy + h, dx:dx + w].copy() for dy in range(3) for dx in range(3)]
+    low = np.empty((h, w), dtype=np.uint8)
+    for a, b in _MEDIAN9_NETWORK:
+        np.minimum(values[a], values[b], out=low)
+        np.maximum(values[a], values[b], out=values[b])
+        values[a], low = low, values[a]
+    return values[4]
+
+def median3(buf):
+    """
+    ลบ noise ด้วย median filter ขนาด 3x3 (เทียบเท่า PIL ImageFilter.MedianFilter(3)) เขียนทับ buffer เดิม
+
+    Args:
+        buf (numpy.ndarray): buffer ขาวดำ
+    """
+    _apply_3x3(buf, _median_strip)
@@ -4,11 +4,55 @@ OCR Processor Module using EasyOCR for handling PDF documents
 import os
 import re
 import time
-import numpy as np
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import easyocr
-from pdf2image import convert_from_path
-from PIL import Image, ImageEnhance, ImageFilter
-from src.config import OCR_DPI, OCR_LANG
+from pdf2image import convert_from_path, pdfinfo_from_path
+from src.document import image_filters
+from src.config import (OCR_DPI, OCR_LANG, OCR_WORKERS, OCR_RENDER_WINDOW, OCR_ADAPTIVE,
+                        OCR_LOW_DPI, OCR_MIN_CONFIDENCE, OCR_MIN_THAI_RATIO)
+from src.utils.helpers import format_size, get_peak_memory
+
+# OCRProcessor ของแต่ละ worker process (โหลด EasyOCR Reader ครั้งเดียวต่อ process)
+_worker_processor = None
+
+def _init_ocr_worker(langs, gpu, num_threads):
+    """
+    เตรียม worker process สำหรับ OCR แบบขนาน
+    
+    Args:
+        langs (list): ภาษาที่ใช้ใน OCR
+        gpu (bool): ใช้ GPU หรือไม่
+        num_threads (int): จำนวน thread ของ torch ต่อ process
+    """
+    global _worker_processor
+    import torch
+    # จำกัด thread ของ torch เพื่อไม่ให้แต่ละ process แย่ง CPU กัน
+    torch.set_num_threads(num_threads)
+    _worker_processor = OCRProcessor(lang=langs, gpu=gpu)
+    _worker_processor.reader
+
+def _ocr_page_worker(args):
+    """
+    แปลงหน้าเดียวของ PDF เป็นรูปภาพและทำ OCR (ทำงานใน worker process)
+    
+    Args:
+        args (tuple): (พาธไฟล์ PDF, หมายเลขหน้า, จำนวนหน้าทั้งหมด, DPI, DPI สำหรับทำซ้ำหรือ None)
+        
+    Returns:
+        dict: ผลลัพธ์ OCR ของหน้านั้น
+    """
+    pdf_path, page_number, total_pages, dpi, retry_dpi = args
+    try:
+        image = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)[0]
+    except Exception as e:
+        print(f"เกิดข้อผิดพลาดในการแปลงหน้า {page_number} เป็นรูปภาพ: {e}")
+        return {"page": page_number, "text": "", "seconds": 0.0, "dpi": dpi,
+                "confidence": 0.0, "thai_ratio": 0.0}
+    result = _worker_processor._ocr_page(image, page_number, total_pages, dpi)
+    image.close()
+    return _worker_processor._retry_if_needed(result, pdf_path, total_pages, retry_dpi)
 
 class OCRProcessor:
     """
@@ -21,7 +65,16 @@ class OCRProcessor:
         Args:
             lang (str): ภาษาที่ใช้ในการ OCR (th สำหรับภาษาไทย, en สำหรับภาษาอังกฤษ, หรือ ["th", "en"] สำหรับทั้งสองภาษา)
             config (str): ไม่ใช้ใน EasyOCR (มีไว้เพื่อความเข้ากันได้กับโค้ดเดิม)
+            gpu (bool): ใช้ GPU หรือไม่
         """
+        self.gpu = gpu
+        self._pool = None
+        self._pool_workers = 0
+        # ใช้ร่วมกันได้จากหลาย thread (เช่น extract workers ของ pipeline)
+        self._pool_lock = threading.Lock()
+        self._reader = None
+        self._reader_lock = threading.Lock()
+        
         # แปลงภาษาจากรูปแบบ Tesseract เป็น EasyOCR
         self.langs = []
         if lang is None:
@@ -41,89 +94,51 @@ class OCRProcessor:
                     self.langs.append("th")
                 elif lang == "eng":
                     self.langs.append("en")
+        elif isinstance(lang, (list, tuple)):  # เช่น ["th", "en"]
+            self.langs = list(lang)
         
         # ถ้าไม่มีภาษาที่กำหนด ใช้ภาษาไทยและอังกฤษเป็นค่าเริ่มต้น
         if not self.langs:
             self.langs = ["th", "en"]
-            
-        # สร้าง EasyOCR Reader
-        try:
-            print(f"กำลังโหลด EasyOCR สำหรับภาษา: {', '.join(self.langs)}")
-            self.reader = easyocr.Reader(self.langs, gpu=gpu)
-            print(f"โหลด EasyOCR เรียบร้อยแล้ว")
-        except Exception as e:
-            print(f"เกิดข้อผิดพลาดในการโหลด EasyOCR: {e}")
-            print("โปรดติดตั้ง EasyOCR: pip install easyocr")
-            raise
     
-    def process_pdf(self, pdf_path, dpi=None):
+    @property
+    def reader(self):
+        """
+        EasyOCR Reader (โหลดเมื่อทำ OCR ใน process นี้ครั้งแรก)
+        
+        เมื่อทำ OCR แบบขนาน Reader ถูกโหลดใน worker processes เท่านั้น process หลักจึงไม่ต้องโหลดโมเดล
+        
+        Returns:
+            easyocr.Reader: Reader
+        """
+        with self._reader_lock:
+            if self._reader is None:
+                try:
+                    print(f"กำลังโหลด EasyOCR สำหรับภาษา: {', '.join(self.langs)}")
+                    self._reader = easyocr.Reader(self.langs, gpu=self.gpu)
+                    print(f"โหลด EasyOCR เรียบร้อยแล้ว")
+                except Exception as e:
+                    print(f"เกิดข้อผิดพลาดในการโหลด EasyOCR: {e}")
+                    print("โปรดติดตั้ง EasyOCR: pip install easyocr")
+                    raise
+            return self._reader
+    
+    def process_pdf(self, pdf_path, dpi=None, workers=None, adaptive=None):
         """
         แปลงไฟล์ PDF เป็นข้อความด้วย EasyOCR
         
         Args:
             pdf_path (str): พาธของไฟล์ PDF
             dpi (int): ความละเอียดของรูปภาพที่แปลงจาก PDF
+            workers (int): จำนวน process สำหรับ OCR แบบขนาน (1 = ทำทีละหน้าใน process นี้)
+            adaptive (bool): ทำ OCR ที่ OCR_LOW_DPI ก่อน แล้วทำซ้ำที่ dpi เฉพาะหน้าที่ผลลัพธ์ไม่ดี
             
         Returns:
             str: ข้อความที่ได้จากการ OCR
         """
-        if dpi is None:
-            dpi = OCR_DPI  # ใช้ค่าที่กำหนดในไฟล์ config
-            
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"ไม่พบไฟล์: {pdf_path}")
-        
-        print(f"กำลังแปลง PDF เป็นรูปภาพ (DPI={dpi}): {pdf_path}")
-        try:
-            # แปลง PDF เป็นรูปภาพด้วยความละเอียดสูง
-            images = convert_from_path(pdf_path, dpi=dpi)
-            print(f"แปลง PDF เป็นรูปภาพสำเร็จ: ได้ {len(images)} หน้า")
-        except Exception as e:
-            print(f"เกิดข้อผิดพลาดในการแปลง PDF เป็นรูปภาพ: {e}")
-            print("อาจต้องติดตั้ง poppler สำหรับ pdf2image: brew install poppler")
-            raise
-        
-        text_content = []
-        has_thai_characters = False
-        
-        print(f"กำลังประมวลผล OCR {len(images)} หน้า...")
-        for i, image in enumerate(images):
-            print(f"กำลังประมวลผล OCR หน้า {i+1}/{len(images)}")
-            try:
-                start_time = time.time()  # เริ่มจับเวลา
-                
-                # ปรับปรุงคุณภาพรูปภาพ
-                img = self._preprocess_image(image)
-                
-                print(f"  กำลังทำ OCR: หน้า {i+1} (ภาษา={', '.join(self.langs)})")
-                
-                # ทำ OCR ด้วย EasyOCR
-                results = self.reader.readtext(np.array(img))
-                
-                # รวมผลลัพธ์จาก EasyOCR
-                page_text = ""
-                for bbox, text, prob in results:
-                    page_text += text + " "
-                
-                # ตรวจสอบว่ามีตัวอักษรภาษาไทยหรือไม่
-                if re.search(r'[\u0E00-\u0E7F]', page_text):
-                    has_thai_characters = True
-                    print("  ✅ พบตัวอักษรภาษาไทยในผลลัพธ์ OCR")
-                elif 'th' in self.langs:
-                    print("  ⚠️ ไม่พบตัวอักษรภาษาไทยในผลลัพธ์ OCR แม้จะระบุภาษาไทย")
-                
-                # วัดเวลาที่ใช้
-                process_time = time.time() - start_time
-                print(f"  ใช้เวลา OCR: {process_time:.2f} วินาที")
-                
-                # ตรวจสอบผลลัพธ์เบื้องต้น
-                if len(page_text.strip()) < 10:
-                    print("  ⚠️ ผลลัพธ์ OCR มีข้อความน้อยเกินไป อาจเกิดปัญหา")
-                    
-                text_content.append(page_text)
-            except Exception as e:
-                print(f"เกิดข้อผิดพลาดในการ OCR หน้า {i+1}: {e}")
-                text_content.append("")  # เพิ่มข้อความว่างถ้าเกิดข้อผิดพลาด
+        page_results = self._ocr_pages(pdf_path, dpi, workers, adaptive)
+        text_content = [result["text"] for result in page_results]
+        has_thai_characters = any(re.search(r'[\u0E00-\u0E7F]', text) for text in text_content)
         
         # รวมข้อความจากทุกหน้า
         full_text = "\n\n".join(text_content)
@@ -155,44 +170,354 @@ class OCRProcessor:
         
         return clean_text
     
+    def process_pdf_pages(self, pdf_path, dpi=None, workers=None, adaptive=None):
+        """
+        แปลงไฟล์ PDF เป็นข้อความที่ทำความสะอาดแล้วแยกตามหน้า
+        
+        ผลลัพธ์คืนจากเมธอดโดยตรง (ไม่เก็บไว้ใน instance) จึงเรียกพร้อมกันจากหลาย thread ได้
+        
+        Args:
+            pdf_path (str): พาธของไฟล์ PDF
+            dpi (int): ความละเอียดของรูปภาพที่แปลงจาก PDF
+            workers (int): จำนวน process สำหรับ OCR แบบขนาน (1 = ทำทีละหน้าใน process นี้)
+            adaptive (bool): ทำ OCR ที่ OCR_LOW_DPI ก่อน แล้วทำซ้ำที่ dpi เฉพาะหน้าที่ผลลัพธ์ไม่ดี
+            
+        Returns:
+            list: (หมายเลขหน้า, ข้อความ, DPI ที่ใช้) ตามลำดับหน้า
+        """
+        return [
+            (result["page"], self._clean_text(result["text"]).strip(), result["dpi"])
+            for result in self._ocr_pages(pdf_path, dpi, workers, adaptive)
+        ]
+    
+    def _ocr_pages(self, pdf_path, dpi=None, workers=None, adaptive=None):
+        """
+        ทำ OCR ทุกหน้าของไฟล์ PDF และแสดงสรุปเวลาที่ใช้
+        
+        Args:
+            pdf_path (str): พาธของไฟล์ PDF
+            dpi (int): ความละเอียดของรูปภาพที่แปลงจาก PDF
+            workers (int): จำนวน process สำหรับ OCR แบบขนาน
+            adaptive (bool): ทำ OCR ที่ OCR_LOW_DPI ก่อน แล้วทำซ้ำที่ dpi เฉพาะหน้าที่ผลลัพธ์ไม่ดี
+            
+        Returns:
+            list: ผลลัพธ์ของแต่ละหน้า (dict ที่มี page, text, seconds และ dpi)
+        """
+        if dpi is None:
+            dpi = OCR_DPI  # ใช้ค่าที่กำหนดในไฟล์ config
+        if workers is None:
+            workers = OCR_WORKERS
+        if adaptive is None:
+            adaptive = OCR_ADAPTIVE
+        
+        # โหมด adaptive: รอบแรกใช้ความละเอียดต่ำ แล้วค่อยใช้ dpi เต็มกับหน้าที่จำเป็น
+        if adaptive and OCR_LOW_DPI < dpi:
+            first_dpi, retry_dpi = OCR_LOW_DPI, dpi
+        else:
+            first_dpi, retry_dpi = dpi, None
+            
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"ไม่พบไฟล์: {pdf_path}")
+        
+        if workers > 1:
+            page_results = self._process_pages_parallel(pdf_path, first_dpi, workers, retry_dpi)
+        else:
+            page_results = self._process_pages(pdf_path, first_dpi, retry_dpi)
+        
+        # สรุปเวลาที่ใช้ของแต่ละหน้า
+        if page_results:
+            total_time = sum(result["seconds"] for result in page_results)
+            slowest = max(page_results, key=lambda result: result["seconds"])
+            print(f"เวลา OCR รวมทุกหน้า: {total_time:.2f} วินาที "
+                  f"(เฉลี่ย {total_time / len(page_results):.2f} วินาที/หน้า, "
+                  f"ช้าสุดหน้า {slowest['page']}: {slowest['seconds']:.2f} วินาที)")
+            
+            # จำนวนหน้าที่ใช้แต่ละ DPI
+            dpi_counts = {}
+            for result in page_results:
+                dpi_counts[result["dpi"]] = dpi_counts.get(result["dpi"], 0) + 1
+            print("DPI ที่ใช้: " + ", ".join(f"{d} DPI = {n} หน้า" for d, n in sorted(dpi_counts.items())))
+        
+        return page_results
+    
+    def _process_pages(self, pdf_path, dpi, retry_dpi=None):
+        """
+        ทำ OCR ทีละหน้าใน process ปัจจุบัน
+        
+        หน้าถูกแปลงเป็นรูปภาพทีละช่วง (OCR_RENDER_WINDOW หน้า) และถูกปล่อยทันทีหลังทำ OCR
+        หน่วยความจำจึงขึ้นกับขนาดของช่วง ไม่ใช่จำนวนหน้าทั้งหมดของเอกสาร
+        
+        Args:
+            pdf_path (str): พาธของไฟล์ PDF
+            dpi (int): ความละเอียดของรูปภาพ
+            retry_dpi (int): ความละเอียดสำหรับทำ OCR ซ้ำในหน้าที่ผลลัพธ์ไม่ดี (None = ไม่ทำซ้ำ)
+            
+        Returns:
+            list: ผลลัพธ์ OCR ของแต่ละหน้าตามลำดับหน้า
+        """
+        total_pages = self._get_page_count(pdf_path)
+        window = max(1, OCR_RENDER_WINDOW)
+        
+        print(f"กำลังประมวลผล OCR {total_pages} หน้า (DPI={dpi}, แปลงครั้งละ {window} หน้า): {pdf_path}")
+        page_results = []
+        peak_image_bytes = 0
+        for first_page in range(1, total_pages + 1, window):
+            last_page = min(first_page + window - 1, total_pages)
+            try:
+                images = convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
+            except Exception as e:
+                print(f"เกิดข้อผิดพลาดในการแปลง PDF เป็นรูปภาพ (หน้า {first_page}-{last_page}): {e}")
+                print("อาจต้องติดตั้ง poppler สำหรับ pdf2image: brew install poppler")
+                raise
+            
+            window_bytes = sum(image.width * image.height * len(image.getbands()) for image in images)
+            peak_image_bytes = max(peak_image_bytes, window_bytes)
+            
+            for offset, image in enumerate(images):
+                result = self._ocr_page(image, first_page + offset, total_pages, dpi)
+                page_results.append(self._retry_if_needed(result, pdf_path, total_pages, retry_dpi))
+            
+            # ปล่อยรูปภาพของช่วงนี้ก่อนแปลงช่วงถัดไป
+            for image in images:
+                image.close()
+            del images
+        
+        peak_memory = get_peak_memory()
+        print(f"ขนาดรูปภาพสูงสุดที่อยู่ในหน่วยความจำพร้อมกัน: {format_size(peak_image_bytes)}")
+        if peak_memory is not None:
+            print(f"หน่วยความจำสูงสุดของ process (peak RSS): {format_size(peak_memory)}")
+        
+        return page_results
+    
+    def _get_page_count(self, pdf_path):
+        """
+        อ่านจำนวนหน้าของไฟล์ PDF
+        
+        Args:
+            pdf_path (str): พาธของไฟล์ PDF
+            
+        Returns:
+            int: จำนวนหน้า
+        """
+        try:
+            return pdfinfo_from_path(pdf_path)["Pages"]
+        except Exception as e:
+            print(f"เกิดข้อผิดพลาดในการอ่านข้อมูล PDF: {e}")
+            print("อาจต้องติดตั้ง poppler สำหรับ pdf2image: brew install poppler")
+            raise
+    
+    def _process_pages_parallel(self, pdf_path, dpi, workers, retry_dpi=None):
+        """
+        กระจายหน้าของ PDF ไปทำ OCR ใน process pool
+        
+        แต่ละ worker แปลงหน้าที่ได้รับเป็นรูปภาพเอง จึงไม่ต้องส่งรูปภาพขนาดใหญ่ข้าม process
+        
+        Args:
+            pdf_path (str): พาธของไฟล์ PDF
+            dpi (int): ความละเอียดของรูปภาพ
+            workers (int): จำนวน process
+            retry_dpi (int): ความละเอียดสำหรับทำ OCR ซ้ำในหน้าที่ผลลัพธ์ไม่ดี (None = ไม่ทำซ้ำ)
+            
+        Returns:
+            list: ผลลัพธ์ OCR ของแต่ละหน้าตามลำดับหน้า
+        """
+        total_pages = self._get_page_count(pdf_path)
+        
+        print(f"กำลังประมวลผล OCR {total_pages} หน้า ด้วย {workers} processes (DPI={dpi})...")
+        tasks = [(pdf_path, page, total_pages, dpi, retry_dpi) for page in range(1, total_pages + 1)]
+        # ส่งงานทั้งหมดเข้า pool ขณะถือ lock เพื่อไม่ให้ thread อื่นปิด pool ระหว่างนั้น
+        # (pool ที่ถูกแทนที่ยังทำงานที่ส่งไปแล้วจนเสร็จ)
+        # map คืนผลลัพธ์ตามลำดับของ tasks จึงได้ข้อความเรียงตามหน้าเสมอ
+        with self._pool_lock:
+            results = self._get_pool(workers).map(_ocr_page_worker, tasks)
+        return list(results)
+    
+    def _get_pool(self, workers):
+        """
+        สร้าง (หรือใช้ซ้ำ) process pool สำหรับ OCR (ต้องถือ _pool_lock อยู่แล้ว)
+        
+        Args:
+            workers (int): จำนวน process
+            
+        Returns:
+            ProcessPoolExecutor: process pool
+        """
+        if self._pool is not None and self._pool_workers == workers:
+            return self._pool
+        if self._pool is not None:
+            # ไม่รอ thread อื่นที่ยังรอผลลัพธ์จาก pool เดิม (process จะปิดเมื่องานที่ส่งไปแล้วเสร็จ)
+            self._pool.shutdown(wait=False)
+        
+        num_threads = max(1, (os.cpu_count() or 1) // workers)
+        print(f"กำลังเริ่ม OCR worker {workers} processes ({num_threads} threads ต่อ process)")
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_ocr_worker,
+            initargs=(self.langs, self.gpu, num_threads)
+        )
+        self._pool_workers = workers
+        return self._pool
+    
+    def close(self):
+        """
+        ปิด process pool ของ OCR (ถ้ามี)
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+                self._pool_workers = 0
+    
+    def _retry_if_needed(self, result, pdf_path, total_pages, retry_dpi):
+        """
+        ทำ OCR หน้าเดิมซ้ำที่ความละเอียดสูงขึ้น ถ้าผลลัพธ์รอบแรกไม่ผ่านเกณฑ์
+        
+        เกณฑ์คือค่าความมั่นใจเฉลี่ยของ EasyOCR (OCR_MIN_CONFIDENCE), ความยาวข้อความ
+        และสัดส่วนตัวอักษรไทย (OCR_MIN_THAI_RATIO เมื่อรู้จำภาษาไทย)
+        
+        Args:
+            result (dict): ผลลัพธ์ OCR รอบแรก
+            pdf_path (str): พาธของไฟล์ PDF
+            total_pages (int): จำนวนหน้าทั้งหมด
+            retry_dpi (int): ความละเอียดสำหรับทำซ้ำ (None = ไม่ทำซ้ำ)
+            
+        Returns:
+            dict: ผลลัพธ์ OCR ที่ใช้จริงของหน้านั้น
+        """
+        if retry_dpi is None or retry_dpi <= result["dpi"]:
+            return result
+        
+        reasons = []
+        if result["confidence"] < OCR_MIN_CONFIDENCE:
+            reasons.append(f"ความมั่นใจ {result['confidence']:.2f}")
+        if len(result["text"].strip()) < 10:
+            reasons.append("ข้อความน้อยเกินไป")
+        if "th" in self.langs and result["thai_ratio"] < OCR_MIN_THAI_RATIO:
+            reasons.append(f"สัดส่วนภาษาไทย {result['thai_ratio']:.2f}")
+        if not reasons:
+            return result
+        
+        page_number = result["page"]
+        print(f"  ทำ OCR หน้า {page_number} ซ้ำที่ {retry_dpi} DPI ({', '.join(reasons)})")
+        try:
+            image = convert_from_path(pdf_path, dpi=retry_dpi, first_page=page_number, last_page=page_number)[0]
+        except Exception as e:
+            print(f"เกิดข้อผิดพลาดในการแปลงหน้า {page_number} เป็นรูปภาพ: {e}")
+            return result
+        retried = self._ocr_page(image, page_number, total_pages, retry_dpi)
+        image.close()
+        
+        # รวมเวลาของทั้งสองรอบเพื่อให้สถิติต่อหน้าสะท้อนต้นทุนจริง
+        retried["seconds"] += result["seconds"]
+        return retried
+    
+    def _ocr_page(self, image, page_number, total_pages, dpi=None):
+        """
+        ทำ OCR รูปภาพของหน้าเดียว
+        
+        Args:
+            image (PIL.Image): รูปภาพของหน้า
+            page_number (int): หมายเลขหน้า (เริ่มจาก 1)
+            total_pages (int): จำนวนหน้าทั้งหมด
+            dpi (int): ความละเอียดที่ใช้แปลงรูปภาพ (เก็บไว้ในผลลัพธ์)
+            
+        Returns:
+            dict: หมายเลขหน้า, ข้อความ, เวลาที่ใช้ (วินาที), DPI, ค่าความมั่นใจเฉลี่ย
+                และสัดส่วนตัวอักษรไทย
+        """
+        print(f"กำลังประมวลผล OCR หน้า {page_number}/{total_pages}")
+        start_time = time.time()  # เริ่มจับเวลา
+        try:
+            # ปรับปรุงคุณภาพรูปภาพ
+            img = self._preprocess_image(image)
+            
+            print(f"  กำลังทำ OCR: หน้า {page_number} (ภาษา={', '.join(self.langs)})")
+            
+            # ทำ OCR ด้วย EasyOCR
+            # ส่ง buffer ให้ EasyOCR โดยตรงโดยไม่คัดลอกซ้ำ
+            results = self.reader.readtext(img)
+            
+            # รวมผลลัพธ์จาก EasyOCR (ค่าความมั่นใจเฉลี่ยถ่วงน้ำหนักด้วยความยาวข้อความ)
+            page_text = ""
+            weighted_prob = 0.0
+            total_length = 0
+            for bbox, text, prob in results:
+                page_text += text + " "
+                weighted_prob += prob * len(text)
+                total_length += len(text)
+            confidence = weighted_prob / total_length if total_length > 0 else 0.0
+            
+            letters = len(re.sub(r'\s', '', page_text))
+            thai_ratio = len(re.findall(r'[\u0E00-\u0E7F]', page_text)) / letters if letters > 0 else 0.0
+            
+            # ตรวจสอบว่ามีตัวอักษรภาษาไทยหรือไม่
+            if re.search(r'[\u0E00-\u0E7F]', page_text):
+                print("  ✅ พบตัวอักษรภาษาไทยในผลลัพธ์ OCR")
+            elif 'th' in self.langs:
+                print("  ⚠️ ไม่พบตัวอักษรภาษาไทยในผลลัพธ์ OCR แม้จะระบุภาษาไทย")
+            
+            # วัดเวลาที่ใช้
+            process_time = time.time() - start_time
+            print(f"  ใช้เวลา OCR หน้า {page_number}: {process_time:.2f} วินาที (DPI={dpi}, ความมั่นใจ={confidence:.2f})")
+            
+            # ตรวจสอบผลลัพธ์เบื้องต้น
+            if len(page_text.strip()) < 10:
+                print("  ⚠️ ผลลัพธ์ OCR มีข้อความน้อยเกินไป อาจเกิดปัญหา")
+        except Exception as e:
+            print(f"เกิดข้อผิดพลาดในการ OCR หน้า {page_number}: {e}")
+            page_text = ""  # ใช้ข้อความว่างถ้าเกิดข้อผิดพลาด
+            confidence = 0.0
+            thai_ratio = 0.0
+            process_time = time.time() - start_time
+        
+        return {
+            "page": page_number,
+            "text": page_text,
+            "seconds": process_time,
+            "dpi": dpi,
+            "confidence": confidence,
+            "thai_ratio": thai_ratio
+        }
+    
     def _preprocess_image(self, image):
         """
         ปรับปรุงคุณภาพรูปภาพก่อนทำ OCR
         
+        รูปภาพถูกแปลงเป็น buffer ขาวดำ uint8 เพียงครั้งเดียว แล้วทุกขั้นตอน
+        (contrast, ฟิลเตอร์ขอบ, median, ความสว่าง) เขียนทับ buffer เดิม
+        
         Args:
             image (PIL.Image): รูปภาพที่ต้องการปรับปรุง
             
         Returns:
-            PIL.Image: รูปภาพที่ปรับปรุงแล้ว
+            numpy.ndarray: รูปภาพขาวดำที่ปรับปรุงแล้ว (uint8, 2 มิติ)
         """
         # แปลงเป็นภาพสีขาวดำ (grayscale)
-        img = image.convert('L')
+        buf = image_filters.to_gray_buffer(image)
         
         # สำหรับภาษาไทยโดยเฉพาะ
         if "th" in self.langs:
-            # เพิ่มความคมชัด (contrast)
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(2.0)  # เพิ่มความคมชัด 2 เท่า
+            # เพิ่มความคมชัด (contrast) 2 เท่า
+            image_filters.apply_lut(buf, image_filters.contrast_lut(buf, 2.0))
             
             # ปรับให้เส้นตัวอักษรชัดเจนขึ้น
-            img = img.filter(ImageFilter.EDGE_ENHANCE)
+            image_filters.edge_enhance(buf)
         else:
             # สำหรับภาษาอื่น ใช้การปรับแต่งภาพทั่วไป
-            # เพิ่มความคมชัด (contrast)
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.8)  # เพิ่มความคมชัด 1.8 เท่า
+            # เพิ่มความคมชัด (contrast) 1.8 เท่า
+            image_filters.apply_lut(buf, image_filters.contrast_lut(buf, 1.8))
             
             # เพิ่มความคมชัดของขอบ (sharpen edges)
-            img = img.filter(ImageFilter.SHARPEN)
+            image_filters.sharpen(buf)
             
             # ลบ noise ด้วย median filter
-            img = img.filter(ImageFilter.MedianFilter(size=3))
+            image_filters.median3(buf)
             
-            # ปรับความสว่าง
-            enhancer = ImageEnhance.Brightness(img)
-            img = enhancer.enhance(1.2)  # เพิ่มความสว่าง 1.2 เท่า
+            # ปรับความสว่าง 1.2 เท่า
+            image_filters.apply_lut(buf, image_filters.brightness_lut(1.2))
         
-        return img
+        return buf
     
     def _clean_text(self, text):
         """
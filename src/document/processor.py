@@ -2,18 +2,22 @@
 โมดูลสำหรับการประมวลผลเอกสาร
 """
 import os
+import bisect
 import datetime
-import importlib.util
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from src.document.ocr_processor import OCRProcessor
-from src.config import CHUNK_SIZE, CHUNK_OVERLAP, USE_OCR, OCR_LANG, OCR_CONFIG,OCR_GPU
-from tika import parser as tika_parser
+import threading
+import numpy as np
+from src.document.extractors import get_extractor
+from src.database.filters import build_filter
+from src.config import (CHUNK_SIZE, CHUNK_OVERLAP, USE_OCR, OCR_LANG, OCR_CONFIG,OCR_GPU, OCR_WORKERS, PDF_EXTRACTOR,
+                        STREAM_SPLIT_CHARS, MODEL_NAME, CHUNK_BY_TOKENS, CHUNK_MAX_TOKENS,
+                        CHUNK_OVERLAP_TOKENS)
 
 class DocumentProcessor:
     """
     คลาสสำหรับการประมวลผลเอกสาร PDF
     """
-    def __init__(self, chunk_size=None, chunk_overlap=None, use_ocr=None, ocr_lang=None, ocr_config=None):
+    def __init__(self, chunk_size=None, chunk_overlap=None, use_ocr=None, ocr_lang=None, ocr_config=None,
+                 extractor=None, by_tokens=None, model_name=None):
         """
         สร้าง instance ของ DocumentProcessor
         
@@ -23,35 +27,115 @@ class DocumentProcessor:
             use_ocr (bool): ใช้ OCR หรือไม่
             ocr_lang (str): ภาษาที่ใช้ใน OCR
             ocr_config (str): การตั้งค่า OCR
+            extractor (str): ตัวแยกข้อความเมื่อไม่ใช้ OCR ("tika" หรือ "pypdf")
+            by_tokens (bool): แบ่งตามจำนวน token ของ tokenizer ของโมเดล (chunk_size/chunk_overlap เป็นจำนวน token)
+            model_name (str): ชื่อโมเดลที่ใช้ tokenizer ในการแบ่งตามจำนวน token
         """
         # ใช้ค่าจาก config ถ้าไม่ได้ระบุ
-        self.chunk_size = chunk_size if chunk_size is not None else CHUNK_SIZE
-        self.chunk_overlap = chunk_overlap if chunk_overlap is not None else CHUNK_OVERLAP
+        self.by_tokens = by_tokens if by_tokens is not None else CHUNK_BY_TOKENS
+        if self.by_tokens:
+            self.chunk_size = chunk_size if chunk_size is not None else CHUNK_MAX_TOKENS
+            self.chunk_overlap = chunk_overlap if chunk_overlap is not None else CHUNK_OVERLAP_TOKENS
+        else:
+            self.chunk_size = chunk_size if chunk_size is not None else CHUNK_SIZE
+            self.chunk_overlap = chunk_overlap if chunk_overlap is not None else CHUNK_OVERLAP
         self.use_ocr = use_ocr if use_ocr is not None else USE_OCR
         self.ocr_lang = ocr_lang if ocr_lang is not None else OCR_LANG
         self.ocr_config = ocr_config if ocr_config is not None else OCR_CONFIG
+        self.model_name = model_name or MODEL_NAME
         
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap
-        )
+        # ตัวแยกข้อความ tokenizer และ text splitter ถูกสร้างเมื่อใช้งานครั้งแรก
+        # เพื่อให้สคริปต์ที่แค่ตรวจสอบไฟล์ไม่ต้องโหลด langchain, transformers หรือ tika
+        self.extractor_name = extractor if extractor is not None else PDF_EXTRACTOR
+        self._extractor = None
+        self._tokenizer = None
+        self._text_splitter = None
+        self._lazy_lock = threading.Lock()
         
         if self.use_ocr:
             try:
+                from src.document.ocr_processor import OCRProcessor
                 self.ocr_processor = OCRProcessor(lang=self.ocr_lang, config=self.ocr_config,gpu=OCR_GPU)
+                # OCR แบบขนานโหลด Reader ใน worker processes เท่านั้น แบบ process เดียวโหลดไว้เลย
+                # เพื่อให้เปลี่ยนไปใช้วิธีปกติได้ทันทีถ้าโหลดไม่สำเร็จ
+                if OCR_WORKERS <= 1:
+                    self.ocr_processor.reader
                 print("เปิดใช้งาน EasyOCR สำหรับการแปลงไฟล์ PDF")
             except Exception as e:
                 print(f"ไม่สามารถใช้งาน EasyOCR ได้: {e}")
                 print("จะใช้วิธีการแปลงแบบปกติแทน")
                 self.use_ocr = False
     
-    def should_process_file(self, file_path, collection):
+    @property
+    def extractor(self):
+        """
+        ตัวแยกข้อความจาก PDF (สร้างเมื่อใช้งานครั้งแรก)
+        
+        Returns:
+            TextExtractor: ตัวแยกข้อความ
+        """
+        with self._lazy_lock:
+            if self._extractor is None:
+                self._extractor = get_extractor(self.extractor_name)
+            return self._extractor
+    
+    @property
+    def tokenizer(self):
+        """
+        tokenizer ของโมเดลสำหรับแบ่งตามจำนวน token (สร้างเมื่อใช้งานครั้งแรก)
+        
+        Returns:
+            tokenizer ของ Hugging Face หรือ None ถ้าแบ่งตามจำนวนตัวอักษร
+        """
+        if not self.by_tokens:
+            return None
+        with self._lazy_lock:
+            if self._tokenizer is None:
+                from transformers import AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            return self._tokenizer
+    
+    @property
+    def text_splitter(self):
+        """
+        ตัวแบ่งข้อความ (สร้างเมื่อใช้งานครั้งแรก)
+        
+        Returns:
+            RecursiveCharacterTextSplitter: ตัวแบ่งข้อความ
+        """
+        if self._text_splitter is not None:
+            return self._text_splitter
+        
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        if self.by_tokens:
+            # แบ่งตามจำนวน token ของ tokenizer เดียวกับโมเดล เพื่อไม่ให้ chunk ยาวเกินที่โมเดลรับได้
+            # (ภาษาไทยใช้จำนวน token ต่อตัวอักษรต่างจากภาษาอังกฤษมาก)
+            text_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+                self.tokenizer,
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap
+            )
+        else:
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap
+            )
+        with self._lazy_lock:
+            if self._text_splitter is None:
+                self._text_splitter = text_splitter
+            return self._text_splitter
+    
+    def should_process_file(self, file_path, collection, incremental=False, flush=True):
         """
         ตรวจสอบว่าไฟล์มีการแก้ไขหรือไม่
         
         Args:
             file_path (str): พาธของไฟล์ที่ต้องการตรวจสอบ
             collection: Milvus collection สำหรับเช็คข้อมูลที่มีอยู่แล้ว
+            incremental (bool): ถ้าเป็น True จะไม่ลบข้อมูลเก่าของไฟล์ที่แก้ไข
+                (ให้ VectorDatabase.update_file_chunks จัดการเฉพาะส่วนที่เปลี่ยน)
+            flush (bool): flush หลังลบข้อมูลเก่า (ปิดได้เมื่อ VectorDatabase อยู่ในโหมด buffered
+                ซึ่งจะ flush ครั้งเดียวตอน commit)
             
         Returns:
             tuple: (bool, float) - ควรประมวลผลหรือไม่, เวลาที่แก้ไขล่าสุด
@@ -64,10 +148,11 @@ class DocumentProcessor:
         file_mod_time = os.path.getmtime(file_path)
         file_mod_datetime = datetime.datetime.fromtimestamp(file_mod_time)
         file_name = os.path.basename(file_path)
+        file_expr = build_filter(file_name)
         
         # ตรวจสอบว่าไฟล์นี้มีในฐานข้อมูลหรือไม่
         res = collection.query(
-            expr=f'file_name == "{file_name}"',
+            expr=file_expr,
             output_fields=["file_mod_time"]
         )
         
@@ -77,31 +162,96 @@ class DocumentProcessor:
             return True, file_mod_time
         
         # มีข้อมูลในฐานข้อมูลแล้ว ตรวจสอบเวลาแก้ไข
-        db_mod_time = res[0].get("file_mod_time", 0)
+        # (การอัปเดตแบบรายส่วนทำให้แต่ละ chunk อาจมีเวลาต่างกัน จึงใช้ค่าล่าสุด)
+        db_mod_time = max(r.get("file_mod_time", 0) for r in res)
         if file_mod_time > db_mod_time:
             print(f"ไฟล์ {file_name} มีการแก้ไขใหม่ จะทำการอัปเดต")
             
+            if incremental:
+                return True, file_mod_time
+            
             # ลบข้อมูลเก่าออกก่อน
-            collection.delete(expr=f'file_name == "{file_name}"')
-            collection.flush()
+            collection.delete(expr=file_expr)
+            if flush:
+                collection.flush()
             return True, file_mod_time
         else:
             print(f"ไฟล์ {file_name} ไม่มีการเปลี่ยนแปลง ข้ามไป")
             return False, None
     
+    def plan_files(self, file_paths, indexed_mod_times, force=False):
+        """
+        ตรวจสอบหลายไฟล์พร้อมกันโดยเทียบกับเวลาที่แก้ไขที่อ่านจากฐานข้อมูลไว้แล้ว
+        (ใช้แทน should_process_file ที่ต้อง query ฐานข้อมูลทีละไฟล์)
+        
+        Args:
+            file_paths (list): พาธของไฟล์ที่ต้องการตรวจสอบ
+            indexed_mod_times (dict): ชื่อไฟล์ -> เวลาที่แก้ไขล่าสุดในฐานข้อมูล
+                (จาก VectorDatabase.get_file_mod_times)
+            force (bool): ถือว่าไฟล์ที่มีในฐานข้อมูลแล้วถูกแก้ไขทั้งหมด (เช่น เมื่อเปลี่ยนวิธีแบ่ง chunk)
+            
+        Returns:
+            tuple: (รายการ (พาธ, เวลาที่แก้ไข) ที่ต้องประมวลผล,
+                    ชื่อไฟล์ที่มีในฐานข้อมูลแล้วแต่ถูกแก้ไข, จำนวนไฟล์ที่ข้าม)
+        """
+        total = len(file_paths)
+        file_paths = [path for path in file_paths if os.path.exists(path)]
+        file_names = [os.path.basename(path) for path in file_paths]
+        
+        local_mod_times = np.array([os.path.getmtime(path) for path in file_paths], dtype=np.float64)
+        db_mod_times = np.array([indexed_mod_times.get(name, np.nan) for name in file_names], dtype=np.float64)
+        
+        # ไฟล์ใหม่ (ไม่มีในฐานข้อมูล) หรือไฟล์ที่แก้ไขหลังจากเวลาที่บันทึกไว้
+        is_new = np.isnan(db_mod_times)
+        is_modified = ~is_new & (force | (local_mod_times > np.nan_to_num(db_mod_times, nan=np.inf)))
+        to_process = np.flatnonzero(is_new | is_modified)
+        
+        plan = [(file_paths[i], float(local_mod_times[i])) for i in to_process]
+        modified = [file_names[i] for i in np.flatnonzero(is_modified)]
+        skipped = total - len(plan)
+        
+        print(f"ตรวจสอบไฟล์ {total} ไฟล์: ใหม่ {int(is_new.sum())}, "
+              f"แก้ไข {len(modified)}, ข้าม {skipped}")
+        return plan, modified, skipped
+    
     def process_file(self, file_path):
         """
         ประมวลผลไฟล์ PDF เพื่อแยกเป็นข้อความย่อย
         
+        แบ่งด้วย iter_chunks เช่นเดียวกับโหมด streaming ของ pipeline เพื่อให้ chunk และตำแหน่ง
+        (หน้าและตำแหน่งตัวอักษร) ตรงกันไม่ว่าไฟล์จะถูกเพิ่มด้วยวิธีใด
+        
         Args:
             file_path (str): พาธของไฟล์ PDF
             
         Returns:
-            tuple: (list, list, float) - ข้อความย่อย, ชื่อไฟล์ของแต่ละส่วน, เวลาที่แก้ไขล่าสุด
+            tuple: (list, list, list, list) - ข้อความย่อย, ชื่อไฟล์ของแต่ละส่วน, เวลาที่แก้ไขล่าสุด
+                และข้อมูลประกอบของแต่ละส่วน
         """
         file_name = os.path.basename(file_path)
         file_mod_time = os.path.getmtime(file_path)
         
+        # แปลงและแบ่งเอกสารเป็นส่วนย่อย
+        chunks = []
+        chunk_metadata = []
+        for chunk, meta in self.iter_file_chunks(file_path):
+            chunks.append(chunk)
+            chunk_metadata.append(meta)
+        chunk_to_file_map = [file_name] * len(chunks)
+        file_mod_times = [file_mod_time] * len(chunks)
+        
+        return chunks, chunk_to_file_map, file_mod_times, chunk_metadata
+    
+    def extract_text(self, file_path):
+        """
+        แปลงไฟล์ PDF เป็นข้อความ (ด้วย OCR หรือตัวแยกข้อความตามการตั้งค่า)
+        
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+            
+        Returns:
+            str: ข้อความทั้งหมดในไฟล์
+        """
         print(f"กำลังโหลดไฟล์: {file_path}")
         
         # ใช้ OCR หรือวิธีปกติในการแปลง PDF เป็นข้อความ
@@ -109,28 +259,244 @@ class DocumentProcessor:
             print(f"กำลังแปลง PDF เป็นข้อความด้วย EasyOCR: {file_path}")
             text = self.ocr_processor.process_pdf(file_path)
         else:
-            # ใช้ Tika parser
-            print(f"กำลังแปลง PDF เป็นข้อความด้วย Tika parser: {file_path}")
+            # ใช้ตัวแยกข้อความตามการตั้งค่า (Tika หรือ pypdf)
+            name = self.extractor.name
+            print(f"กำลังแปลง PDF เป็นข้อความด้วย {name}: {file_path}")
             try:
-                parsed_pdf = tika_parser.from_file(file_path)
-                text = parsed_pdf['content'] if parsed_pdf['content'] else ""
-                if not text:
-                    print("⚠️ Tika ไม่สามารถแยกข้อความจาก PDF ได้ หรือไฟล์ไม่มีข้อความ")
+                text = self.extractor.extract(file_path)
+                if not text.strip():
+                    print(f"⚠️ {name} ไม่สามารถแยกข้อความจาก PDF ได้ หรือไฟล์ไม่มีข้อความ")
                     print("กรุณาลองใช้ EasyOCR (ตั้งค่า USE_OCR = True) เพื่อแปลง PDF เป็นข้อความ")
                     text = ""
                 else:
                     preview_length = min(500, len(text))
-                    print(f"Tika แยกข้อความได้ {len(text)} ตัวอักษร")
+                    print(f"{name} แยกข้อความได้ {len(text)} ตัวอักษร")
                     print(f"ตัวอย่างข้อความ: {text[:preview_length]}...")
             except Exception as e:
-                print(f"⚠️ เกิดข้อผิดพลาดในการใช้ Tika: {e}")
+                print(f"⚠️ เกิดข้อผิดพลาดในการใช้ {name}: {e}")
                 print("กรุณาลองใช้ EasyOCR (ตั้งค่า USE_OCR = True) เพื่อแปลง PDF เป็นข้อความ")
                 text = ""
         
-        # แบ่งเอกสารเป็นส่วนย่อย
-        chunks = self.text_splitter.split_text(text)
-        chunk_to_file_map = [file_name] * len(chunks)
-        file_mod_times = [file_mod_time] * len(chunks)
+        return text
+    
+    def iter_pages(self, file_path):
+        """
+        แปลงไฟล์ PDF เป็นข้อความทีละหน้า
+        
+        OCR ต้องทำทั้งไฟล์ก่อนจึงจะได้ข้อความของแต่ละหน้า ส่วน Tika ส่งผลลัพธ์ทั้งไฟล์กลับมาในครั้งเดียว
+        
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+            
+        Returns:
+            iterator: (หมายเลขหน้า, ข้อความ, วิธีที่ใช้แปลง เช่น "tika" หรือ "ocr@800")
+        """
+        if self.use_ocr:
+            print(f"กำลังแปลง PDF เป็นข้อความทีละหน้าด้วย EasyOCR: {file_path}")
+            for page_number, text, dpi in self.ocr_processor.process_pdf_pages(file_path):
+                yield page_number, text, f"ocr@{dpi}"
+            return
+        
+        name = self.extractor.name
+        print(f"กำลังแปลง PDF เป็นข้อความทีละหน้าด้วย {name}: {file_path}")
+        for page_number, text in enumerate(self.extractor.extract_pages(file_path), 1):
+            yield page_number, text, name
+    
+    def iter_chunks(self, pages):
+        """
+        แบ่งข้อความที่มาทีละหน้าเป็นส่วนย่อยโดยไม่ต้องรวมข้อความทั้งไฟล์ไว้ในหน่วยความจำ
+        
+        ข้อความถูกสะสมจนยาวถึง STREAM_SPLIT_CHARS แล้วจึงแบ่ง ส่วนสุดท้ายของแต่ละรอบยังไม่ถูกส่งออก
+        แต่ถูกนำไปต่อกับหน้าถัดไป ทำให้ chunk ที่คร่อมระหว่างหน้ายังมีข้อความซ้อนกัน (overlap) ตามปกติ
+        
+        ตำแหน่งตัวอักษรนับในข้อความทั้งไฟล์ที่ต่อแต่ละหน้าด้วย "\n\n"
+        
+        Args:
+            pages (iterable): (หมายเลขหน้า, ข้อความ, วิธีที่ใช้แปลง) ของแต่ละหน้า
+            
+        Returns:
+            iterator: (ข้อความย่อย, dict ที่มี page, char_start, char_end, method และ tokens)
+        """
+        # buffer เป็นส่วนท้ายของข้อความทั้งไฟล์ที่เริ่มที่ตำแหน่ง buffer_start
+        buffer = ""
+        buffer_start = 0
+        page_offsets = []
+        page_info = []
+        count = 0
+        for page_number, page_text, method in pages:
+            if not page_text:
+                continue
+            if page_offsets:
+                buffer += "\n\n"
+            page_offsets.append(buffer_start + len(buffer))
+            page_info.append((page_number, method))
+            buffer += page_text
+            if len(buffer) < STREAM_SPLIT_CHARS:
+                continue
+            
+            chunks, tokens = self._split(buffer)
+            starts = self._chunk_starts(buffer, chunks)
+            for i, (chunk, start) in enumerate(zip(chunks[:-1], starts[:-1])):
+                count += 1
+                yield chunk, self._chunk_metadata(chunk, buffer_start + start, page_offsets, page_info,
+                                                  tokens[i] if tokens else None)
+            
+            # เก็บข้อความตั้งแต่จุดเริ่มของ chunk สุดท้ายไว้แบ่งร่วมกับหน้าถัดไป
+            cut = starts[-1] if chunks else len(buffer)
+            buffer = buffer[cut:]
+            buffer_start += cut
+        
+        if buffer.strip():
+            chunks, tokens = self._split(buffer)
+            for i, (chunk, start) in enumerate(zip(chunks, self._chunk_starts(buffer, chunks))):
+                count += 1
+                yield chunk, self._chunk_metadata(chunk, buffer_start + start, page_offsets, page_info,
+                                                  tokens[i] if tokens else None)
+        
+        print(f"แบ่งเอกสารเป็น {count} ส่วนย่อย")
+    
+    def _chunk_starts(self, text, chunks):
+        """
+        หาตำแหน่งเริ่มต้นของแต่ละ chunk ในข้อความที่ถูกแบ่ง
+        
+        Args:
+            text (str): ข้อความที่ถูกแบ่ง
+            chunks (list): ข้อความย่อยตามลำดับ
+            
+        Returns:
+            list: ตำแหน่งเริ่มต้นของแต่ละ chunk
+        """
+        starts = []
+        index = -1
+        for chunk in chunks:
+            found = text.find(chunk, index + 1)
+            index = found if found >= 0 else index + 1
+            starts.append(index)
+        return starts
+    
+    def _chunk_metadata(self, chunk, char_start, page_offsets, page_info, tokens=None):
+        """
+        สร้างข้อมูลประกอบของ chunk จากตำแหน่งในข้อความทั้งไฟล์
+        
+        Args:
+            chunk (str): ข้อความย่อย
+            char_start (int): ตำแหน่งเริ่มต้นในข้อความทั้งไฟล์
+            page_offsets (list): ตำแหน่งเริ่มต้นของแต่ละหน้าในข้อความทั้งไฟล์
+            page_info (list): (หมายเลขหน้า, วิธีที่ใช้แปลง) ของแต่ละหน้า
+            tokens (int): จำนวน token ของ chunk (None ถ้าแบ่งตามจำนวนตัวอักษร)
+            
+        Returns:
+            dict: หน้า ตำแหน่ง วิธีที่ใช้แปลง (ของหน้าที่ chunk เริ่มต้น) และจำนวน token
+        """
+        page_number, method = page_info[max(0, bisect.bisect_right(page_offsets, char_start) - 1)]
+        return {
+            "page": page_number,
+            "char_start": char_start,
+            "char_end": char_start + len(chunk),
+            "method": method,
+            "tokens": tokens,
+        }
+    
+    def iter_file_chunks(self, file_path):
+        """
+        แปลงไฟล์ PDF และแบ่งเป็นส่วนย่อยแบบ streaming
+        
+        Args:
+            file_path (str): พาธของไฟล์ PDF
+            
+        Returns:
+            iterator: (ข้อความย่อย, ข้อมูลประกอบของ chunk)
+        """
+        return self.iter_chunks(self.iter_pages(file_path))
+    
+    def split_text(self, text):
+        """
+        แบ่งข้อความเป็นส่วนย่อย
+        
+        Args:
+            text (str): ข้อความที่ต้องการแบ่ง
+            
+        Returns:
+            list: ข้อความย่อย
+        """
+        chunks, _ = self._split(text)
         
         print(f"แบ่งเอกสารเป็น {len(chunks)} ส่วนย่อย")
-        return chunks, chunk_to_file_map, file_mod_times
\ No newline at end of file
+        return chunks
+    
+    def _split(self, text):
+        """
+        แบ่งข้อความเป็นส่วนย่อยและนับจำนวน token ของแต่ละส่วน
+        
+        text splitter ของ langchain รวมจำนวน token ของชิ้นย่อยแต่ละชิ้นตอนต่อกันเป็น chunk
+        จึงอาจได้ chunk ที่ยาวเกิน chunk_size (รวมถึงชิ้นที่แบ่งต่อด้วยตัวคั่นไม่ได้)
+        chunk เหล่านี้จะถูกแบ่งใหม่ตามตำแหน่ง token เพื่อไม่ให้โมเดลตัดข้อความส่วนท้ายทิ้ง
+        
+        Args:
+            text (str): ข้อความที่ต้องการแบ่ง
+            
+        Returns:
+            tuple: (ข้อความย่อย, จำนวน token ของแต่ละส่วน หรือ None ถ้าแบ่งตามจำนวนตัวอักษร)
+        """
+        chunks = self.text_splitter.split_text(text)
+        tokens = self.count_tokens(chunks)
+        if tokens is None or all(count <= self.chunk_size for count in tokens):
+            return chunks, tokens
+        
+        result = []
+        for chunk, count in zip(chunks, tokens):
+            result.extend(self._split_by_tokens(chunk) if count > self.chunk_size else [chunk])
+        tokens = self.count_tokens(result)
+        too_long = sum(count > self.chunk_size for count in tokens)
+        if too_long:
+            print(f"⚠️ มี {too_long} ส่วนย่อยที่ยาวเกิน {self.chunk_size} tokens โมเดลจะตัดส่วนท้ายทิ้ง")
+        return result, tokens
+    
+    def _split_by_tokens(self, chunk):
+        """
+        แบ่ง chunk ที่ยาวเกินเป็นช่วงละ chunk_size tokens (ซ้อนกัน chunk_overlap tokens)
+        
+        ตัดตามตำแหน่งตัวอักษรของ token ผลลัพธ์จึงเป็นส่วนหนึ่งของข้อความเดิมเสมอ
+        
+        Args:
+            chunk (str): ข้อความย่อยที่ยาวเกิน
+            
+        Returns:
+            list: ข้อความย่อยที่สั้นลง
+        """
+        offsets = self.tokenizer(chunk, add_special_tokens=False, truncation=False,
+                                 return_offsets_mapping=True)['offset_mapping']
+        step = max(1, self.chunk_size - self.chunk_overlap)
+        pieces = []
+        for start in range(0, len(offsets), step):
+            window = offsets[start:start + self.chunk_size]
+            pieces.append(chunk[window[0][0]:window[-1][1]])
+            if start + self.chunk_size >= len(offsets):
+                break
+        return pieces
+    
+    def count_tokens(self, chunks):
+        """
+        นับจำนวน token ของแต่ละ chunk ด้วย tokenizer ของโมเดล (ไม่นับ [CLS] และ [SEP])
+        
+        ใช้ส่งต่อให้ EmbeddingModel.get_embeddings จัดกลุ่มความยาวโดยไม่ต้อง tokenize ซ้ำ
+        
+        Args:
+            chunks (list): ข้อความย่อย
+            
+        Returns:
+            list: จำนวน token ของแต่ละ chunk หรือ None ถ้าแบ่งตามจำนวนตัวอักษร
+        """
+        if self.tokenizer is None:
+            return None
+        if not chunks:
+            return []
+        encoded = self.tokenizer(list(chunks), add_special_tokens=False, truncation=False)
+        return [len(ids) for ids in encoded['input_ids']]
+    
+    def close(self):
+        """
+        ปิด process pool ของ OCR (ถ้ามี)
+        """
+        if self.use_ocr:
+            self.ocr_processor.close()
\ No newline at end of file
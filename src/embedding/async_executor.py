@@ -0,0 +1,59 @@
+"""
+โมดูลสำหรับสร้าง embeddings จากโค้ด asyncio โดยไม่บล็อก event loop
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.config import ASYNC_EMBEDDING_WORKERS
+
+class AsyncEmbeddingExecutor:
+    """
+    คลาสสำหรับเรียก EmbeddingModel จาก asyncio
+
+    การสร้าง embedding ทำงานใน thread pool แยก เพื่อให้ event loop รับคำขออื่นต่อได้
+    ระหว่างที่โมเดลกำลังประมวลผล
+    """
+    def __init__(self, model, max_workers=None):
+        """
+        สร้าง instance ของ AsyncEmbeddingExecutor
+
+        Args:
+            model (EmbeddingModel): โมเดลสำหรับสร้าง embeddings
+            max_workers (int): จำนวน thread สำหรับเรียกโมเดล
+        """
+        self.model = model
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or ASYNC_EMBEDDING_WORKERS,
+            thread_name_prefix="embedding"
+        )
+
+    async def embed_query(self, text):
+        """
+        สร้าง embedding ของคำค้น (ใช้แคชคำค้นของโมเดล)
+
+        Args:
+            text (str): คำค้น
+
+        Returns:
+            numpy.ndarray: embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.model.get_query_embedding, text)
+
+    async def embed(self, texts):
+        """
+        สร้าง embeddings ของข้อความหลายรายการ
+
+        Args:
+            texts (list): ข้อความที่ต้องการสร้าง embeddings
+
+        Returns:
+            numpy.ndarray: เมทริกซ์ float32 ขนาด (จำนวนข้อความ, dimension)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.model.get_embeddings, list(texts))
+
+    def close(self):
+        """
+        ปิด thread pool
+        """
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,77 @@
+"""
+โมดูลสำหรับโหลดโมเดล SentenceTransformer ตาม backend ที่ใช้ประมวลผล (PyTorch หรือ ONNX Runtime)
+"""
+import os
+import re
+from src.config import EMBEDDING_ONNX_DIR, EMBEDDING_ONNX_QUANT_CONFIG
+
+# backend ที่เลือกได้
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+def load_model(model_name, backend="torch"):
+    """
+    โหลดโมเดลตาม backend
+
+    - torch: PyTorch fp32 (ค่าเดิม)
+    - torch-int8: PyTorch ที่แปลง Linear layer เป็น int8 แบบ dynamic quantization (CPU เท่านั้น)
+    - onnx: ONNX Runtime fp32
+    - onnx-int8: ONNX Runtime ที่ quantize เป็น int8
+
+    โมเดล ONNX จะถูกแปลงครั้งแรกที่ใช้งานและเก็บไว้ใน EMBEDDING_ONNX_DIR
+
+    Args:
+        model_name (str): ชื่อของโมเดล
+        backend (str): ชื่อ backend
+
+    Returns:
+        SentenceTransformer: โมเดลที่พร้อมใช้งาน (encode และ tokenizer เหมือนเดิมทุก backend)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"ไม่รู้จัก backend ของโมเดล: {backend} (เลือกได้: {', '.join(BACKENDS)})")
+
+    # import torch และ sentence_transformers เมื่อโหลดโมเดลจริงเท่านั้น (ใช้เวลาหลายวินาที)
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "torch-int8":
+        model = SentenceTransformer(model_name, device="cpu")
+        model.eval()
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return _load_onnx(model_name, quantized=backend == "onnx-int8")
+
+def _load_onnx(model_name, quantized=False):
+    """
+    โหลดโมเดล ONNX ที่แปลงไว้แล้ว (แปลงและบันทึกลงดิสก์ถ้ายังไม่มี)
+
+    Args:
+        model_name (str): ชื่อของโมเดล
+        quantized (bool): ใช้โมเดลที่ quantize เป็น int8 หรือไม่
+
+    Returns:
+        SentenceTransformer: โมเดลที่ใช้ ONNX Runtime
+    """
+    from sentence_transformers import SentenceTransformer
+    model_dir = os.path.join(EMBEDDING_ONNX_DIR, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+    onnx_path = os.path.join(model_dir, "onnx", "model.onnx")
+    if not os.path.exists(onnx_path):
+        print(f"กำลังแปลงโมเดล {model_name} เป็น ONNX (ทำครั้งเดียว)...")
+        model = SentenceTransformer(model_name, backend="onnx", device="cpu")
+        model.save_pretrained(model_dir)
+        print(f"บันทึกโมเดล ONNX ไว้ที่ {model_dir}")
+
+    if not quantized:
+        return SentenceTransformer(model_dir, backend="onnx", device="cpu")
+
+    file_suffix = f"qint8_{EMBEDDING_ONNX_QUANT_CONFIG}"
+    file_name = f"onnx/model_{file_suffix}.onnx"
+    if not os.path.exists(os.path.join(model_dir, file_name)):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        print(f"กำลัง quantize โมเดล ONNX เป็น int8 ({EMBEDDING_ONNX_QUANT_CONFIG}, ทำครั้งเดียว)...")
+        model = SentenceTransformer(model_dir, backend="onnx", device="cpu")
+        export_dynamic_quantized_onnx_model(model, EMBEDDING_ONNX_QUANT_CONFIG, model_dir, file_suffix=file_suffix)
+
+    return SentenceTransformer(model_dir, backend="onnx", device="cpu", model_kwargs={"file_name": file_name})
@@ -0,0 +1,381 @@
+"""
+โมดูลสำหรับแคช embeddings (แคชบนดิสก์สำหรับ chunks และแคชในหน่วยความจำสำหรับคำค้น)
+"""
+import os
+import re
+import hashlib
+import sqlite3
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+try:
+    import fcntl
+except ImportError:  # Windows ไม่มี fcntl จึงไม่ล็อกข้าม process
+    fcntl = None
+from src.utils.helpers import load_json
+from src.utils.lru_cache import LRUCache
+
+class EmbeddingCache:
+    """
+    คลาสสำหรับเก็บ embeddings ของข้อความไว้บนดิสก์
+
+    เวกเตอร์ถูกเก็บใน memory-mapped file ขนาดคงที่ (capacity x dimension)
+    ส่วน index ที่จับคู่ hash ของข้อความกับตำแหน่งใน file ถูกเก็บใน SQLite และบันทึกเฉพาะรายการที่เปลี่ยน
+    เมื่อแคชเต็มจะนำตำแหน่งของรายการที่ใช้งานล่าสุดนานที่สุด (LRU) มาใช้ใหม่
+
+    ลำดับการเขียนป้องกันไม่ให้ index บนดิสก์ชี้ไปยังเวกเตอร์ของข้อความอื่นเมื่อ process หยุดกลางคัน:
+    รายการที่ถูกแทนที่จะถูกลบจาก index ก่อนเขียนเวกเตอร์ใหม่ทับ และรายการใหม่จะถูกบันทึกลง index
+    หลังจากเขียนเวกเตอร์ลงดิสก์แล้วเท่านั้น (ใน save)
+
+    index ในหน่วยความจำของแต่ละ process ไม่เห็นตำแหน่งที่ process อื่นจองหรือเขียนทับ
+    แคชจึงถูกล็อกไว้ให้ process เดียวใช้ (ด้วย flock) ตั้งแต่เปิดจนถึง close
+    """
+    def __init__(self, cache_dir, model_name, dimension, max_entries=100000):
+        """
+        สร้าง instance ของ EmbeddingCache
+
+        Args:
+            cache_dir (str): โฟลเดอร์สำหรับเก็บแคช
+            model_name (str): ชื่อโมเดล (ใช้เป็นส่วนหนึ่งของ key)
+            dimension (int): ขนาดของ vector embedding
+            max_entries (int): จำนวนรายการสูงสุดในแคช
+
+        Raises:
+            BlockingIOError: ถ้า process อื่นเปิดแคชของโมเดลนี้อยู่
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_entries = max_entries
+
+        # แยกโฟลเดอร์ตามชื่อโมเดล
+        model_slug = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.cache_dir = os.path.join(cache_dir, model_slug)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.vectors_path = os.path.join(self.cache_dir, "vectors.f32")
+        self.index_path = os.path.join(self.cache_dir, "index.sqlite")
+        # index แบบ JSON ของเวอร์ชันก่อน (ย้ายเข้า SQLite ครั้งเดียว)
+        self.legacy_index_path = os.path.join(self.cache_dir, "index.json")
+        self._lock_file = self._acquire_lock()
+
+        # key -> slot เรียงตามลำดับการใช้งาน (เก่าสุดอยู่หน้า)
+        self.index = OrderedDict()
+        self.free_slots = []
+        # ลำดับการใช้งานล่าสุดของแต่ละ key (บันทึกลง SQLite เพื่อเรียง LRU ได้หลังเปิดใหม่)
+        self.last_used = {}
+        self._clock = 0
+        # key ที่เพิ่มหรือถูกใช้งานตั้งแต่บันทึกครั้งล่าสุด (key -> slot)
+        self.dirty = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        try:
+            self._load()
+        except Exception:
+            self._lock_file.close()
+            raise
+
+    def _acquire_lock(self):
+        """
+        ล็อกโฟลเดอร์แคชไว้ให้ process นี้ใช้คนเดียว (ปลดล็อกเมื่อ close หรือ process จบ)
+
+        Returns:
+            file: ไฟล์ล็อกที่เปิดค้างไว้
+
+        Raises:
+            BlockingIOError: ถ้า process อื่นถือล็อกอยู่
+        """
+        lock_file = open(os.path.join(self.cache_dir, "lock"), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise
+        return lock_file
+
+    def _connect(self):
+        """
+        เปิดไฟล์ SQLite ของ index และสร้างตารางถ้ายังไม่มี
+
+        Returns:
+            sqlite3.Connection: การเชื่อมต่อ
+        """
+        conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " slot INTEGER NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def _load(self):
+        """
+        โหลด index และเปิด vector file (สร้างใหม่ถ้ายังไม่มี เสียหาย หรือไม่ตรงกับการตั้งค่า)
+        """
+        config = {
+            "model_name": self.model_name,
+            "dimension": str(self.dimension),
+            "max_entries": str(self.max_entries),
+        }
+        try:
+            self.conn = self._connect()
+            meta = dict(self.conn.execute("SELECT name, value FROM meta").fetchall())
+        except sqlite3.DatabaseError as e:
+            print(f"index ของแคช embeddings เสียหาย ({e}) จะสร้างใหม่")
+            os.remove(self.index_path)
+            self.conn = self._connect()
+            meta = {}
+
+        valid = meta == config and os.path.exists(self.vectors_path)
+        if not valid:
+            legacy_entries = self._read_legacy_index()
+            with self.conn:
+                self.conn.execute("DELETE FROM entries")
+                self.conn.execute("DELETE FROM meta")
+                self.conn.executemany("INSERT INTO meta (name, value) VALUES (?, ?)", config.items())
+                if legacy_entries is not None and os.path.exists(self.vectors_path):
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                        [(key, slot, order) for order, (key, slot) in enumerate(legacy_entries)]
+                    )
+                    print(f"ย้าย index ของแคช embeddings {len(legacy_entries)} รายการจาก index.json เข้า SQLite")
+                    valid = True
+
+        self.vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode='r+' if valid else 'w+',
+            shape=(self.max_entries, self.dimension)
+        )
+        if not valid:
+            print(f"สร้างแคช embeddings ใหม่: {self.cache_dir}")
+
+        rows = self.conn.execute("SELECT key, slot, last_used FROM entries ORDER BY last_used").fetchall()
+        for key, slot, last_used in rows:
+            self.index[key] = slot
+            self.last_used[key] = last_used
+        self._clock = rows[-1][2] if rows else 0
+
+        used = set(self.index.values())
+        self.free_slots = [slot for slot in range(self.max_entries - 1, -1, -1) if slot not in used]
+
+    def _read_legacy_index(self):
+        """
+        อ่าน index แบบ JSON ของเวอร์ชันก่อน (ถ้ามี อ่านได้ และตรงกับการตั้งค่า) แล้วลบไฟล์ JSON
+
+        Returns:
+            list: รายการ (key, slot) เรียงจากใช้งานเก่าสุด หรือ None ถ้าใช้ไม่ได้
+        """
+        if not os.path.exists(self.legacy_index_path):
+            return None
+        try:
+            meta = load_json(self.legacy_index_path)
+        except ValueError:
+            # ไฟล์ถูกเขียนไม่ครบ (เช่น process หยุดกลางคัน)
+            meta = None
+        os.remove(self.legacy_index_path)
+
+        if (meta is None
+                or meta.get("model_name") != self.model_name
+                or meta.get("dimension") != self.dimension
+                or meta.get("max_entries") != self.max_entries):
+            return None
+        return meta.get("entries", [])
+
+    @staticmethod
+    def normalize_text(text):
+        """
+        ปรับข้อความให้อยู่ในรูปแบบมาตรฐานก่อนคำนวณ hash
+
+        Args:
+            text (str): ข้อความต้นฉบับ
+
+        Returns:
+            str: ข้อความที่ปรับแล้ว
+        """
+        text = unicodedata.normalize("NFC", text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def make_key(self, text):
+        """
+        สร้าง key ของแคชจากชื่อโมเดลและ hash ของข้อความ
+
+        Args:
+            text (str): ข้อความ
+
+        Returns:
+            str: key ของแคช
+        """
+        payload = f"{self.model_name}\0{self.normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key):
+        """
+        ดึง embedding จากแคช
+
+        Args:
+            key (str): key ของแคช
+
+        Returns:
+            numpy.ndarray: embedding vector หรือ None ถ้าไม่พบ
+        """
+        slot = self.index.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+
+        self._touch(key, slot)
+        self.hits += 1
+        return np.array(self.vectors[slot])
+
+    def _touch(self, key, slot):
+        """
+        บันทึกว่า key ถูกใช้งานล่าสุด (ลำดับถูกบันทึกลงดิสก์ตอน save)
+
+        Args:
+            key (str): key ของแคช
+            slot (int): ตำแหน่งของเวกเตอร์
+        """
+        self.index.move_to_end(key)
+        self._clock += 1
+        self.last_used[key] = self._clock
+        self.dirty[key] = slot
+
+    def put_many(self, keys, embeddings):
+        """
+        เพิ่ม embeddings หลายรายการลงในแคช
+
+        รายการใหม่จะอยู่บนดิสก์หลังจากเรียก save เท่านั้น
+
+        Args:
+            keys (list): key ของแคช
+            embeddings (numpy.ndarray): embedding vectors ตามลำดับของ keys
+        """
+        slots = []
+        evicted = []
+        for key in keys:
+            slot = self.index.get(key)
+            if slot is None:
+                if self.free_slots:
+                    slot = self.free_slots.pop()
+                else:
+                    # แคชเต็ม นำตำแหน่งของรายการที่ไม่ได้ใช้นานที่สุดมาใช้ใหม่
+                    old_key, slot = self.index.popitem(last=False)
+                    self.last_used.pop(old_key, None)
+                    self.dirty.pop(old_key, None)
+                    evicted.append(old_key)
+                    self.evictions += 1
+                self.index[key] = slot
+            self._touch(key, slot)
+            slots.append(slot)
+
+        if evicted:
+            # ลบรายการที่ถูกแทนที่ออกจาก index บนดิสก์ก่อนเขียนเวกเตอร์ใหม่ทับตำแหน่งเดิม
+            with self.conn:
+                self.conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+
+        for slot, embedding in zip(slots, embeddings):
+            self.vectors[slot] = embedding
+
+    def put(self, key, embedding):
+        """
+        เพิ่ม embedding ลงในแคช
+
+        Args:
+            key (str): key ของแคช
+            embedding (numpy.ndarray): embedding vector
+        """
+        self.put_many([key], [embedding])
+
+    def save(self):
+        """
+        เขียนเวกเตอร์ลงดิสก์ แล้วบันทึกเฉพาะรายการของ index ที่เพิ่มหรือถูกใช้งานตั้งแต่บันทึกครั้งล่าสุด
+        """
+        if not self.dirty:
+            return
+        self.vectors.flush()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                [(key, slot, self.last_used[key]) for key, slot in self.dirty.items()]
+            )
+        self.dirty = {}
+
+    def close(self):
+        """
+        บันทึกรายการที่ค้างอยู่ ปิดไฟล์ของแคช และปลดล็อกให้ process อื่นใช้ได้
+        """
+        self.save()
+        self.conn.close()
+        self._lock_file.close()
+
+    def stats(self):
+        """
+        สถิติการใช้งานแคช
+
+        Returns:
+            dict: จำนวน hit, miss, eviction และจำนวนรายการในแคช
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total > 0 else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.index),
+            "max_entries": self.max_entries
+        }
+
+class QueryEmbeddingCache(LRUCache):
+    """
+    คลาสสำหรับแคช embeddings ของคำค้นในหน่วยความจำ (LRU)
+
+    จำกัดขนาดได้ทั้งจำนวนรายการและจำนวน bytes และกำหนดอายุของแต่ละรายการ (TTL) ได้
+    คำค้นถูกปรับรูปแบบ (ช่องว่างและตัวพิมพ์เล็ก/ใหญ่) ก่อนใช้เป็น key
+    """
+    @staticmethod
+    def normalize_query(text):
+        """
+        ปรับคำค้นให้อยู่ในรูปแบบมาตรฐาน
+
+        Args:
+            text (str): คำค้น
+
+        Returns:
+            str: คำค้นที่ปรับแล้ว
+        """
+        text = unicodedata.normalize("NFC", text)
+        return re.sub(r'\s+', ' ', text).strip().casefold()
+
+    def get(self, text):
+        """
+        ดึง embedding ของคำค้นจากแคช
+
+        Args:
+            text (str): คำค้น
+
+        Returns:
+            numpy.ndarray: embedding vector หรือ None ถ้าไม่พบหรือหมดอายุ
+        """
+        return super().get(self.normalize_query(text))
+
+    def put(self, text, embedding):
+        """
+        เพิ่ม embedding ของคำค้นลงในแคช
+
+        Args:
+            text (str): คำค้น
+            embedding (numpy.ndarray): embedding vector
+
+        Returns:
+            numpy.ndarray: embedding ที่เก็บในแคช (float32, อ่านได้อย่างเดียว)
+        """
+        embedding = np.array(embedding, dtype=np.float32)
+        # ป้องกันไม่ให้ผู้เรียกแก้ไข embedding ที่อยู่ในแคช
+        embedding.flags.writeable = False
+        return super().put(self.normalize_query(text), embedding, embedding.nbytes)
@@ -1,25 +1,95 @@
 """
 โมดูลสำหรับการสร้าง embeddings
 """
-import torch
-from sentence_transformers import SentenceTransformer
+import threading
+import numpy as np
+from src.embedding.backends import load_model
+from src.embedding.cache import EmbeddingCache, QueryEmbeddingCache
+from src.config import (MODEL_NAME, EMBEDDING_DIMENSION, EMBEDDING_BACKEND, EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_ENABLED,
+                        EMBEDDING_WORKERS, EMBEDDING_WORKER_THREADS,
+                        EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_SAVE_EVERY,
+                        QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES, QUERY_CACHE_TTL)
 
 class EmbeddingModel:
     """
     คลาสสำหรับการสร้าง embeddings จากข้อความ
     """
-    def __init__(self, model_name='sentence-transformers/LaBSE'):
+    def __init__(self, model_name='sentence-transformers/LaBSE', use_cache=None, backend=None, workers=None,
+                 dimension=None):
         """
         สร้าง instance ของโมเดล
         
+        โมเดลจะถูกโหลดเมื่อสร้าง embedding ครั้งแรก (หรือเมื่อต้องการ dimension ที่ไม่ได้ระบุไว้)
+        สคริปต์ที่ไม่ได้สร้าง embeddings จึงไม่ต้อง import torch และโหลดโมเดล
+        
         Args:
             model_name (str): ชื่อของโมเดลที่ใช้สร้าง embeddings
+            use_cache (bool): ใช้แคช embeddings บนดิสก์หรือไม่
+            backend (str): backend ที่ใช้ประมวลผล ("torch", "torch-int8", "onnx" หรือ "onnx-int8")
+            workers (int): จำนวน process สำหรับสร้าง embeddings ของ get_embeddings (1 = ทำใน process นี้)
+            dimension (int): ขนาดของ vector embedding (ค่าเริ่มต้น: EMBEDDING_DIMENSION ถ้าเป็นโมเดลตาม config)
+        """
+        self.model_name = model_name
+        self.backend = backend or EMBEDDING_BACKEND
+        self.workers = workers or EMBEDDING_WORKERS
+        if dimension is None and model_name == MODEL_NAME:
+            dimension = EMBEDDING_DIMENSION
+        self._dimension = dimension
+        self._model = None
+        self._model_lock = threading.Lock()
+        
+        # แคช embeddings ของ chunk บนดิสก์ (เปิดเมื่อสร้าง embeddings ของ chunks ครั้งแรก
+        # สคริปต์ที่สร้างแค่ embedding ของคำค้นจึงไม่ล็อกแคชไว้จาก process ที่เพิ่มข้อมูล)
+        use_cache = use_cache if use_cache is not None else EMBEDDING_CACHE_ENABLED
+        self.cache = None
+        self._cache_lock = threading.Lock()
+        self._cache_name = None
+        if use_cache:
+            # ผลลัพธ์ของแต่ละ backend ต่างกันเล็กน้อย จึงแยกแคชของ backend อื่นจาก fp32
+            self._cache_name = model_name if self.backend == "torch" else f"{model_name}@{self.backend}"
+        
+        # แคช embeddings ของคำค้นในหน่วยความจำ
+        self.query_cache = QueryEmbeddingCache(
+            max_entries=QUERY_CACHE_MAX_ENTRIES,
+            max_bytes=QUERY_CACHE_MAX_BYTES,
+            ttl=QUERY_CACHE_TTL
+        )
+        
+        # process pool สำหรับสร้าง embeddings ของ chunks (สร้างเมื่อใช้งานครั้งแรก)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    @property
+    def model(self):
         """
-        self.model = SentenceTransformer(model_name)
-        self.model.eval()
+        โมเดล SentenceTransformer (โหลดเมื่อใช้งานครั้งแรก)
         
-        # รับขนาด dimension ของโมเดล
-        self.dimension = self.model.get_sentence_embedding_dimension()
+        Returns:
+            SentenceTransformer: โมเดล
+        """
+        with self._model_lock:
+            if self._model is None:
+                model = load_model(self.model_name, self.backend)
+                model.eval()
+                dimension = model.get_sentence_embedding_dimension()
+                if self._dimension is not None and self._dimension != dimension:
+                    raise ValueError(f"ขนาด vector ของโมเดล {self.model_name} คือ {dimension} "
+                                     f"ไม่ตรงกับที่ตั้งค่าไว้ ({self._dimension})")
+                self._dimension = dimension
+                self._model = model
+            return self._model
+    
+    @property
+    def dimension(self):
+        """
+        ขนาดของ vector embedding (โหลดโมเดลถ้าไม่ได้ระบุไว้)
+        
+        Returns:
+            int: ขนาดของ vector
+        """
+        if self._dimension is None:
+            self.model
+        return self._dimension
         
     def get_embedding(self, text):
         """
@@ -32,4 +102,205 @@ class EmbeddingModel:
             numpy.ndarray: embedding vector
         """
         embedding = self.model.encode(text)
-        return embedding
\ No newline at end of file
+        return embedding
+
+    def get_query_embedding(self, text):
+        """
+        สร้าง embedding ของคำค้น โดยใช้แคชในหน่วยความจำถ้าเคยค้นคำนี้แล้ว
+
+        Args:
+            text (str): คำค้น
+
+        Returns:
+            numpy.ndarray: embedding vector (อ่านได้อย่างเดียว)
+        """
+        embedding = self.query_cache.get(text)
+        if embedding is None:
+            embedding = self.query_cache.put(text, self.get_embedding(text))
+        return embedding
+
+    def get_embeddings(self, texts, batch_size=None, show_progress=False, token_counts=None):
+        """
+        สร้าง embeddings จากข้อความหลายรายการด้วย micro-batch
+
+        ข้อความจะถูกเรียงตามจำนวน token แล้วแบ่งเป็นกลุ่มที่มีความยาวใกล้เคียงกัน
+        เพื่อลด padding ในแต่ละ batch ผลลัพธ์จะถูกเขียนกลับตามลำดับเดิมของข้อความ
+        ถ้าเปิดใช้แคช ข้อความที่เคยสร้าง embedding แล้วจะไม่ถูกส่งเข้าโมเดลอีก
+
+        Args:
+            texts (list): ข้อความที่ต้องการสร้าง embeddings
+            batch_size (int): จำนวนข้อความต่อ micro-batch
+            show_progress (bool): แสดงความคืบหน้าหรือไม่
+            token_counts (list): จำนวน token ของแต่ละข้อความที่นับไว้แล้ว (ไม่ต้อง tokenize ซ้ำเพื่อจัดกลุ่ม)
+
+        Returns:
+            numpy.ndarray: เมทริกซ์ float32 ขนาด (จำนวนข้อความ, dimension)
+        """
+        if batch_size is None:
+            batch_size = EMBEDDING_BATCH_SIZE
+
+        texts = list(texts)
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        if self._open_cache() is None:
+            self._encode_into(embeddings, texts, range(len(texts)), batch_size, show_progress, token_counts)
+            return embeddings
+
+        # ดึงจากแคชก่อน แล้วสร้างเฉพาะข้อความที่ยังไม่มีในแคช
+        keys = [self.cache.make_key(text) for text in texts]
+        missing = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self.cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    embeddings[i] = cached
+
+        if show_progress:
+            print(f"พบ embeddings ในแคช {len(texts) - len(missing)}/{len(texts)} รายการ")
+
+        if missing:
+            lengths = [token_counts[i] for i in missing] if token_counts is not None else None
+            self._encode_into(embeddings, [texts[i] for i in missing], missing, batch_size, show_progress, lengths)
+            with self._cache_lock:
+                self.cache.put_many([keys[i] for i in missing], embeddings[missing])
+                # บันทึก index เป็นระยะ (ส่วนที่เหลือบันทึกตอน save_cache/close)
+                if len(self.cache.dirty) >= EMBEDDING_CACHE_SAVE_EVERY:
+                    self.cache.save()
+
+        return embeddings
+
+    def _open_cache(self):
+        """
+        เปิดแคช embeddings บนดิสก์ครั้งแรกที่ใช้งาน (ลองเปิดครั้งเดียว)
+
+        Returns:
+            EmbeddingCache: แคช หรือ None ถ้าไม่ใช้แคชหรือ process อื่นใช้แคชอยู่
+        """
+        with self._cache_lock:
+            if self._cache_name is not None:
+                try:
+                    self.cache = EmbeddingCache(
+                        EMBEDDING_CACHE_DIR,
+                        self._cache_name,
+                        self.dimension,
+                        max_entries=EMBEDDING_CACHE_MAX_ENTRIES
+                    )
+                except BlockingIOError:
+                    print("⚠️ แคช embeddings ถูกใช้งานโดย process อื่นอยู่ จะสร้าง embeddings โดยไม่ใช้แคช")
+                self._cache_name = None
+            return self.cache
+
+    def _encode_into(self, out, texts, positions, batch_size, show_progress=False, lengths=None):
+        """
+        สร้าง embeddings แบบ micro-batch และเขียนลงในเมทริกซ์ผลลัพธ์
+
+        Args:
+            out (numpy.ndarray): เมทริกซ์ผลลัพธ์
+            texts (list): ข้อความที่ต้องการสร้าง embeddings
+            positions (list): ตำแหน่งแถวใน out ของแต่ละข้อความ
+            batch_size (int): จำนวนข้อความต่อ micro-batch
+            show_progress (bool): แสดงความคืบหน้าหรือไม่
+            lengths (list): จำนวน token ของแต่ละข้อความ (นับใหม่ถ้าไม่ระบุ)
+        """
+        positions = np.asarray(positions)
+
+        # เรียงลำดับข้อความตามจำนวน token (ยาวไปสั้น) เพื่อจัดกลุ่มความยาวใกล้เคียงกัน
+        if lengths is None or any(length is None for length in lengths):
+            lengths = self._token_lengths(texts)
+        order = np.argsort(-np.asarray(lengths), kind='stable')
+
+        total = len(texts)
+        batches = [order[start:start + batch_size] for start in range(0, total, batch_size)]
+
+        # กระจาย batch ไปยัง worker processes ถ้ามีมากกว่าหนึ่ง batch
+        if self.workers > 1 and len(batches) > 1:
+            self._get_pool().encode_into(out, texts, positions, batches, show_progress)
+            return
+
+        for start, indices in zip(range(0, total, batch_size), batches):
+            if show_progress:
+                print(f"สร้าง embedding {min(start + batch_size, total)}/{total}")
+
+            # เขียนผลลัพธ์ลงตำแหน่งเดิมของแต่ละข้อความ
+            out[positions[indices]] = self._encode_batch([texts[i] for i in indices])
+
+    def _encode_batch(self, batch):
+        """
+        สร้าง embeddings ของข้อความหนึ่ง batch
+
+        Args:
+            batch (list): ข้อความ
+
+        Returns:
+            numpy.ndarray: เมทริกซ์ embeddings
+        """
+        import torch
+        with torch.inference_mode():
+            return self.model.encode(
+                batch,
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+
+    def _get_pool(self):
+        """
+        สร้าง (หรือใช้ซ้ำ) process pool สำหรับสร้าง embeddings
+
+        Returns:
+            EmbeddingWorkerPool: process pool
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                from src.embedding.pool import EmbeddingWorkerPool
+                self._pool = EmbeddingWorkerPool(
+                    self.model_name,
+                    self.backend,
+                    self.dimension,
+                    self.workers,
+                    num_threads=EMBEDDING_WORKER_THREADS
+                )
+            return self._pool
+
+    def save_cache(self):
+        """
+        บันทึก embeddings ที่เพิ่มเข้าแคชบนดิสก์ตั้งแต่บันทึกครั้งล่าสุด
+        """
+        if self.cache is not None:
+            with self._cache_lock:
+                self.cache.save()
+
+    def close(self):
+        """
+        บันทึกแคช embeddings และปิด process pool ของการสร้าง embeddings (ถ้ามี)
+        """
+        if self.cache is not None:
+            with self._cache_lock:
+                self.cache.close()
+            self.cache = None
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    def _token_lengths(self, texts):
+        """
+        คำนวณจำนวน token ของแต่ละข้อความ
+
+        Args:
+            texts (list): ข้อความที่ต้องการนับ token
+
+        Returns:
+            list: จำนวน token ของแต่ละข้อความ
+        """
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        if tokenizer is None:
+            # ไม่มี tokenizer ใช้ความยาวตัวอักษรแทน
+            return [len(text) for text in texts]
+
+        encoded = tokenizer(texts, add_special_tokens=False, truncation=False)
+        return [len(ids) for ids in encoded['input_ids']]
@@ -0,0 +1,117 @@
+"""
+โมดูลสำหรับสร้าง embeddings แบบขนานด้วยหลาย process (เขียนผลลัพธ์ลง shared memory)
+"""
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# EmbeddingModel ของแต่ละ worker process (โหลดโมเดลครั้งเดียวต่อ process)
+_worker_model = None
+
+def _init_embedding_worker(model_name, backend, num_threads):
+    """
+    เตรียม worker process สำหรับสร้าง embeddings
+
+    Args:
+        model_name (str): ชื่อของโมเดล
+        backend (str): backend ที่ใช้ประมวลผล
+        num_threads (int): จำนวน thread ของ torch ต่อ process
+    """
+    global _worker_model
+    import torch
+    # จำกัด thread ของ torch เพื่อไม่ให้แต่ละ process แย่ง CPU กัน
+    torch.set_num_threads(num_threads)
+    from src.embedding.model import EmbeddingModel
+    _worker_model = EmbeddingModel(model_name=model_name, use_cache=False, backend=backend, workers=1)
+    # โหลดโมเดลตอนเริ่ม process แทนตอนได้รับ batch แรก
+    _worker_model.model
+
+def _embed_batch_worker(args):
+    """
+    สร้าง embeddings ของข้อความหนึ่ง batch และเขียนลงเมทริกซ์ใน shared memory (ทำงานใน worker process)
+
+    Args:
+        args (tuple): (ชื่อ shared memory, ขนาดเมทริกซ์, แถวที่ต้องเขียน, ข้อความ)
+
+    Returns:
+        int: จำนวนข้อความที่สร้าง embeddings แล้ว
+    """
+    shm_name, shape, rows, texts = args
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[rows] = _worker_model._encode_batch(texts)
+        del out
+    finally:
+        shm.close()
+    return len(texts)
+
+class EmbeddingWorkerPool:
+    """
+    คลาสสำหรับกระจาย batch ของข้อความไปสร้าง embeddings ในหลาย process
+
+    แต่ละ process โหลดโมเดลของตัวเองครั้งเดียวและใช้ thread ของ torch ตามสัดส่วนจำนวนคอร์
+    ผลลัพธ์ถูกเขียนลงเมทริกซ์ float32 ใน shared memory โดยตรง จึงไม่ต้อง pickle vectors กลับมา
+    """
+    def __init__(self, model_name, backend, dimension, workers, num_threads=None):
+        """
+        สร้าง instance ของ EmbeddingWorkerPool
+
+        Args:
+            model_name (str): ชื่อของโมเดล
+            backend (str): backend ที่ใช้ประมวลผล
+            dimension (int): ขนาดของ vector embedding
+            workers (int): จำนวน process
+            num_threads (int): จำนวน thread ของ torch ต่อ process (None = จำนวนคอร์หารด้วยจำนวน process)
+        """
+        self.dimension = dimension
+        self.workers = workers
+        self.num_threads = num_threads or max(1, (os.cpu_count() or 1) // workers)
+
+        print(f"กำลังเริ่ม embedding worker {workers} processes ({self.num_threads} threads ต่อ process)")
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_embedding_worker,
+            initargs=(model_name, backend, self.num_threads)
+        )
+
+    def encode_into(self, out, texts, positions, batches, show_progress=False):
+        """
+        สร้าง embeddings ของทุก batch แบบขนานและเขียนลงในเมทริกซ์ผลลัพธ์
+
+        Args:
+            out (numpy.ndarray): เมทริกซ์ผลลัพธ์
+            texts (list): ข้อความที่ต้องการสร้าง embeddings
+            positions (numpy.ndarray): ตำแหน่งแถวใน out ของแต่ละข้อความ
+            batches (list): ลำดับของข้อความ (index ใน texts) ในแต่ละ batch
+            show_progress (bool): แสดงความคืบหน้าหรือไม่
+        """
+        shape = (len(texts), self.dimension)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 4))
+        try:
+            tasks = [
+                (shm.name, shape, indices, [texts[i] for i in indices])
+                for indices in batches
+            ]
+            done = 0
+            for count in self.executor.map(_embed_batch_worker, tasks):
+                done += count
+                if show_progress:
+                    print(f"สร้าง embedding {done}/{len(texts)}")
+
+            # คัดลอกจาก shared memory ไปยังตำแหน่งเดิมของแต่ละข้อความครั้งเดียว
+            shared = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            out[positions] = shared
+            del shared
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        """
+        ปิด process pool
+        """
+        self.executor.shutdown()
@@ -0,0 +1,3 @@
+"""
+Ingestion Pipeline Package
+"""
\ No newline at end of file
@@ -0,0 +1,602 @@
+"""
+โมดูลสำหรับประมวลผลไฟล์ PDF หลายไฟล์แบบ pipeline
+"""
+import os
+import time
+import queue
+import threading
+import traceback
+from src.utils.helpers import compute_file_hash
+from src.config import (PIPELINE_EXTRACT_WORKERS, PIPELINE_CHUNK_WORKERS, PIPELINE_EMBED_WORKERS,
+                        PIPELINE_INSERT_WORKERS, PIPELINE_QUEUE_SIZE,
+                        PIPELINE_EMBED_BATCH_CHUNKS, PIPELINE_INSERT_BATCH_CHUNKS,
+                        PIPELINE_STREAMING, PIPELINE_STREAM_PART_CHUNKS)
+
+# สัญญาณบอก worker ว่าไม่มีงานเหลือในคิวแล้ว
+_STOP = object()
+
+class StageStats:
+    """
+    คลาสเก็บสถิติของแต่ละขั้นตอนใน pipeline
+    """
+    def __init__(self, name, workers):
+        """
+        สร้าง instance ของ StageStats
+
+        Args:
+            name (str): ชื่อขั้นตอน
+            workers (int): จำนวน worker ของขั้นตอนนี้
+        """
+        self.name = name
+        self.workers = workers
+        self.files = 0
+        self.chunks = 0
+        self.calls = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, files, chunks, elapsed):
+        """
+        บันทึกผลการทำงานหนึ่งครั้ง
+
+        Args:
+            files (int): จำนวนไฟล์ที่ประมวลผล
+            chunks (int): จำนวน chunks ที่ประมวลผล
+            elapsed (float): เวลาที่ใช้ (วินาที)
+        """
+        with self.lock:
+            self.files += files
+            self.chunks += chunks
+            self.calls += 1
+            self.busy_time += elapsed
+
+class IngestionPipeline:
+    """
+    คลาสสำหรับประมวลผลไฟล์ PDF แบบ pipeline
+
+    แต่ละขั้นตอน (แปลงข้อความ → แบ่งส่วน → สร้าง embeddings → insert) ทำงานใน thread
+    ของตัวเองและเชื่อมกันด้วยคิวที่จำกัดขนาด ทำให้ขั้นตอนที่เร็วกว่ารอขั้นตอนที่ช้ากว่า
+    (backpressure) แทนการเก็บงานค้างไว้ในหน่วยความจำ
+
+    ในโหมด streaming ขั้นตอนแปลงข้อความจะแบ่ง chunk ไปพร้อมกับอ่านทีละหน้า และส่ง chunks
+    ต่อเป็นส่วน ๆ ทำให้เริ่มสร้าง embeddings ได้ก่อนอ่านไฟล์จบ ขั้นตอน insert จะรวมทุกส่วน
+    ของไฟล์ก่อนเพิ่มลงฐานข้อมูล เพื่อไม่ให้ไฟล์ที่แปลงไม่สำเร็จถูกเพิ่มไว้เพียงบางส่วน
+    """
+    def __init__(self, doc_processor, model, vector_db, incremental=False,
+                 extract_workers=None, chunk_workers=None, embed_workers=None,
+                 insert_workers=None, queue_size=None, manifest=None, streaming=None, rechunk=False):
+        """
+        สร้าง instance ของ IngestionPipeline
+
+        Args:
+            doc_processor (DocumentProcessor): ตัวประมวลผลเอกสาร
+            model (EmbeddingModel): โมเดลสำหรับสร้าง embeddings
+            vector_db (VectorDatabase): ฐานข้อมูลเวกเตอร์ (ต้องเรียก create_collection แล้ว)
+            incremental (bool): อัปเดตเฉพาะ chunk ที่เปลี่ยนแปลงหรือไม่
+            extract_workers (int): จำนวน worker สำหรับแปลง PDF เป็นข้อความ
+            chunk_workers (int): จำนวน worker สำหรับแบ่งข้อความ
+            embed_workers (int): จำนวน worker สำหรับสร้าง embeddings
+            insert_workers (int): จำนวน worker สำหรับ insert ลง Milvus
+            queue_size (int): ขนาดสูงสุดของคิวระหว่างขั้นตอน
+            manifest (IngestionManifest): รายการไฟล์ในเครื่องสำหรับข้ามไฟล์ที่ไม่เปลี่ยนโดยไม่ต้อง query Milvus
+            streaming (bool): แปลงข้อความและแบ่ง chunk ทีละหน้าแล้วส่งต่อเป็นส่วน ๆ
+            rechunk (bool): ประมวลผลทุกไฟล์ใหม่แม้ไม่ได้แก้ไข (ใช้หลังเปลี่ยนวิธีแบ่ง chunk)
+        """
+        self.doc_processor = doc_processor
+        self.model = model
+        self.vector_db = vector_db
+        self.incremental = incremental
+        self.manifest = manifest
+
+        self.extract_workers = extract_workers or PIPELINE_EXTRACT_WORKERS
+        self.chunk_workers = chunk_workers or PIPELINE_CHUNK_WORKERS
+        self.embed_workers = embed_workers or PIPELINE_EMBED_WORKERS
+        self.insert_workers = insert_workers or PIPELINE_INSERT_WORKERS
+        self.queue_size = queue_size or PIPELINE_QUEUE_SIZE
+        self.streaming = streaming if streaming is not None else PIPELINE_STREAMING
+        self.rechunk = rechunk
+
+        self.stats = {}
+        self.skipped = 0
+        self.failed = 0
+        self._counter_lock = threading.Lock()
+        self._manifest_records = []
+        # ส่วนของไฟล์ที่ได้รับแล้วในขั้นตอน insert (โหมด streaming) พาธ -> list ของส่วน
+        self._partial_files = {}
+        self._partial_lock = threading.Lock()
+
+    def run(self, pdf_files):
+        """
+        ประมวลผลไฟล์ PDF ทั้งหมด
+
+        Args:
+            pdf_files (list): พาธของไฟล์ PDF
+
+        Returns:
+            dict: สรุปผลการประมวลผล
+        """
+        self.stats = {"extract": StageStats("extract", self.extract_workers)}
+        if not self.streaming:
+            self.stats["chunk"] = StageStats("chunk", self.chunk_workers)
+        self.stats["embed"] = StageStats("embed", self.embed_workers)
+        self.stats["insert"] = StageStats("insert", self.insert_workers)
+        self.skipped = 0
+        self.failed = 0
+        self._manifest_records = []
+        self._partial_files = {}
+        start_time = time.time()
+        plan = self._plan(pdf_files)
+        plan_time = time.time() - start_time
+
+        path_queue = queue.Queue()
+        text_queue = queue.Queue(maxsize=self.queue_size)
+        chunk_queue = queue.Queue(maxsize=self.queue_size)
+        embed_queue = queue.Queue(maxsize=self.queue_size)
+
+        for item in plan:
+            path_queue.put(item)
+        for _ in range(self.extract_workers):
+            path_queue.put(_STOP)
+
+        if self.streaming:
+            # แปลงข้อความและแบ่ง chunk ในขั้นตอนเดียว แล้วส่งเข้าคิวของขั้นตอน embed โดยตรง
+            stages = [
+                self._start_stage("extract", self._extract_stream, path_queue, chunk_queue,
+                                  self.extract_workers, self.embed_workers),
+            ]
+        else:
+            stages = [
+                self._start_stage("extract", self._extract, path_queue, text_queue,
+                                  self.extract_workers, self.chunk_workers),
+                self._start_stage("chunk", self._chunk, text_queue, chunk_queue,
+                                  self.chunk_workers, self.embed_workers),
+            ]
+        stages += [
+            self._start_stage("embed", self._embed, chunk_queue, embed_queue,
+                              self.embed_workers, self.insert_workers,
+                              batch_chunks=PIPELINE_EMBED_BATCH_CHUNKS),
+            self._start_stage("insert", self._insert, embed_queue, None,
+                              self.insert_workers, 0,
+                              batch_chunks=PIPELINE_INSERT_BATCH_CHUNKS),
+        ]
+        for stage in stages:
+            stage.join()
+        # ส่วนที่เหลืออยู่เป็นของไฟล์ที่แปลงไม่สำเร็จ (นับเป็นข้อผิดพลาดไปแล้ว) จึงทิ้งไป
+        self._partial_files = {}
+        # ส่งข้อมูลที่ยังพักไว้และ flush ครั้งเดียวหลังทุกไฟล์เสร็จ
+        # (ถ้า insert ไม่สำเร็จจะเกิด exception ที่นี่และไม่มีไฟล์ใดถูกบันทึกลงรายการไฟล์)
+        self.vector_db.commit()
+        self.model.save_cache()
+        # บันทึกลงรายการไฟล์หลังจากข้อมูลอยู่ใน Milvus แล้วเท่านั้น
+        if self.manifest is not None and self._manifest_records:
+            self.manifest.record_many(self._manifest_records)
+        wall_time = time.time() - start_time
+
+        summary = {
+            "files": len(pdf_files),
+            "processed": self.stats["insert"].files,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "wall_time": wall_time,
+            "plan_time": plan_time,
+            "stages": self.stats,
+            "writes": self.vector_db.get_write_stats(),
+        }
+        self._print_summary(summary)
+        return summary
+
+    def _plan(self, pdf_files):
+        """
+        เลือกไฟล์ที่ต้องประมวลผล โดยตรวจกับรายการไฟล์ในเครื่องก่อน แล้วจึงตรวจไฟล์ที่เหลือ
+        กับรายชื่อไฟล์ใน collection ที่อ่านมาครั้งเดียว
+
+        Args:
+            pdf_files (list): พาธของไฟล์ PDF
+
+        Returns:
+            list: งานของไฟล์ที่ต้องประมวลผล
+        """
+        infos = {}
+        statuses = {}
+        remaining = []
+        local_skipped = 0
+        for pdf_path in pdf_files:
+            if self.manifest is not None and os.path.exists(pdf_path):
+                status, info = self.manifest.check(pdf_path)
+                if status == self.manifest.UNCHANGED and not self.rechunk:
+                    local_skipped += 1
+                    continue
+                infos[pdf_path] = info
+                statuses[pdf_path] = status
+            remaining.append(pdf_path)
+        if self.manifest is not None:
+            print(f"รายการไฟล์ในเครื่อง: ไม่เปลี่ยนแปลง {local_skipped}, ต้องตรวจกับฐานข้อมูล {len(remaining)}")
+
+        plan, modified, skipped = [], [], 0
+        indexed_mod_times = {}
+        if remaining:
+            indexed_mod_times = self.vector_db.get_file_mod_times()
+            plan, modified, skipped = self.doc_processor.plan_files(remaining, indexed_mod_times, force=self.rechunk)
+
+        # ไฟล์ที่เนื้อหาเปลี่ยนตามรายการในเครื่อง แต่เวลาที่แก้ไขไม่ใหม่กว่าในฐานข้อมูล
+        # (เช่น คืนไฟล์เก่าด้วย cp -p หรือ rsync -t) ต้องประมวลผลใหม่ด้วย
+        planned = {pdf_path for pdf_path, _ in plan}
+        for pdf_path, status in statuses.items():
+            file_name = os.path.basename(pdf_path)
+            if status == self.manifest.CHANGED and pdf_path not in planned and file_name in indexed_mod_times:
+                plan.append((pdf_path, infos[pdf_path]["mtime"]))
+                modified.append(file_name)
+                planned.add(pdf_path)
+                skipped -= 1
+        self.skipped = local_skipped + skipped
+
+        if modified and not self.incremental:
+            # ลบข้อมูลเก่าของไฟล์ที่แก้ไขก่อน (การอัปเดตแบบรายส่วนจะจัดการเองใน update_file_chunks)
+            self.vector_db.delete_files(modified)
+
+        # ไฟล์ที่มีใน Milvus แล้วแต่ยังไม่มีในรายการในเครื่อง ให้บันทึกไว้เพื่อข้ามได้ในครั้งถัดไป
+        # (คำนวณ hash ไว้ด้วย ไม่เช่นนั้นการ touch หรือคัดลอกไฟล์จะถูกนับเป็นไฟล์ที่เปลี่ยนแปลง)
+        if self.manifest is not None:
+            for pdf_path, info in infos.items():
+                if (statuses[pdf_path] != self.manifest.NEW or pdf_path in planned
+                        or os.path.basename(pdf_path) not in indexed_mod_times):
+                    continue
+                if info["content_hash"] is None:
+                    info["content_hash"] = compute_file_hash(pdf_path)
+                self._manifest_records.append({"path": pdf_path, **info})
+
+        modified_names = set(modified)
+        return [
+            {
+                "path": pdf_path,
+                "file_name": os.path.basename(pdf_path),
+                "file_mod_time": file_mod_time,
+                # ไฟล์ที่ยังไม่มีใน collection ไม่ต้อง query chunk เดิมตอนอัปเดตแบบรายส่วน
+                "is_new": os.path.basename(pdf_path) not in modified_names,
+                "size": infos.get(pdf_path, {}).get("size"),
+                "content_hash": infos.get(pdf_path, {}).get("content_hash"),
+            }
+            for pdf_path, file_mod_time in plan
+        ]
+
+    def _start_stage(self, name, fn, in_queue, out_queue, workers, next_workers, batch_chunks=None):
+        """
+        เริ่ม worker ของขั้นตอนหนึ่ง และส่งสัญญาณหยุดไปยังขั้นตอนถัดไปเมื่อทำงานเสร็จทั้งหมด
+
+        Args:
+            name (str): ชื่อขั้นตอน
+            fn (callable): ฟังก์ชันประมวลผลรายการ (รับ list ของงาน คืนค่า list หรือ generator ของผลลัพธ์)
+            in_queue (queue.Queue): คิวขาเข้า
+            out_queue (queue.Queue): คิวขาออก (None สำหรับขั้นตอนสุดท้าย)
+            workers (int): จำนวน worker
+            next_workers (int): จำนวน worker ของขั้นตอนถัดไป
+            batch_chunks (int): จำนวน chunks สูงสุดที่รวมเป็นหนึ่ง batch (None = ทีละไฟล์)
+
+        Returns:
+            threading.Thread: thread ที่รอให้ worker ทั้งหมดของขั้นตอนนี้ทำงานเสร็จ
+        """
+        stats = self.stats[name]
+
+        def worker():
+            stopped = False
+            while not stopped:
+                item = in_queue.get()
+                if item is _STOP:
+                    break
+                items = [item]
+
+                # รวมงานที่รออยู่ในคิวเป็น batch เดียวโดยไม่รอ
+                if batch_chunks:
+                    total = len(item["chunks"])
+                    while total < batch_chunks:
+                        try:
+                            extra = in_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if extra is _STOP:
+                            stopped = True
+                            break
+                        items.append(extra)
+                        total += len(extra["chunks"])
+
+                start = time.time()
+                blocked = 0.0
+                files = 0
+                chunks = 0
+                try:
+                    # fn อาจเป็น generator เพื่อส่งผลลัพธ์ต่อทันทีที่พร้อม (เช่น แปลง PDF แบบ streaming)
+                    for result in fn(items):
+                        files += 1 if result.get("final", True) else 0
+                        chunks += len(result.get("chunks", ()))
+                        if out_queue is not None:
+                            # ไม่นับเวลาที่รอคิวของขั้นตอนถัดไปเป็นเวลาทำงาน
+                            put_start = time.time()
+                            out_queue.put(result)
+                            blocked += time.time() - put_start
+                except Exception as e:
+                    names = ", ".join(i["file_name"] for i in items)
+                    print(f"เกิดข้อผิดพลาดในขั้นตอน {name} ({names}): {e}")
+                    traceback.print_exc()
+                    with stats.lock:
+                        stats.errors += len(items)
+                    with self._counter_lock:
+                        self.failed += len(items)
+                    continue
+
+                stats.record(files, chunks, time.time() - start - blocked)
+
+        threads = [threading.Thread(target=worker, name=f"{name}-{i}", daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        def finish():
+            for thread in threads:
+                thread.join()
+            if out_queue is not None:
+                for _ in range(next_workers):
+                    out_queue.put(_STOP)
+
+        coordinator = threading.Thread(target=finish, name=f"{name}-finish", daemon=True)
+        coordinator.start()
+        return coordinator
+
+    def _extract(self, items):
+        """
+        แปลง PDF เป็นข้อความ
+
+        Args:
+            items (list): งานของไฟล์ที่ต้องประมวลผล (พาธ, ชื่อไฟล์ และเวลาที่แก้ไข)
+
+        Returns:
+            list: งานที่มีข้อความของแต่ละหน้า
+        """
+        for item in items:
+            self._fill_file_info(item)
+            item["pages"] = list(self.doc_processor.iter_pages(item["path"]))
+        return items
+
+    def _extract_stream(self, items):
+        """
+        แปลง PDF เป็นข้อความทีละหน้าและแบ่ง chunk ไปพร้อมกัน แล้วส่งต่อทีละส่วน
+
+        Args:
+            items (list): งานของไฟล์ที่ต้องประมวลผล (พาธ, ชื่อไฟล์ และเวลาที่แก้ไข)
+
+        Returns:
+            iterator: ส่วนของแต่ละไฟล์ (มี chunks ไม่เกิน PIPELINE_STREAM_PART_CHUNKS และ
+                ส่วนสุดท้ายของไฟล์มี final = True)
+        """
+        for item in items:
+            self._fill_file_info(item)
+
+            part = 0
+            chunks = []
+            chunk_meta = []
+            for chunk, meta in self.doc_processor.iter_file_chunks(item["path"]):
+                chunks.append(chunk)
+                chunk_meta.append(meta)
+                if len(chunks) >= PIPELINE_STREAM_PART_CHUNKS:
+                    yield dict(item, chunks=chunks, chunk_meta=chunk_meta, part=part, final=False)
+                    part += 1
+                    chunks = []
+                    chunk_meta = []
+            yield dict(item, chunks=chunks, chunk_meta=chunk_meta, part=part, final=True)
+
+    def _fill_file_info(self, item):
+        """
+        คำนวณขนาดและ hash ของไฟล์ที่ยังไม่มี (ใช้บันทึกลงรายการไฟล์ในเครื่อง)
+
+        Args:
+            item (dict): งานของไฟล์
+        """
+        if self.manifest is None:
+            return
+        if item["size"] is None:
+            item["size"] = os.path.getsize(item["path"])
+        if item["content_hash"] is None:
+            item["content_hash"] = compute_file_hash(item["path"])
+
+    def _chunk(self, items):
+        """
+        แบ่งข้อความของแต่ละไฟล์เป็นส่วนย่อย (ใช้ iter_chunks เช่นเดียวกับโหมด streaming
+        เพื่อให้ได้หน้า ตำแหน่งตัวอักษร และจำนวน token ของแต่ละส่วนแบบเดียวกัน)
+
+        Args:
+            items (list): งานที่มีข้อความของแต่ละหน้า
+
+        Returns:
+            list: งานที่มีข้อความย่อยและข้อมูลประกอบ
+        """
+        for item in items:
+            item["chunks"] = []
+            item["chunk_meta"] = []
+            for chunk, meta in self.doc_processor.iter_chunks(item.pop("pages")):
+                item["chunks"].append(chunk)
+                item["chunk_meta"].append(meta)
+        return items
+
+    def _embed(self, items):
+        """
+        สร้าง embeddings ของ chunks จากหลายไฟล์ในครั้งเดียว
+
+        Args:
+            items (list): งานที่มีข้อความย่อย
+
+        Returns:
+            list: งานที่มี embeddings
+        """
+        all_chunks = [chunk for item in items for chunk in item["chunks"]]
+        # จำนวน token ที่นับไว้ตอนแบ่ง chunk ใช้จัดกลุ่มความยาวได้เลยโดยไม่ต้อง tokenize ซ้ำ
+        token_counts = [meta.get("tokens") for item in items for meta in item["chunk_meta"]]
+        embeddings = self.model.get_embeddings(all_chunks, token_counts=token_counts)
+
+        offset = 0
+        for item in items:
+            count = len(item["chunks"])
+            item["embeddings"] = embeddings[offset:offset + count]
+            offset += count
+        return items
+
+    def _insert(self, items):
+        """
+        เพิ่มข้อมูลของหลายไฟล์ลง Milvus
+
+        Args:
+            items (list): งานที่มี embeddings
+
+        Returns:
+            list: งานที่เพิ่มข้อมูลแล้ว
+        """
+        items = self._assemble_files(items)
+        if self.incremental:
+            # นับข้อผิดพลาดทีละไฟล์ ไฟล์ที่อัปเดตสำเร็จไปแล้วใน batch เดียวกันจึงยังถูกบันทึกตามปกติ
+            done = []
+            new_items = []
+            for item in items:
+                if item.get("is_new"):
+                    # ไฟล์ใหม่ไม่มี chunk เดิมให้เทียบ จึง insert รวมกับไฟล์ใหม่อื่นได้เลย
+                    new_items.append(item)
+                    continue
+                # ใช้ embeddings ที่สร้างไว้แล้ว ไม่ต้องส่งเข้าโมเดลซ้ำ
+                lookup = dict(zip(item["chunks"], item["embeddings"]))
+                try:
+                    self.vector_db.update_file_chunks(
+                        item["file_name"],
+                        item["file_mod_time"],
+                        item["chunks"],
+                        lambda texts: [lookup[text] for text in texts],
+                        chunk_metadata=item.get("chunk_meta")
+                    )
+                except Exception as e:
+                    self._record_failure([item], e)
+                    continue
+                self._remember([item])
+                done.append(item)
+            if new_items:
+                try:
+                    self._insert_files(new_items)
+                    done.extend(new_items)
+                except Exception as e:
+                    self._record_failure(new_items, e)
+            return done
+
+        self._insert_files(items)
+        return items
+
+    def _record_failure(self, items, error):
+        """
+        แสดงข้อผิดพลาดและนับไฟล์ที่เพิ่มลง Milvus ไม่สำเร็จ
+
+        Args:
+            items (list): งานที่ไม่สำเร็จ
+            error (Exception): ข้อผิดพลาด
+        """
+        names = ", ".join(item["file_name"] for item in items)
+        print(f"เกิดข้อผิดพลาดในขั้นตอน insert ({names}): {error}")
+        traceback.print_exc()
+        stats = self.stats["insert"]
+        with stats.lock:
+            stats.errors += len(items)
+        with self._counter_lock:
+            self.failed += len(items)
+
+    def _insert_files(self, items):
+        """
+        เพิ่ม chunks ทั้งหมดของหลายไฟล์ลง Milvus ด้วยการเรียก insert_data ครั้งเดียว
+
+        Args:
+            items (list): งานที่มี embeddings (ไฟล์ใหม่หรือไฟล์ที่ลบข้อมูลเก่าแล้ว)
+        """
+        chunk_to_file_map = []
+        file_mod_times = []
+        all_chunks = []
+        embeddings = []
+        chunk_metadata = []
+        for item in items:
+            count = len(item["chunks"])
+            chunk_to_file_map.extend([item["file_name"]] * count)
+            file_mod_times.extend([item["file_mod_time"]] * count)
+            all_chunks.extend(item["chunks"])
+            embeddings.extend(item["embeddings"])
+            chunk_metadata.extend(item.get("chunk_meta") or [None] * count)
+
+        if all_chunks:
+            chunk_indices = [i for item in items for i in range(len(item["chunks"]))]
+            self.vector_db.insert_data(chunk_to_file_map, file_mod_times, all_chunks, embeddings,
+                                       chunk_indices=chunk_indices, chunk_metadata=chunk_metadata)
+        self._remember(items)
+
+    def _assemble_files(self, items):
+        """
+        รวมส่วนของไฟล์ที่ส่งมาแบบ streaming จนครบทั้งไฟล์
+
+        Args:
+            items (list): งานที่มี embeddings (ทั้งไฟล์หรือบางส่วน)
+
+        Returns:
+            list: งานของไฟล์ที่ได้รับครบทุกส่วนแล้ว
+        """
+        complete = []
+        with self._partial_lock:
+            for item in items:
+                if "part" not in item:
+                    complete.append(item)
+                    continue
+
+                # ส่วนต่าง ๆ อาจมาไม่เรียงลำดับเมื่อมีหลาย worker
+                parts = self._partial_files.setdefault(item["path"], [])
+                parts.append(item)
+                final = next((p for p in parts if p["final"]), None)
+                if final is None or len(parts) < final["part"] + 1:
+                    continue
+
+                del self._partial_files[item["path"]]
+                parts.sort(key=lambda p: p["part"])
+                merged = dict(final,
+                              chunks=[chunk for p in parts for chunk in p["chunks"]],
+                              chunk_meta=[meta for p in parts for meta in p["chunk_meta"]],
+                              embeddings=[embedding for p in parts for embedding in p["embeddings"]])
+                del merged["part"]
+                complete.append(merged)
+        return complete
+
+    def _remember(self, items):
+        """
+        เก็บข้อมูลของไฟล์ที่เพิ่มแล้วไว้บันทึกลงรายการไฟล์ในเครื่องเมื่อ pipeline ทำงานเสร็จ
+
+        ไฟล์ที่ไม่มี chunk (เช่น แปลงข้อความไม่ได้) จะไม่ถูกบันทึก เพื่อให้ลองประมวลผลใหม่ในครั้งถัดไป
+
+        Args:
+            items (list): งานที่เพิ่มข้อมูลแล้ว
+        """
+        if self.manifest is None:
+            return
+        with self._counter_lock:
+            self._manifest_records.extend({
+                "path": item["path"],
+                "size": item["size"],
+                "mtime": item["file_mod_time"],
+                "content_hash": item["content_hash"],
+                "chunk_count": len(item["chunks"]),
+            } for item in items if item["chunks"])
+
+    def _print_summary(self, summary):
+        """
+        แสดงสรุปผลและ throughput ของแต่ละขั้นตอน
+
+        Args:
+            summary (dict): สรุปผลการประมวลผล
+        """
+        wall_time = summary["wall_time"]
+        print("\n=== สรุปการประมวลผลแบบ pipeline ===")
+        print(f"ไฟล์ทั้งหมด: {summary['files']}, ประมวลผล: {summary['processed']}, "
+              f"ข้าม: {summary['skipped']}, ผิดพลาด: {summary['failed']}")
+        print(f"เวลาทั้งหมด: {wall_time:.2f} วินาที (ตรวจสอบไฟล์ {summary['plan_time']:.2f} วินาที)")
+        print(f"{'ขั้นตอน':<10}{'workers':>8}{'ไฟล์':>8}{'chunks':>10}{'busy (s)':>11}{'ไฟล์/s':>9}{'chunks/s':>11}")
+        for stage in summary["stages"].values():
+            # throughput คิดจากเวลาจริงของ pipeline เพื่อให้เทียบกันได้ทุกขั้นตอน
+            files_per_sec = stage.files / wall_time if wall_time > 0 else 0
+            chunks_per_sec = stage.chunks / wall_time if wall_time > 0 else 0
+            print(f"{stage.name:<10}{stage.workers:>8}{stage.files:>8}{stage.chunks:>10}"
+                  f"{stage.busy_time:>11.2f}{files_per_sec:>9.2f}{chunks_per_sec:>11.1f}")
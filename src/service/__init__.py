@@ -0,0 +1,3 @@
+"""
+Search Service Package
+"""
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+โมดูล client สำหรับเรียก search service (ใช้เฉพาะ standard library เพื่อให้เริ่มทำงานได้เร็ว)
+"""
+import json
+import urllib.request
+import urllib.error
+
+class SearchClient:
+    """
+    คลาสสำหรับเรียก search service ผ่าน HTTP
+    """
+    def __init__(self, base_url, timeout=30):
+        """
+        สร้าง instance ของ SearchClient
+
+        Args:
+            base_url (str): URL ของ search service เช่น http://127.0.0.1:8765
+            timeout (float): เวลารอสูงสุดต่อคำขอ (วินาที)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def is_available(self):
+        """
+        ตรวจสอบว่า search service ทำงานอยู่หรือไม่
+
+        Returns:
+            bool: True ถ้า service ตอบกลับ
+        """
+        try:
+            return self._request("GET", "/health", timeout=1).get("status") == "ok"
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+
+    def search(self, query, limit=None):
+        """
+        ค้นหาด้วยคำค้นเดียว
+
+        Args:
+            query (str): คำค้น
+            limit (int): จำนวนผลลัพธ์
+
+        Returns:
+            list: ผลลัพธ์ (dict ของแต่ละ hit)
+        """
+        return self._request("POST", "/search", {"query": query, "limit": limit})["results"]
+
+    def search_batch(self, queries, limit=None):
+        """
+        ค้นหาด้วยหลายคำค้นในคำขอเดียว
+
+        Args:
+            queries (list): คำค้น
+            limit (int): จำนวนผลลัพธ์ต่อคำค้น
+
+        Returns:
+            list: ผลลัพธ์ของแต่ละคำค้นตามลำดับ
+        """
+        return self._request("POST", "/search_batch", {"queries": list(queries), "limit": limit})["results"]
+
+    def stats(self):
+        """
+        ดึงสถิติของ search service
+
+        Returns:
+            dict: สถิติของ service
+        """
+        return self._request("GET", "/stats")
+
+    def _request(self, method, path, payload=None, timeout=None):
+        """
+        ส่งคำขอ HTTP และแปลงผลลัพธ์จาก JSON
+
+        Args:
+            method (str): HTTP method
+            path (str): path ของ endpoint
+            payload (dict): ข้อมูลที่ส่ง (สำหรับ POST)
+            timeout (float): เวลารอสูงสุด (None = ใช้ค่าของ client)
+
+        Returns:
+            dict: ผลลัพธ์จาก service
+        """
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            error = json.loads(e.read() or b"{}").get("error", str(e))
+            raise RuntimeError(f"search service ตอบกลับด้วยข้อผิดพลาด ({e.code}): {error}")
+
+def display_results(hits):
+    """
+    แสดงผลลัพธ์การค้นหาที่ได้จาก search service (รูปแบบเดียวกับ VectorDatabase.display_results)
+
+    Args:
+        hits (list): ผลลัพธ์ของคำค้นหนึ่งคำ
+    """
+    from src.utils.helpers import format_time
+
+    print("\nผลลัพธ์การค้นหา:")
+    for hit in hits:
+        print(f"Score: {hit['score']}")
+        print(f"File: {hit['file_name']}")
+        if hit.get('page_number'):
+            print(f"Page: {hit['page_number']}")
+        print(f"Modified: {format_time(hit['file_mod_time'])}")
+        print(f"Text Chunk: {hit['text_chunk']}")
+        print("----------------------------")
@@ -0,0 +1,279 @@
+"""
+โมดูลสำหรับ search service ที่โหลดโมเดลและ collection ค้างไว้ในหน่วยความจำ
+"""
+import json
+import time
+import queue
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class LatencyHistogram:
+    """
+    คลาสเก็บ histogram ของเวลาตอบสนอง (มิลลิวินาที)
+    """
+    # ขอบบนของแต่ละช่อง (มิลลิวินาที) ช่องสุดท้ายคือมากกว่าค่าสุดท้าย
+    BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+    def __init__(self):
+        """
+        สร้าง instance ของ LatencyHistogram
+        """
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed_ms):
+        """
+        บันทึกเวลาตอบสนองหนึ่งครั้ง
+
+        Args:
+            elapsed_ms (float): เวลาที่ใช้ (มิลลิวินาที)
+        """
+        with self.lock:
+            self.counts[bisect.bisect_left(self.BUCKETS, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, p):
+        """
+        ประมาณค่า percentile จาก histogram (ใช้ขอบบนของช่อง)
+
+        Args:
+            p (float): percentile (0-100)
+
+        Returns:
+            float: เวลาโดยประมาณ (มิลลิวินาที) หรือ None ถ้ายังไม่มีข้อมูล
+        """
+        with self.lock:
+            if self.count == 0:
+                return None
+            target = self.count * p / 100.0
+            cumulative = 0
+            for i, bucket_count in enumerate(self.counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    return self.BUCKETS[i] if i < len(self.BUCKETS) else self.max_ms
+            return self.max_ms
+
+    def to_dict(self):
+        """
+        สรุป histogram เป็น dict
+
+        Returns:
+            dict: จำนวนครั้ง, ค่าเฉลี่ย, p50/p95/p99, ค่าสูงสุด และจำนวนในแต่ละช่อง
+        """
+        p50, p95, p99 = self.percentile(50), self.percentile(95), self.percentile(99)
+        with self.lock:
+            labels = [f"<={b}ms" for b in self.BUCKETS] + [f">{self.BUCKETS[-1]}ms"]
+            return {
+                "count": self.count,
+                "mean_ms": (self.total_ms / self.count) if self.count else None,
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+                "max_ms": self.max_ms,
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+class SearchService:
+    """
+    คลาสสำหรับให้บริการค้นหาด้วยโมเดลและการเชื่อมต่อ Milvus ที่เตรียมไว้แล้ว
+
+    การเชื่อมต่อ Milvus ถูกเก็บใน pool แต่ละคำขอยืมหนึ่งการเชื่อมต่อแล้วคืนเมื่อเสร็จ
+    """
+    def __init__(self, model, vector_dbs, default_limit=5):
+        """
+        สร้าง instance ของ SearchService
+
+        Args:
+            model (EmbeddingModel): โมเดลสำหรับสร้าง embeddings
+            vector_dbs (list): VectorDatabase ที่เรียก create_collection แล้ว (หนึ่งตัวต่อหนึ่งการเชื่อมต่อ)
+            default_limit (int): จำนวนผลลัพธ์เริ่มต้น
+        """
+        # ทุกการเชื่อมต่อใช้แคชผลลัพธ์ร่วมกัน เพื่อให้คำค้นซ้ำได้ผลจากแคชไม่ว่าจะยืมตัวไหน
+        self.result_cache = vector_dbs[0].result_cache
+        for vector_db in vector_dbs[1:]:
+            vector_db.result_cache = self.result_cache
+
+        self.model = model
+        self.default_limit = default_limit
+        self.pool = queue.Queue()
+        for vector_db in vector_dbs:
+            self.pool.put(vector_db)
+        self.pool_size = len(vector_dbs)
+        self.started = time.time()
+        self.histograms = {
+            "search": LatencyHistogram(),
+            "search_batch": LatencyHistogram(),
+        }
+
+    @contextmanager
+    def _connection(self):
+        """
+        ยืมการเชื่อมต่อจาก pool และคืนเมื่อใช้งานเสร็จ
+        """
+        vector_db = self.pool.get()
+        try:
+            yield vector_db
+        finally:
+            self.pool.put(vector_db)
+
+    def search(self, query, limit=None):
+        """
+        ค้นหาด้วยคำค้นเดียว
+
+        Args:
+            query (str): คำค้น
+            limit (int): จำนวนผลลัพธ์
+
+        Returns:
+            list: ผลลัพธ์ (dict ของแต่ละ hit)
+        """
+        start = time.perf_counter()
+        query_embedding = self.model.get_query_embedding(query)
+        with self._connection() as vector_db:
+            results = vector_db.search(query_embedding, limit=limit or self.default_limit)
+        hits = self._serialize_hits(results[0])
+        self.histograms["search"].record((time.perf_counter() - start) * 1000)
+        return hits
+
+    def search_batch(self, queries, limit=None):
+        """
+        ค้นหาด้วยหลายคำค้นในคำขอเดียว
+
+        Args:
+            queries (list): คำค้น
+            limit (int): จำนวนผลลัพธ์ต่อคำค้น
+
+        Returns:
+            list: ผลลัพธ์ของแต่ละคำค้นตามลำดับ
+        """
+        start = time.perf_counter()
+        query_embeddings = [self.model.get_query_embedding(query) for query in queries]
+        with self._connection() as vector_db:
+            results = vector_db.search_many(query_embeddings, limit=limit or self.default_limit)
+        serialized = [self._serialize_hits(hits) for hits in results]
+        self.histograms["search_batch"].record((time.perf_counter() - start) * 1000)
+        return serialized
+
+    def stats(self):
+        """
+        สถิติของ service
+
+        Returns:
+            dict: เวลาทำงาน, ขนาด pool, histogram ของเวลาตอบสนอง และสถิติแคชคำค้น
+        """
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "pool_size": self.pool_size,
+            "latency": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            "query_cache": self.model.query_cache.stats(),
+            "result_cache": self._result_cache_stats(),
+        }
+
+    def _result_cache_stats(self):
+        """
+        สถิติแคชผลลัพธ์ที่ใช้ร่วมกันใน pool
+
+        Returns:
+            dict: สถิติแคชผลลัพธ์ หรือ None ถ้าปิดแคชไว้
+        """
+        cache = self.result_cache
+        return cache.stats() if cache is not None else None
+
+    @staticmethod
+    def _serialize_hits(hits):
+        """
+        แปลงผลลัพธ์ของ Milvus เป็น dict ที่แปลงเป็น JSON ได้
+
+        Args:
+            hits: ผลลัพธ์การค้นหาของ query เดียว
+
+        Returns:
+            list: ผลลัพธ์ในรูปแบบ dict
+        """
+        return [
+            {
+                "score": hit.score,
+                "file_name": hit.entity.get("file_name"),
+                "file_mod_time": hit.entity.get("file_mod_time"),
+                "text_chunk": hit.entity.get("text_chunk"),
+                "page_number": hit.entity.get("page_number"),
+            }
+            for hit in hits
+        ]
+
+def _make_handler(service):
+    """
+    สร้างคลาส request handler ที่ผูกกับ service
+
+    Args:
+        service (SearchService): search service
+
+    Returns:
+        type: คลาส request handler
+    """
+    class SearchRequestHandler(BaseHTTPRequestHandler):
+        """
+        HTTP handler: GET /health, GET /stats, POST /search, POST /search_batch
+        """
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send_json(200, service.stats())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/search":
+                    self._send_json(200, {"results": service.search(body["query"], body.get("limit"))})
+                elif self.path == "/search_batch":
+                    self._send_json(200, {"results": service.search_batch(body["queries"], body.get("limit"))})
+                else:
+                    self._send_json(404, {"error": "not found"})
+            except (KeyError, ValueError) as e:
+                self._send_json(400, {"error": f"คำขอไม่ถูกต้อง: {e}"})
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # ไม่พิมพ์ log ทุกคำขอ (ดูสถิติได้จาก /stats)
+            pass
+
+    return SearchRequestHandler
+
+def run_server(service, host="127.0.0.1", port=8765):
+    """
+    เริ่ม HTTP server ของ search service (ทำงานจนกว่าจะถูกหยุด)
+
+    Args:
+        service (SearchService): search service
+        host (str): โฮสต์ที่ต้องการ bind
+        port (int): พอร์ตที่ต้องการ bind
+    """
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    print(f"search service พร้อมใช้งานที่ http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nกำลังหยุด search service...")
+    finally:
+        server.server_close()
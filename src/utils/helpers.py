@@ -3,7 +3,14 @@
 """
 import os
 import datetime
+import hashlib
 import json
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows ไม่มีโมดูล resource
+    resource = None
 
 def format_time(timestamp):
     """
@@ -72,8 +79,13 @@ def save_json(data, file_path):
         data: ข้อมูลที่ต้องการบันทึก
         file_path (str): พาธของไฟล์ที่ต้องการบันทึก
     """
-    with open(file_path, 'w', encoding='utf-8') as f:
+    # เขียนลงไฟล์ชั่วคราวแล้วแทนที่ไฟล์เดิม ถ้าเขียนไม่ครบไฟล์เดิมจะยังอยู่
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
         
 def load_json(file_path):
     """
@@ -89,4 +101,49 @@ def load_json(file_path):
         return None
         
     with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+
+def compute_text_hash(text):
+    """
+    คำนวณ hash ของข้อความ (SHA-256)
+    
+    Args:
+        text (str): ข้อความที่ต้องการคำนวณ hash
+        
+    Returns:
+        str: hash ในรูปแบบเลขฐานสิบหก
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def compute_file_hash(file_path, block_size=1024 * 1024):
+    """
+    คำนวณ hash ของเนื้อหาไฟล์ (SHA-256) โดยอ่านทีละส่วน
+    
+    Args:
+        file_path (str): พาธของไฟล์
+        block_size (int): ขนาดของแต่ละส่วนที่อ่าน (bytes)
+        
+    Returns:
+        str: hash ในรูปแบบเลขฐานสิบหก
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_peak_memory():
+    """
+    ดึงปริมาณหน่วยความจำสูงสุดที่ process นี้เคยใช้ (peak RSS)
+    
+    Returns:
+        int: หน่วยความจำสูงสุดในหน่วย bytes หรือ None ถ้าระบบไม่รองรับ
+    """
+    if resource is None:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS รายงานเป็น bytes ส่วน Linux รายงานเป็น kilobytes
+    if sys.platform == 'darwin':
+        return peak
+    return peak * 1024
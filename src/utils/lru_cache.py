@@ -0,0 +1,127 @@
+"""
+โมดูลแคช LRU ในหน่วยความจำที่จำกัดขนาดและอายุของรายการได้
+"""
+import time
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    คลาสแคช LRU แบบ thread-safe
+
+    จำกัดขนาดได้ทั้งจำนวนรายการและจำนวน bytes (ผู้เรียกระบุขนาดของแต่ละรายการเอง)
+    และกำหนดอายุของแต่ละรายการ (TTL) ได้
+    """
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None):
+        """
+        สร้าง instance ของ LRUCache
+
+        Args:
+            max_entries (int): จำนวนรายการสูงสุด
+            max_bytes (int): ขนาดรวมสูงสุดของรายการในแคช (None = ไม่จำกัด)
+            ttl (float): อายุของแต่ละรายการเป็นวินาที (None = ไม่หมดอายุ)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # key -> (value, ขนาด, เวลาที่เพิ่ม) เรียงตามลำดับการใช้งาน (เก่าสุดอยู่หน้า)
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        ดึงค่าจากแคช
+
+        Args:
+            key: key ของแคช
+
+        Returns:
+            ค่าที่เก็บไว้ หรือ None ถ้าไม่พบหรือหมดอายุ
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, _, created = entry
+            if self.ttl is not None and time.monotonic() - created > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, nbytes=0):
+        """
+        เพิ่มค่าลงในแคช และลบรายการที่ไม่ได้ใช้นานที่สุดถ้าเกินขนาดที่กำหนด
+
+        Args:
+            key: key ของแคช
+            value: ค่าที่ต้องการเก็บ
+            nbytes (int): ขนาดโดยประมาณของค่า (bytes)
+
+        Returns:
+            ค่าที่เก็บไว้
+        """
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, nbytes, time.monotonic())
+            self.total_bytes += nbytes
+
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        """
+        ลบรายการทั้งหมดในแคช
+        """
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key):
+        """
+        ลบรายการออกจากแคช (ต้องถือ lock อยู่แล้ว)
+
+        Args:
+            key: key ของแคช
+        """
+        _, nbytes, _ = self.entries.pop(key)
+        self.total_bytes -= nbytes
+
+    def stats(self):
+        """
+        สถิติการใช้งานแคช
+
+        Returns:
+            dict: จำนวน hit, miss, อัตรา hit, จำนวนรายการและขนาดที่ใช้
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total > 0 else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes
+            }